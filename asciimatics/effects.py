@@ -39,17 +39,23 @@ class Effect(metaclass=ABCMeta):
     event (and so effects don't need to implement this method unless needed).
     """
 
-    def __init__(self, screen, start_frame=0, stop_frame=0, delete_count=None):
+    # Number of frames between updates while degraded.
+    _degraded_rate = 2
+
+    def __init__(self, screen, start_frame=0, stop_frame=0, delete_count=None, priority=0):
         """
         :param screen: The Screen that will render this Effect.
         :param start_frame: Start index for the effect.
         :param stop_frame: Stop index for the effect.
         :param delete_count: Number of frames before this effect is deleted.
+        :param priority: Priority for drawing this effect when output is limited.
         """
         self._screen = screen
         self._start_frame = start_frame
         self._stop_frame = stop_frame
         self._delete_count = delete_count
+        self._priority = priority
+        self._degraded = False
         self._scene = None
 
     def update(self, frame_no):
@@ -60,8 +66,21 @@ class Effect(metaclass=ABCMeta):
         """
         if (frame_no >= self._start_frame and
                 (self._stop_frame == 0 or frame_no < self._stop_frame)):
+            if self._degraded and frame_no % self._degraded_rate != 0:
+                return
             self._update(frame_no)
 
+    def memory_usage(self):
+        """
+        Estimate the memory used by this Effect.
+
+        This doesn't include the Screen or Scene.  Effects that hold Renderers, Canvases or other
+        large objects should override it to include them.
+
+        :returns: The approximate number of bytes.
+        """
+        return 0
+
     def register_scene(self, scene):
         """
         Register the Scene that owns this Effect.
@@ -110,6 +129,35 @@ class Effect(metaclass=ABCMeta):
     def delete_count(self, value):
         self._delete_count = value
 
+    @property
+    def priority(self):
+        """
+        The priority for drawing this Effect.
+
+        If the Screen has a :py:obj:`~.Screen.byte_budget` and can't draw all the changes in one
+        refresh, lines drawn by higher priority Effects are drawn first.  Defaults to 0.
+        """
+        return self._priority
+
+    @priority.setter
+    def priority(self, value):
+        self._priority = value
+
+    @property
+    def degraded(self):
+        """
+        Whether this Effect should run in a cheaper, degraded mode.
+
+        The Screen sets this when it needs to shed load to keep up with the frame rate (see
+        :py:obj:`.FrameScheduler`).  By default, a degraded Effect only updates on every other
+        frame, but Effects can also check this flag to reduce their cost in other ways.
+        """
+        return self._degraded
+
+    @degraded.setter
+    def degraded(self, value):
+        self._degraded = value
+
     @property
     def frame_update_count(self):
         """
@@ -203,14 +251,27 @@ class Cycle(Effect):
         self._renderer = renderer
         self._y = y
         self._colour = 0
+        self._last_frame = None
 
     def reset(self):
         self._renderer.reset()
+        self._last_frame = None
+
+    def memory_usage(self):
+        return self._renderer.memory_usage()
 
     def _update(self, frame_no):
-        if frame_no % 2 == 0:
+        # Change colour every other frame - including any frames that were skipped if the Screen
+        # is catching up.
+        if not self._screen.catch_up or self._last_frame is None or frame_no <= self._last_frame:
+            steps = frame_no % 2
+        else:
+            steps = (frame_no + 1) // 2 - (self._last_frame + 1) // 2
+        self._last_frame = frame_no
+        if steps == 0:
             return
 
+        self._colour = (self._colour + steps - 1) % 8
         y = self._y
         image, _ = self._renderer.rendered_text
         for line in image:
@@ -253,6 +314,9 @@ class BannerText(Effect):
         self._scr_pos = self._screen.width
         self._renderer.reset()
 
+    def memory_usage(self):
+        return self._renderer.memory_usage()
+
     def _update(self, frame_no):
         if self._scr_pos == 0 and self._text_pos < self._renderer.max_width:
             self._text_pos += 1
@@ -322,6 +386,9 @@ class Print(Effect):
     def reset(self):
         self._renderer.reset()
 
+    def memory_usage(self):
+        return self._renderer.memory_usage()
+
     def _update(self, frame_no):
         self._frame_no = frame_no
         if self._clear and \
@@ -375,6 +442,9 @@ class Mirage(Effect):
         self._count = 0
         self._renderer.reset()
 
+    def memory_usage(self):
+        return self._renderer.memory_usage()
+
     def _update(self, frame_no):
         if frame_no % 2 == 0:
             return
@@ -642,6 +712,7 @@ class Sprite(Effect):
         self._dir_y = None
         self._old_direction = None
         self._speed = speed
+        self._last_frame = None
         self.reset()
 
     def reset(self):
@@ -651,10 +722,14 @@ class Sprite(Effect):
         self._old_x = None
         self._old_y = None
         self._old_direction = None
+        self._last_frame = None
         self._path.reset()
         for _, renderer in self._renderer_dict.items():
             renderer.reset()
 
+    def memory_usage(self):
+        return sum(renderer.memory_usage() for renderer in self._renderer_dict.values())
+
     def last_position(self):
         """
         Returns the last position of this Sprite as a tuple
@@ -685,7 +760,17 @@ class Sprite(Effect):
             return True
 
     def _update(self, frame_no):
-        if self._speed == 0 or frame_no % self._speed == 0:
+        # Work out how many steps to move along the path - including for any skipped frames if
+        # the Screen is catching up.
+        if self._speed == 0:
+            steps = 1
+        elif not self._screen.catch_up or self._last_frame is None or frame_no <= self._last_frame:
+            steps = 1 if frame_no % self._speed == 0 else 0
+        else:
+            steps = frame_no // self._speed - self._last_frame // self._speed
+        self._last_frame = frame_no
+
+        if steps > 0:
             # Blank out the old sprite if moved.
             if (self._clear and
                     self._old_x is not None and self._old_y is not None):
@@ -697,6 +782,12 @@ class Sprite(Effect):
             if self._delete_count is not None and self._delete_count <= 2:
                 return
 
+            # Skip any steps that we missed.
+            for _ in range(steps - 1):
+                self._path.next_pos()
+                if self._path.is_finished():
+                    self._path.reset()
+
             # Figure out the direction of the sprite, if enough time has
             # elapsed.
             (x, y) = self._path.next_pos()
@@ -1015,6 +1106,9 @@ class RandomNoise(Effect):
         if self._signal:
             self._signal.reset()
 
+    def memory_usage(self):
+        return self._signal.memory_usage() if self._signal else 0
+
     def _update(self, frame_no):
         if self._signal:
             start_x = int((self._screen.width - self._signal.max_width) // 2)
@@ -1148,3 +1242,105 @@ class Background(Effect):
     @property
     def stop_frame(self):
         return self._stop_frame
+
+
+class FrameStats(Effect):
+    """
+    Effect to show a compact summary of the Screen's frame statistics - e.g. to spot performance
+    problems in a live application.
+
+    This shows the current frames per second, a chart of the time taken for recent frames, the
+    cells and bytes drawn in the last frame and the slowest Effect.  The statistics come from
+    :py:obj:`.Screen.profiler`, so you must set a :py:obj:`.FrameProfiler` on the Screen before
+    creating this Effect.
+
+    Each frame is only added to the profiler once it has been drawn, so the summary always shows
+    the frames up to (but not including) the current one.  The statistics only change when the
+    Screen draws a frame, so this Effect never demands a refresh itself.
+    """
+
+    #: The width of the summary.
+    WIDTH = 24
+
+    def __init__(self, screen, x=None, y=0, frames=WIDTH, colour=Screen.COLOUR_WHITE,
+                 bg=Screen.COLOUR_BLUE, **kwargs):
+        """
+        :param screen: The Screen being used for the Scene.
+        :param x: X coordinate for the summary.  Defaults to the right hand side of the Screen.
+        :param y: Y coordinate for the summary.
+        :param frames: The number of recent frames to use for the statistics.  This is limited by
+            the number of frames kept by the profiler.
+        :param colour: The foreground colour for the summary.
+        :param bg: The background colour for the summary.
+
+        Also see the common keyword arguments in :py:obj:`.Effect`.
+
+        :raises ValueError: if the Screen has no profiler.
+        """
+        if screen.profiler is None:
+            raise ValueError("FrameStats needs a FrameProfiler on the Screen")
+        super().__init__(screen, **kwargs)
+        self._x = screen.width - self.WIDTH if x is None else x
+        self._y = y
+        self._frames = frames
+        self._colour = colour
+        self._bg = bg
+        self._last = None
+        self._lines = []
+
+    def reset(self):
+        self._last = None
+        self._lines = []
+
+    def _update(self, frame_no):
+        # Only rebuild the summary when there is a new profile.  The profiler may have been
+        # removed since this Effect was created, in which case there is nothing to show.
+        profiler = self._screen.profiler
+        if profiler is None:
+            return
+        profiles = profiler.profiles[-self._frames:]
+        if profiles and profiles[-1] is not self._last:
+            self._last = profiles[-1]
+            self._lines = self._summarize(profiles)
+        for i, line in enumerate(self._lines):
+            self._screen.print_at(line, self._x, self._y + i, self._colour, bg=self._bg)
+
+    def _summarize(self, profiles):
+        """
+        Create the lines of text to summarize a list of profiles.
+
+        :param profiles: The list of FrameProfiles to summarize - oldest first.
+        """
+        times = [sum(p.phases.values()) for p in profiles]
+        elapsed = profiles[-1].start - profiles[0].start
+        fps = (len(profiles) - 1) / elapsed if elapsed > 0 else 0
+
+        # Scale the chart to the slowest frame.
+        chars = "▁▂▃▄▅▆▇█" if self._screen.unicode_aware else "_.-=+*#@"
+        slowest = max(times) or 1
+        chart = "".join(chars[min(len(chars) - 1, int(t / slowest * len(chars)))]
+                        for t in times[-self.WIDTH:])
+
+        # Find the slowest Effect over all the profiles (ignoring this one).
+        effects = {}
+        for profile in profiles:
+            for name, duration in profile.effects.items():
+                effects[name] = effects.get(name, 0) + duration
+        effects.pop(type(self).__name__, None)
+        slow = max(effects, key=effects.get) if effects else "-"
+
+        lines = [
+            f"fps {fps:5.1f} ms {times[-1] * 1000:7.2f}",
+            chart,
+            f"cells {profiles[-1].cells:<5} bytes {profiles[-1].bytes}",
+            f"slow {slow}",
+        ]
+        return [line[:self.WIDTH].ljust(self.WIDTH) for line in lines]
+
+    @property
+    def frame_update_count(self):
+        return 0
+
+    @property
+    def stop_frame(self):
+        return self._stop_frame
@@ -5,7 +5,7 @@ This module provides parsers to create ColouredText objects from embedded contro
 import re
 from abc import ABCMeta, abstractmethod
 from logging import getLogger
-from asciimatics import constants
+from asciimatics import constants, tracing
 from asciimatics.utilities import _DotDict
 
 
@@ -190,7 +190,8 @@ class AnsiTerminalParser(Parser):
 
                 # Unknown escape - guess how many characters to ignore - most likely just the next char
                 # unless we can see the start of a new sequence.
-                logger.debug("Ignoring: %s", st.text[0:2])
+                if tracing.ENABLED:
+                    tracing.trace("escape_ignored", text=st.text[0:2])
                 if len(st.text) < 2:
                     return -1, None
                 if st.text[1] in ("[", "]"):
@@ -279,7 +280,8 @@ class AnsiTerminalParser(Parser):
                                 # Bright background colours
                                 st.attributes[2] = parameter - 92
                             else:
-                                logger.debug("Ignoring parameter: %s", parameter)
+                                if tracing.ENABLED:
+                                    tracing.trace("sgr_ignored", parameter=parameter)
                     new_attributes = tuple(st.attributes)
                     if last_attributes != new_attributes:
                         results.append((st.last_offset, Parser.CHANGE_COLOURS, new_attributes))
@@ -347,7 +349,8 @@ class AnsiTerminalParser(Parser):
                     # Restore cursor pos
                     results.append((self._state.last_offset, Parser.RESTORE_CURSOR, None))
                 else:
-                    logger.debug("Ignoring control: %s", match.group(1))
+                    if tracing.ENABLED:
+                        tracing.trace("control_ignored", text=match.group(1))
                 return len(match.group(1)), results
 
         if self._state.init_colours:
@@ -378,7 +381,8 @@ class AnsiTerminalParser(Parser):
                 if results is not None:
                     yield from results
             else:
-                logger.debug("Ignoring character: %d", char)
+                if tracing.ENABLED:
+                    tracing.trace("character_ignored", char=char)
                 yield (self._state.last_offset, Parser.DISPLAY_TEXT, " ")
                 self._state.last_offset = self._state.offset + 1
             self._state.offset += new_offset
@@ -144,6 +144,7 @@ class ParticleEmitter():
         self.particles = []
         self.time_left = spawn
         self._blend = blend
+        self.degraded = False
 
     @staticmethod
     def _find_colour(particle, start_index, screen_data):
@@ -162,10 +163,10 @@ class ParticleEmitter():
         """
         The function to draw a new frame for the particle system.
         """
-        # Spawn new particles if required
+        # Spawn new particles if required - but fewer of them if degraded.
         if self.time_left > 0:
             self.time_left -= 1
-            for _ in range(self._count):
+            for _ in range(max(1, self._count // 2) if self.degraded else self._count):
                 new_particle = self._new_particle()
                 if new_particle is not None:
                     self.particles.append(new_particle)
@@ -202,8 +203,13 @@ class ParticleEffect(Effect, metaclass=ABCMeta):
     To define a new ParticleEffect, you must implement the reset() method to
     construct a chain of ParticleEmitter objects and append them to the internal
     _active_systems list.
+
+    When degraded, the emitters spawn fewer particles, rather than updating less often.
     """
 
+    # Particles need to move every frame, so don't slow down when degraded.
+    _degraded_rate = 1
+
     def __init__(self, screen, x, y, life_time, **kwargs):
         """
         :param screen: The Screen being used for the Scene.
@@ -231,6 +237,7 @@ class ParticleEffect(Effect, metaclass=ABCMeta):
         # Take a copy in case a new system is added to the list this iteration.
         for system in copy(self._active_systems):
             if len(system.particles) > 0 or system.time_left > 0:
+                system.degraded = self._degraded
                 system.update()
             else:
                 self._active_systems.remove(system)
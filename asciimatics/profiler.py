@@ -0,0 +1,159 @@
+"""
+This module defines a profiler to find out where the time goes when a Screen draws each frame.  For
+more details see http://asciimatics.readthedocs.io/en/latest/animation.html
+"""
+import json
+import time
+from collections import deque
+
+
+class FrameProfile():
+    """
+    The profile of a single frame drawn by a Screen.
+    """
+
+    def __init__(self, frame, start):
+        """
+        :param frame: The frame number.
+        :param start: The time (from the profiler's clock) at which the frame started.
+        """
+        #: The frame number.
+        self.frame = frame
+
+        #: The time (from the profiler's clock) at which the frame started.
+        self.start = start
+
+        #: Dictionary of the time (in seconds) spent in each phase of drawing the frame - i.e.
+        #: "events", "update", "refresh" (working out what changed and creating the output to
+        #: draw it) and "write".
+        self.phases = {}
+
+        #: Dictionary of the time (in seconds) spent updating each Effect, keyed by its class and
+        #: name (if it has one).
+        self.effects = {}
+
+        #: The number of cells drawn.
+        self.cells = 0
+
+        #: The number of bytes written.
+        self.bytes = 0
+
+    def to_dict(self):
+        """
+        :returns: The profile as a dictionary - e.g. for exporting to JSON.
+        """
+        return {
+            "frame": self.frame,
+            "start": self.start,
+            "phases": self.phases,
+            "effects": self.effects,
+            "cells": self.cells,
+            "bytes": self.bytes,
+        }
+
+
+class FrameProfiler():
+    """
+    Class to profile the frames drawn by a :py:obj:`.Screen`.
+
+    To use it, set :py:obj:`.Screen.profiler`.  The profiles for the most recently drawn frames are
+    kept in a ring buffer, and can also be passed to a callback as each one is completed.  Frames
+    that are not drawn (because nothing changed) are not recorded.
+
+    When no profiler is set, the Screen skips all of this, so there is no cost to your application.
+    """
+
+    def __init__(self, size=100, on_frame=None, clock=time.perf_counter):
+        """
+        :param size: The number of frames to keep.
+        :param on_frame: Optional function to call with each completed :py:obj:`.FrameProfile`.
+        :param clock: The function to use to get the current time in seconds.
+        """
+        self._profiles = deque(maxlen=size)
+        self._on_frame = on_frame
+        self._current = None
+        self.clock = clock
+
+    def start_frame(self, frame):
+        """
+        Start profiling a new frame.
+
+        :param frame: The frame number.
+        """
+        self._current = FrameProfile(frame, self.clock())
+
+    def end_frame(self):
+        """
+        Complete the current frame and record it.
+        """
+        if self._current is None:
+            return
+        self._profiles.append(self._current)
+        if self._on_frame:
+            self._on_frame(self._current)
+        self._current = None
+
+    def add_phase(self, phase, elapsed):
+        """
+        Add the time spent in a phase of the current frame.
+
+        :param phase: The name of the phase.
+        :param elapsed: The time spent in seconds.
+        """
+        if self._current is not None:
+            self._current.phases[phase] = self._current.phases.get(phase, 0) + elapsed
+
+    def update_effect(self, effect, frame_no):
+        """
+        Update an Effect and record the time it took.
+
+        :param effect: The Effect to update.
+        :param frame_no: The frame number to pass to the Effect.
+        """
+        start = self.clock()
+        effect.update(frame_no)
+        if self._current is not None:
+            name = getattr(effect, "_name", None)
+            key = type(effect).__name__ if name is None else f"{type(effect).__name__}:{name}"
+            self._current.effects[key] = \
+                self._current.effects.get(key, 0) + self.clock() - start
+
+    def add_cells(self, cells):
+        """
+        Add to the number of cells drawn in the current frame.
+
+        :param cells: The number of cells.
+        """
+        if self._current is not None:
+            self._current.cells += cells
+
+    def add_bytes(self, count):
+        """
+        Add to the number of bytes written in the current frame.
+
+        :param count: The number of bytes.
+        """
+        if self._current is not None:
+            self._current.bytes += count
+
+    @property
+    def profiles(self):
+        """
+        The list of recorded :py:obj:`.FrameProfile` objects - oldest first.
+        """
+        return list(self._profiles)
+
+    def clear(self):
+        """
+        Discard all recorded profiles.
+        """
+        self._profiles.clear()
+
+    def export(self, stream):
+        """
+        Write the recorded profiles to a stream as JSON - one line per frame.
+
+        :param stream: The (text) stream to write to.
+        """
+        for profile in self._profiles:
+            stream.write(json.dumps(profile.to_dict()) + "\n")
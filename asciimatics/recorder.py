@@ -0,0 +1,272 @@
+"""
+This module allows you to record a session with a Screen and replay it later - e.g. to reproduce a
+performance problem reported by a user - or to export Scenes to a terminal recording.  For more
+details see http://asciimatics.readthedocs.io/en/latest/animation.html
+"""
+import gzip
+import json
+import random
+import time
+
+from asciimatics.event import KeyboardEvent, MouseEvent
+from asciimatics.exceptions import StopApplication
+from asciimatics.screen import HeadlessScreen
+
+# Version of the recording format.
+_VERSION = 1
+
+
+class SessionRecorder():
+    """
+    Class to record a session with a :py:obj:`.Screen`.
+
+    To use it, set :py:obj:`.Screen.recorder` before creating your Scenes.  This seeds the random
+    number generator (so that Effects like Stars, Matrix and the particle systems can be replayed
+    exactly) and then records the input, Screen resizes, clock ticks and level of load shedding for
+    every frame to a stream.
+
+    The recording is written as JSON - one line per frame - so that it can be read even if the
+    application crashes.  Use :py:obj:`.SessionReplayer` to play it back.
+    """
+
+    def __init__(self, stream, seed=None):
+        """
+        :param stream: The (text) stream to write the recording to.
+        :param seed: Optional seed for the random number generator.  Defaults to a random value.
+        """
+        self._stream = stream
+        self._seed = random.randrange(2 ** 32) if seed is None else seed
+        self._current = None
+        self._base = 0
+
+    @property
+    def seed(self):
+        """
+        The seed used for the random number generator.
+        """
+        return self._seed
+
+    def start(self, screen):
+        """
+        Start recording a Screen.  This is called when the recorder is set on the Screen.
+
+        :param screen: The Screen to be recorded.
+        """
+        random.seed(self._seed)
+        self._base = screen.clock()
+        self._write({
+            "version": _VERSION,
+            "seed": self._seed,
+            "height": screen.height,
+            "width": screen.width,
+            "colours": screen.colours,
+            "unicode_aware": screen.unicode_aware,
+        })
+
+    def start_frame(self, frame, tick, shed_level=0):
+        """
+        Start recording a new frame.
+
+        :param frame: The frame number.
+        :param tick: The time reported by the Screen's clock at the start of the frame.
+        :param shed_level: The level of load shedding used to draw the frame.
+        """
+        self._current = {"frame": frame, "time": round(tick - self._base, 6), "events": []}
+        if shed_level:
+            self._current["shed"] = shed_level
+
+    def record_event(self, event):
+        """
+        Record an input event in the current frame.
+
+        :param event: The event (or None if there was no input).
+        """
+        if event is None or self._current is None:
+            return
+        if isinstance(event, KeyboardEvent):
+            self._current["events"].append(["key", event.key_code])
+        elif isinstance(event, MouseEvent):
+            self._current["events"].append(["mouse", event.x, event.y, event.buttons])
+
+    def end_frame(self):
+        """
+        Complete the current frame and write it to the stream.
+        """
+        if self._current is not None:
+            if not self._current["events"]:
+                del self._current["events"]
+            self._write(self._current)
+            self._current = None
+
+    def record_resize(self):
+        """
+        Record that the Screen has been resized.
+        """
+        self._write({"resize": True})
+
+    def _write(self, record):
+        self._stream.write(json.dumps(record) + "\n")
+        self._stream.flush()
+
+
+class SessionReplayer():
+    """
+    Class to replay a session recorded by :py:obj:`.SessionRecorder`.
+
+    The session is replayed frame by frame on a :py:obj:`.HeadlessScreen`, with the same input,
+    clock ticks, load shedding and random numbers as the original, so that the Scenes produce the
+    same output.  You can then use a :py:obj:`.FrameProfiler` to find out where the time went.
+
+    Note that you must create the same Scenes as the original application, after calling
+    :py:meth:`.create_screen`.  Anything that reads the time directly (e.g. the Clock Effect) or
+    is changed by other threads will not be replayed exactly.
+    """
+
+    def __init__(self, stream):
+        """
+        :param stream: The (text) stream to read the recording from.
+        """
+        records = [json.loads(line) for line in stream if line.strip()]
+        if not records or records[0].get("version") != _VERSION:
+            raise ValueError("Not a valid session recording")
+        self._header = records[0]
+        self._records = records[1:]
+        self._tick = 0
+
+    @property
+    def seed(self):
+        """
+        The seed used for the random number generator in the recording.
+        """
+        return self._header["seed"]
+
+    def create_screen(self):
+        """
+        Create a Screen to replay the session, matching the original Screen.
+
+        This also re-seeds the random number generator, so create your Scenes after calling this.
+
+        :returns: The new HeadlessScreen.
+        """
+        random.seed(self._header["seed"])
+        return HeadlessScreen(height=self._header["height"],
+                              width=self._header["width"],
+                              colours=self._header["colours"],
+                              unicode_aware=self._header["unicode_aware"],
+                              clock=lambda: self._tick)
+
+    def play(self, screen, scenes, unhandled_input=None, start_scene=None, repeat=True):
+        """
+        Replay the session.
+
+        This stops at the end of the recording, when the application would have stopped, or when
+        the original Screen was resized.
+
+        :param screen: The Screen created by :py:meth:`.create_screen`.
+        :param scenes: The list of Scenes to play - as per :py:meth:`.Screen.play`.
+        :param unhandled_input: Function to call for any unhandled input - as per
+            :py:meth:`.Screen.play`.
+        :param start_scene: The Scene to start from - as per :py:meth:`.Screen.play`.
+        :param repeat: Whether to repeat the Scenes - as per :py:meth:`.Screen.play`.
+        :returns: The number of frames replayed.
+        """
+        # Start the Scenes at (roughly) the same time as the first recorded frame.
+        self._tick = self._records[0].get("time", 0) if self._records else 0
+        screen.set_scenes(scenes, unhandled_input=unhandled_input, start_scene=start_scene)
+        frames = 0
+        try:
+            for record in self._records:
+                if record.get("resize"):
+                    break
+
+                # Catch up on any frames that were skipped while idle and then play the next one.
+                self._tick = record["time"]
+                if record["frame"] > screen.frame:
+                    screen.skip_frames(record["frame"] - screen.frame)
+                screen.shed_level = record.get("shed", 0)
+                for event in record.get("events", []):
+                    if event[0] == "key":
+                        screen.inject_event(KeyboardEvent(event[1]))
+                    else:
+                        screen.inject_event(MouseEvent(event[1], event[2], event[3]))
+                screen.draw_next_frame(repeat=repeat)
+                frames += 1
+        except StopApplication:
+            pass
+        return frames
+
+
+def export_asciinema(filename, scenes, height=24, width=80, frames=None, fps=20, repeat=False,
+                     title=None, seed=None):
+    """
+    Play a set of Scenes as fast as possible and save the output as an asciinema (version 2)
+    recording - e.g. to create demos for your documentation.
+
+    The Scenes are played on a :py:obj:`.HeadlessScreen` with a virtual clock, so there are no
+    pauses and any frames where nothing needs to be drawn are skipped entirely.  Output is buffered
+    and, if the filename ends in ".gz", compressed as it is written.  The resulting file can be
+    played with asciinema or the :py:obj:`.AsciinemaPlayer` renderer.
+
+    :param filename: The name of the file to create.
+    :param scenes: Function to create the list of Scenes to play.  This is passed the Screen.
+    :param height: The height of the Screen.
+    :param width: The width of the Screen.
+    :param frames: The maximum number of frames to play.  Defaults to playing until the Scenes
+        stop, or there is nothing left to draw.  This is required if the Scenes repeat or any of
+        them has no fixed duration.
+    :param fps: The number of frames per second to record.
+    :param repeat: Whether to repeat the Scenes once it has reached the end.
+    :param title: Optional title for the recording.
+    :param seed: Optional seed for the random number generator.
+    :returns: The number of frames played.
+
+    :raises ValueError: if the number of frames is needed, but not specified.
+    """
+    if seed is not None:
+        random.seed(seed)
+    if frames is None and repeat:
+        raise ValueError("Must limit the number of frames when repeating the Scenes")
+
+    # Avoid scroll regions, as not all players support them.
+    tick = [0]
+    screen = HeadlessScreen(height=height, width=width, clock=lambda: tick[0] / fps,
+                            hardware_scroll=False)
+    scene_list = scenes(screen)
+    if frames is None and any(scene.duration <= 0 for scene in scene_list):
+        raise ValueError("Must limit the number of frames when a Scene has no fixed duration")
+
+    header = {
+        "version": 2,
+        "width": width,
+        "height": height,
+        "timestamp": int(time.time()),
+        "env": {"TERM": "xterm-256color"},
+    }
+    if title is not None:
+        header["title"] = title
+    opener = gzip.open if filename.endswith(".gz") else open
+    with opener(filename, "wt", encoding="utf-8") as f:
+        f.write(json.dumps(header) + "\n")
+        screen.set_scenes(scene_list)
+        try:
+            while frames is None or tick[0] < frames:
+                screen.draw_next_frame(repeat=repeat)
+                output = screen.output
+                if output:
+                    f.write(json.dumps([round(tick[0] / fps, 6), "o", output]) + "\n")
+                    screen.reset_stats()
+                tick[0] += 1
+
+                # Jump straight to the next frame that needs to be drawn.
+                idle = screen.idle_frames()
+                if idle is None:
+                    break
+                if frames is not None:
+                    idle = min(idle, frames - tick[0])
+                if idle > 0:
+                    screen.skip_frames(idle)
+                    tick[0] += idle
+        except StopApplication:
+            # The final frame still counts as played.
+            tick[0] += 1
+    return tick[0]
@@ -4,6 +4,7 @@ This module provides common code for all Renderers.
 
 from abc import ABCMeta, abstractmethod
 import re
+from sys import getsizeof
 from wcwidth.wcwidth import wcswidth
 from asciimatics.screen import Screen, TemporaryCanvas
 from asciimatics.constants import COLOUR_REGEX
@@ -64,6 +65,14 @@ class Renderer(metaclass=ABCMeta):
         :return: The max height of the rendered text (across all images if an animated renderer).
         """
 
+    def memory_usage(self):
+        """
+        Estimate the memory used by this Renderer.
+
+        :returns: The approximate number of bytes.
+        """
+        return 0
+
     def __repr__(self):
         """
         :returns: a plain string representation of the next rendered image.
@@ -104,6 +113,16 @@ class StaticRenderer(Renderer):
     def reset(self):
         self._index = 0
 
+    def memory_usage(self):
+        # Count the source images and the converted images and colour maps.  The colour tuples are
+        # shared between cells, so just count the references to them.
+        size = sum(getsizeof(image) for image in self._images)
+        for image in self._plain_images:
+            size += getsizeof(image) + sum(getsizeof(line) for line in image)
+        for colour_map in self._colour_map or []:
+            size += getsizeof(colour_map) + sum(getsizeof(line) for line in colour_map)
+        return size
+
     def _convert_images(self):
         """
         Convert any images into a more Screen-friendly format.
@@ -215,6 +234,9 @@ class DynamicRenderer(Renderer, metaclass=ABCMeta):
         self._must_clear = clear
         self._canvas = TemporaryCanvas(height, width)
 
+    def memory_usage(self):
+        return self._canvas.memory_usage()
+
     def _clear(self):
         """
         Clear the current image.
@@ -2,6 +2,7 @@
 This module implements renderers that play content to the screen.
 """
 from abc import abstractmethod
+import gzip
 import json
 
 from asciimatics.renderers.base import DynamicRenderer
@@ -31,6 +32,7 @@ class AbstractScreenPlayer(DynamicRenderer):
         self._counter = None
         self._next = None
         self._buffer = None
+        self._last_time = None
         self.reset()
 
     def reset(self):
@@ -44,6 +46,7 @@ class AbstractScreenPlayer(DynamicRenderer):
         self._counter = 0
         self._next = 0
         self._buffer = None
+        self._last_time = None
         self._parser.reset("", self._current_colours)
         self._clear()
         self._file.seek(0)
@@ -208,22 +211,30 @@ class AsciinemaPlayer(AbstractScreenPlayer):
     """
     Renderer to play terminal recordings created by asciinema.
 
-    This only supports the version 2 file format.  Use the max_delay setting to speed up human
-    interactions (i.e. to reduce delays from typing).
+    This only supports the version 2 file format, which may be compressed with gzip (if the file
+    name ends in ".gz").  Use the max_delay setting to speed up human interactions (i.e. to reduce
+    delays from typing).
+
+    By default, playback assumes that the renderer is drawn 20 times a second.  If that might not
+    be true (e.g. when the Screen drops frames under load), pass in a clock to play back in real
+    time instead.
 
     In order to tidy up files, this must be used as a context manager (i.e. using `with`).
     """
 
-    def __init__(self, filename, height=None, width=None, max_delay=None):
+    def __init__(self, filename, height=None, width=None, max_delay=None, clock=None):
         """
         :param filename: the file containingi the ANSI art.
         :param height: required height of the renderer.
         :param width: required width of the renderer.
         :param max_delay: maximum time interval (in secs) to wait between frame updates.
+        :param clock: optional function that returns the current time in seconds (e.g.
+            time.monotonic) to use to time the playback.
         """
         # Open the file and check it looks plausibly like a supported format.
+        opener = gzip.open if filename.endswith(".gz") else open
         # pylint: disable-next=consider-using-with
-        f = open(filename, "rb")
+        f = opener(filename, "rb")
         header = json.loads(f.readline())
         if header["version"] != 2:
             raise RuntimeError("Unsupported file format")
@@ -235,9 +246,16 @@ class AsciinemaPlayer(AbstractScreenPlayer):
         # Construct the full player now we have all the details.
         super().__init__(f, height, width)
         self._max_delay = max_delay
+        self._clock = clock
 
     def _render_now(self):
-        self._counter += 0.05
+        if self._clock is None:
+            self._counter += 0.05
+        else:
+            now = self._clock()
+            if self._last_time is not None:
+                self._counter += now - self._last_time
+            self._last_time = now
         if self._counter >= self._next:
             if self._buffer:
                 self._play_content(self._buffer)
@@ -100,6 +100,14 @@ class Scene():
                 break
         return event
 
+    def memory_usage(self):
+        """
+        Estimate the memory used by this Scene - i.e. by all of its Effects.
+
+        :returns: The approximate number of bytes.
+        """
+        return sum(effect.memory_usage() for effect in self._effects)
+
     @property
     def name(self):
         """
@@ -0,0 +1,142 @@
+"""
+This module defines a scheduler to pace the frames played by a Screen.  For more details see
+http://asciimatics.readthedocs.io/en/latest/animation.html
+"""
+import time
+
+
+class FrameScheduler():
+    """
+    Class to pace the frames drawn by :py:meth:`.Screen.play`.
+
+    Frames are scheduled at fixed intervals from the start of play, using a monotonic clock, so
+    that small delays in drawing any one frame don't add up to drift over time.
+
+    When a frame is late, the scheduler can either skip frames to catch up (keeping animations in
+    time with the real world) or just carry on from the current time (slowing animations down).
+    Either way, it will call the `on_missed` function to report the missed deadline.
+
+    The Screen can also shed load when drawing a frame takes longer than the frame interval.  In
+    this case, it degrades (see :py:obj:`.Effect.degraded`) and then stops updating Effects,
+    starting with those of the lowest priority, until it is back within budget.  Effects with the
+    highest priority in the Scene are never shed.
+    """
+
+    def __init__(self, fps=20, skip_frames=False, on_missed=None, clock=time.monotonic,
+                 shed_load=False):
+        """
+        :param fps: The target number of frames per second.
+        :param skip_frames: Whether to skip frames to catch up after a missed deadline.
+        :param on_missed: Optional function to call when a frame misses its deadline.
+        :param clock: The function to use to get the current time in seconds.
+        :param shed_load: Whether the Screen should shed load from low priority Effects when
+            frames take too long to draw.
+
+        The `on_missed` function takes 2 parameters - how late the frame was (in seconds) and the
+        number of frames that were skipped to catch up.
+        """
+        if fps <= 0:
+            raise ValueError(f"Invalid frame rate: {fps}")
+        self._interval = 1 / fps
+        self._skip_frames = skip_frames
+        self._on_missed = on_missed
+        self._clock = clock
+        self._shed_load = shed_load
+        self._start = clock()
+        self._next = 0
+
+    def start(self):
+        """
+        Start a new schedule, with the first frame due now.
+        """
+        self._start = self._clock()
+        self._next = 0
+
+    def end_frame(self):
+        """
+        Schedule the next frame, once the current one has been drawn.
+
+        :returns: A tuple of the time to wait (in seconds) before drawing the next frame and the
+            number of frames to skip to catch up (if allowed).
+        """
+        self._next += 1
+        now = self._clock()
+        late = now - self._deadline(self._next)
+        if late <= 0:
+            return -late, 0
+
+        # Missed the deadline - catch up (or shift the schedule) and draw the next frame now.
+        skipped = 0
+        if self._skip_frames:
+            skipped = int(late / self._interval)
+            self._next += skipped
+        else:
+            self._start += late
+        if self._on_missed:
+            self._on_missed(late, skipped)
+        return 0, skipped
+
+    def time_until(self, frames):
+        """
+        Get the time until the specified number of frames (after the next one) are due.
+
+        :param frames: The number of frames.
+        :returns: The time in seconds - which may be negative if already passed.
+        """
+        return self._deadline(self._next + frames) - self._clock()
+
+    def catch_up(self, limit=None):
+        """
+        Skip any frames that passed while waiting (e.g. for input).
+
+        :param limit: Optional maximum number of frames to skip.
+        :returns: The number of frames that were skipped.
+        """
+        passed = max(0, int((self._clock() - self._start) / self._interval) - self._next)
+        if limit is not None:
+            passed = min(passed, limit)
+        self._next += passed
+        return passed
+
+    def _deadline(self, frame):
+        """
+        Get the time at which the specified frame is due.
+
+        :param frame: The index of the frame in the current schedule.
+        """
+        return self._start + frame * self._interval
+
+    @property
+    def fps(self):
+        """
+        The target number of frames per second.  Changing this starts a new schedule.
+        """
+        return 1 / self._interval
+
+    @fps.setter
+    def fps(self, value):
+        if value <= 0:
+            raise ValueError(f"Invalid frame rate: {value}")
+        self._interval = 1 / value
+        self.start()
+
+    @property
+    def skip_frames(self):
+        """
+        Whether to skip frames to catch up after a missed deadline.
+        """
+        return self._skip_frames
+
+    @property
+    def shed_load(self):
+        """
+        Whether the Screen should shed load from low priority Effects when frames take too long.
+        """
+        return self._shed_load
+
+    @property
+    def interval(self):
+        """
+        The time between frames in seconds.
+        """
+        return self._interval
@@ -2,24 +2,32 @@
 This module defines common screen output function.  For more details, see
 http://asciimatics.readthedocs.io/en/latest/io.html
 """
+import asyncio
 import os
+import re
 import signal
 import struct
 import sys
+import threading
 import time
 from abc import ABCMeta, abstractmethod
+from queue import Empty, Queue, SimpleQueue
+from array import array
+from bisect import bisect_left
 from functools import update_wrapper, partial
 from itertools import zip_longest
 from locale import getlocale
 from logging import getLogger
 from math import sqrt
+from sys import getsizeof
 
 from wcwidth import wcwidth, wcswidth
 
 from asciimatics.event import KeyboardEvent, MouseEvent
 from asciimatics.exceptions import ResizeScreenError, StopApplication, NextScene
+from asciimatics.scheduler import FrameScheduler
 from asciimatics.utilities import _DotDict
-from asciimatics import constants
+from asciimatics import constants, tracing
 
 logger = getLogger(__name__)
 
@@ -31,6 +39,11 @@ ENABLE_QUICK_EDIT_MODE = 0x0040
 class _DoubleBuffer():
     """
     Pure python Screen buffering.
+
+    The buffer tracks which span of each row has been written since the last sync, so that only
+    those cells need to be compared and copied on each refresh.  It also tracks the highest
+    priority used to draw each row (see :py:obj:`.priority`) and how many syncs it has been
+    deferred for.
     """
 
     def __init__(self, height, width):
@@ -42,10 +55,70 @@ class _DoubleBuffer():
         self._height = height
         self._width = width
         self._double_buffer = None
-        line = [(" ", Screen.COLOUR_WHITE, 0, 0, 1) for _ in range(self._width)]
-        self._screen_buffer = [line[:] for _ in range(self._height)]
+        self._dirty_min = None
+        self._dirty_max = None
+        self._priorities = [0] * self._height
+        self._stale = [0] * self._height
+        self._row_keys = [None] * self._height
+        self._new_keys = {}
+        self.priority = 0
+        self._screen_buffer = [self._new_row((" ", Screen.COLOUR_WHITE, 0, 0, 1))
+                               for _ in range(self._height)]
         self.clear(Screen.COLOUR_WHITE, 0, 0)
 
+    def _new_row(self, cell):
+        """
+        Create a new row for the buffer.
+
+        :param cell: The 5-tuple to use for every cell in the row.
+        :return: The new row.
+        """
+        return [cell] * self._width
+
+    def _fill(self, x, y, width, cell):
+        """
+        Fill part of a row in the double-buffer with the same cell.
+
+        :param x: The X coordinate of the start of the span.
+        :param y: The Y coordinate of the row.
+        :param width: The width of the span.
+        :param cell: The 5-tuple to use for every cell in the span.
+        """
+        self._double_buffer[y][x:x + width] = [cell] * width
+
+    def _sync_span(self, y, start, stop):
+        """
+        Copy part of a row from the double-buffer to the screen buffer.
+
+        :param y: The Y coordinate of the row.
+        :param start: The X coordinate of the start of the span.
+        :param stop: The X coordinate of the end of the span (exclusive).
+        """
+        # The tuples are immutable, so only need a shallow copy.
+        self._screen_buffer[y][start:stop] = self._double_buffer[y][start:stop]
+
+    def _mark(self, y, start, stop):
+        """
+        Mark part of a row as changed since the last sync.
+
+        :param y: The Y coordinate of the row.
+        :param start: The X coordinate of the start of the span.
+        :param stop: The X coordinate of the end of the span (exclusive).
+        """
+        if start < self._dirty_min[y]:
+            self._dirty_min[y] = start
+        if stop > self._dirty_max[y]:
+            self._dirty_max[y] = stop
+        if self.priority > self._priorities[y]:
+            self._priorities[y] = self.priority
+
+    def _mark_all(self):
+        """
+        Mark the whole buffer as changed since the last sync.
+        """
+        self._dirty_min = [0] * self._height
+        self._dirty_max = [self._width] * self._height
+
     def clear(self, fg, attr, bg, x=0, y=0, w=None, h=None):
         """
         Clear a box in the double-buffer.
@@ -65,19 +138,22 @@ class _DoubleBuffer():
         height = self._height if h is None else h
         width = max(0, min(self._width - x, width))
         height = max(0, min(self._height - y, height))
-        line = [(" ", fg, attr, bg, 1) for _ in range(width)]
+        cell = (" ", fg, attr, bg, 1)
         if x == 0 and y == 0 and w is None and h is None:
-            self._double_buffer = [line[:] for _ in range(height)]
+            self._double_buffer = [self._new_row(cell) for _ in range(height)]
+            self._mark_all()
         else:
             for i in range(y, y + height):
-                self._double_buffer[i][x:x + w] = line[:]
+                self._fill(x, i, width, cell)
+                self._mark(i, x, x + width)
 
     def invalidate(self):
         """
         Invalidate the screen buffer to force a full refresh.
         """
-        line = [(None, None, None, None, 1) for _ in range(self._width)]
-        self._screen_buffer = [line[:] for _ in range(self._height)]
+        self._screen_buffer = [self._new_row((None, None, None, None, 1)) for _ in range(self._height)]
+        self._row_keys = [None] * self._height
+        self._mark_all()
 
     def get(self, x, y):
         """
@@ -94,21 +170,37 @@ class _DoubleBuffer():
         """
         Set the cell value from the specified location
 
-        :param x: The column (x coord) of the character.
+        :param x: The column (x coord) of the character, or a slice of columns.
         :param y: The row (y coord) of the character.
-        :param value: A 5-tuple of (unicode, foreground, attributes, background, width).
+        :param value: A 5-tuple of (unicode, foreground, attributes, background, width), or a list
+            of them (of the same length) for a slice.
         """
         self._double_buffer[y][x] = value
 
+        # Inline dirty tracking as this is called for (nearly) every cell drawn.
+        if isinstance(x, slice):
+            start, stop = x.start, x.stop
+        else:
+            start, stop = x, x + 1
+        if start < self._dirty_min[y]:
+            self._dirty_min[y] = start
+        if stop > self._dirty_max[y]:
+            self._dirty_max[y] = stop
+        if self.priority > self._priorities[y]:
+            self._priorities[y] = self.priority
+
     def deltas(self, start, height):
         """
         Return a list-like (i.e. iterable) object of (y, x) tuples
         """
         for y in range(start, min(start + height, self._height)):
-            for x in range(self._width):
-                old_cell = self._screen_buffer[y][x]
-                new_cell = self._double_buffer[y][x]
-                if old_cell != new_cell:
+            # Skip any rows that haven't been touched since the last sync.
+            if self._dirty_min[y] >= self._dirty_max[y]:
+                continue
+            old_row = self._screen_buffer[y]
+            new_row = self._double_buffer[y]
+            for x in range(self._dirty_min[y], self._dirty_max[y]):
+                if old_row[x] != new_row[x]:
                     yield y, x
 
     def scroll(self, lines):
@@ -117,7 +209,7 @@ class _DoubleBuffer():
 
         :param lines: Number of lines to scroll.  Negative numbers move the buffer up.
         """
-        line = [(" ", Screen.COLOUR_WHITE, 0, 0, 1) for _ in range(self._width)]
+        cell = (" ", Screen.COLOUR_WHITE, 0, 0, 1)
         if lines > 0:
             # Limit to buffer size - this will just invalidate all the data
             lines = min(lines, self._height)
@@ -125,8 +217,14 @@ class _DoubleBuffer():
                 self._double_buffer[y] = self._double_buffer[y + lines]
                 self._screen_buffer[y] = self._screen_buffer[y + lines]
             for y in range(self._height - lines, self._height):
-                self._double_buffer[y] = line[:]
-                self._screen_buffer[y] = line[:]
+                self._double_buffer[y] = self._new_row(cell)
+                self._screen_buffer[y] = self._new_row(cell)
+            self._dirty_min = self._dirty_min[lines:] + [self._width] * lines
+            self._dirty_max = self._dirty_max[lines:] + [0] * lines
+            self._priorities = self._priorities[lines:] + [0] * lines
+            self._stale = self._stale[lines:] + [0] * lines
+            self._row_keys = self._row_keys[lines:] + [None] * lines
+            self._new_keys = {}
         else:
             # Limit to buffer size - this will just invalidate all the data
             lines = max(lines, -self._height)
@@ -134,8 +232,135 @@ class _DoubleBuffer():
                 self._double_buffer[y] = self._double_buffer[y + lines]
                 self._screen_buffer[y] = self._screen_buffer[y + lines]
             for y in range(0, -lines):
-                self._double_buffer[y] = line[:]
-                self._screen_buffer[y] = line[:]
+                self._double_buffer[y] = self._new_row(cell)
+                self._screen_buffer[y] = self._new_row(cell)
+            self._dirty_min = [self._width] * -lines + self._dirty_min[:self._height + lines]
+            self._dirty_max = [0] * -lines + self._dirty_max[:self._height + lines]
+            self._priorities = [0] * -lines + self._priorities[:self._height + lines]
+            self._stale = [0] * -lines + self._stale[:self._height + lines]
+            self._row_keys = [None] * -lines + self._row_keys[:self._height + lines]
+            self._new_keys = {}
+
+    def _row_key(self, row):
+        """
+        Get a hashable key for the contents of a row.
+
+        :param row: The row to check.
+        :return: A key that is equal for any rows with the same contents.
+        """
+        return tuple(row)
+
+    def _old_key(self, y):
+        """
+        Get the key for a row of the screen buffer, caching it until that row changes.
+
+        :param y: The row to check.
+        :return: The key for the row.
+        """
+        key = self._row_keys[y]
+        if key is None:
+            key = self._row_keys[y] = self._row_key(self._screen_buffer[y])
+        return key
+
+    def find_shift(self, height):
+        """
+        Look for a block of rows that has moved vertically since the last sync.
+
+        Rows are matched by hashing their contents.  Only rows that are unique in both buffers are
+        used to anchor a match, so that (e.g.) blank lines can't cause false positives.
+
+        :param height: The number of rows (from the top of the buffer) to check.
+        :return: A tuple of (top, bottom, lines) for the region to scroll (inclusive) and the
+            number of lines to scroll it (negative numbers move the contents down), or None if
+            there is no worthwhile shift.
+        """
+        height = min(height, self._height)
+        changed = []
+        for y in range(height):
+            if self._dirty_min[y] < self._dirty_max[y]:
+                if self._screen_buffer[y] != self._double_buffer[y]:
+                    changed.append(y)
+                elif self._new_keys.get(y) is None:
+                    # Redrawn with the same contents, so keep the cached key after the sync.
+                    self._new_keys[y] = self._row_keys[y]
+        if len(changed) < 2:
+            return None
+
+        # Any anchor must be a changed row that used to be in another changed row (or else its
+        # contents would not be unique in one of the buffers), so only hash the changed rows
+        # until there is such a match.  All other rows are the same in both buffers.
+        for y in changed:
+            if self._new_keys.get(y) is None:
+                self._new_keys[y] = self._row_key(self._double_buffer[y])
+        if {self._new_keys[y] for y in changed}.isdisjoint([self._old_key(y) for y in changed]):
+            return None
+        old_keys = [self._old_key(y) for y in range(height)]
+        new_keys = old_keys[:]
+        for y in changed:
+            new_keys[y] = self._new_keys[y]
+        old_index = {}
+        for y, key in enumerate(old_keys):
+            old_index[key] = None if key in old_index else y
+        new_counts = {}
+        for key in new_keys:
+            new_counts[key] = new_counts.get(key, 0) + 1
+
+        # Grow a block around each anchor and pick the one that fixes the most rows.
+        best = None
+        best_score = 0
+        y = 0
+        while y < height:
+            key = new_keys[y]
+            old_y = old_index.get(key) if new_counts[key] == 1 else None
+            if old_y is None or old_y == y:
+                y += 1
+                continue
+            lines = old_y - y
+            start = y
+            while start > 0 and start + lines > 0 and new_keys[start - 1] == old_keys[start - 1 + lines]:
+                start -= 1
+            end = y + 1
+            while end < height and end + lines < height and new_keys[end] == old_keys[end + lines]:
+                end += 1
+
+            # Scrolling exposes a line for every line moved, so it must fix more lines than that.
+            score = sum(1 for i in range(start, end) if new_keys[i] != old_keys[i]) - abs(lines)
+            if score > best_score:
+                best = (start, end, lines)
+                best_score = score
+            y = end
+
+        if best is None:
+            return None
+        start, end, lines = best
+        if lines > 0:
+            return start, end - 1 + lines, lines
+        return start + lines, end - 1, lines
+
+    def shift_rows(self, top, bottom, lines):
+        """
+        Move rows in the screen buffer to match a scroll of part of the real screen.
+
+        Any rows exposed by the scroll are assumed to be blank (as for :py:meth:`.scroll`) and
+        are marked as changed, so that the next refresh draws any new content.
+
+        :param top: The first row of the scrolled region.
+        :param bottom: The last row of the scrolled region (inclusive).
+        :param lines: Number of lines to scroll.  Negative numbers move the contents down.
+        """
+        rows = self._screen_buffer[top:bottom + 1]
+        keys = self._row_keys[top:bottom + 1]
+        blanks = [self._new_row((" ", Screen.COLOUR_WHITE, 0, 0, 1)) for _ in range(abs(lines))]
+        if lines > 0:
+            self._screen_buffer[top:bottom + 1] = rows[lines:] + blanks
+            self._row_keys[top:bottom + 1] = keys[lines:] + [None] * lines
+            exposed = range(bottom + 1 - lines, bottom + 1)
+        else:
+            self._screen_buffer[top:bottom + 1] = blanks + rows[:lines]
+            self._row_keys[top:bottom + 1] = [None] * -lines + keys[:lines]
+            exposed = range(top, top - lines)
+        for y in exposed:
+            self._mark(y, 0, self._width)
 
     def block_transfer(self, buffer, x, y):
         """
@@ -156,8 +381,20 @@ class _DoubleBuffer():
         # Copy the available section
         for by in range(0, self._height):
             if y <= by < y + buffer.height:
-                self._double_buffer[by][block_min_x:block_max_x] = buffer.slice(
-                    block_min_x - x, by - y, block_max_x - block_min_x)
+                self.set(slice(block_min_x, block_max_x), by, buffer.slice(
+                    block_min_x - x, by - y, block_max_x - block_min_x))
+
+    def row(self, y):
+        """
+        Get a row of the double-buffer.
+
+        The format of the row depends on the type of buffer, so this is only for copying between
+        buffers of the same type.
+
+        :param y: The Y coordinate of the row.
+        :return: The row.
+        """
+        return self._double_buffer[y]
 
     def slice(self, x, y, width):
         """
@@ -170,13 +407,38 @@ class _DoubleBuffer():
         """
         return self._double_buffer[y][x:x + width]
 
-    def sync(self):
+    def sync(self, deferred=None):
         """
         Synchronize the screen buffer with the double buffer.
+
+        :param deferred: Optional set of rows that were not drawn and so should be left as they
+            are (i.e. still changed) for the next sync.
         """
-        # We're copying an array of tuples, so only need to copy the 2-D array (as the tuples are immutable).
-        # This is way faster than a deep copy (which is INCREDIBLY slow).
-        self._screen_buffer = [row[:] for row in self._double_buffer]
+        # Only need to copy the parts of the rows that have changed since the last sync.
+        for y in range(self._height):
+            if deferred and y in deferred:
+                self._stale[y] += 1
+                continue
+            if self._dirty_min[y] < self._dirty_max[y]:
+                self._sync_span(y, self._dirty_min[y], self._dirty_max[y])
+                self._dirty_min[y] = self._width
+                self._dirty_max[y] = 0
+                self._row_keys[y] = self._new_keys.get(y)
+            self._priorities[y] = 0
+            self._stale[y] = 0
+        self._new_keys = {}
+
+    def row_priority(self, y):
+        """
+        Get the priority for drawing a changed row.
+
+        This is the highest priority used to draw the row, plus the number of syncs for which it
+        has been deferred - so that low priority rows can't be deferred indefinitely.
+
+        :param y: The row to check.
+        :return: The priority of the row.
+        """
+        return self._priorities[y] + self._stale[y]
 
     @property
     def height(self):
@@ -200,6 +462,138 @@ class _DoubleBuffer():
     def colour_map(self):
         return [[x[1:4] for x in self.slice(0, y, self.width)] for y in range(self.height)]
 
+    def memory_usage(self):
+        """
+        :returns: The approximate number of bytes used by this buffer.
+        """
+        size = sum(getsizeof(x) for x in (
+            self._dirty_min, self._dirty_max, self._priorities, self._stale))
+        cells = set()
+        for buffer in (self._double_buffer, self._screen_buffer):
+            size += getsizeof(buffer)
+            for row in buffer:
+                size += getsizeof(row)
+                cells.update(map(id, row))
+
+        # Cells are often shared, so only count each one once.  The glyphs and colours inside
+        # them are mostly shared by the interpreter, so just count the tuples.
+        return size + len(cells) * getsizeof(("", 0, 0, 0, 0))
+
+
+class _ArrayDoubleBuffer(_DoubleBuffer):
+    """
+    Compact Screen buffering, using parallel typed arrays.
+
+    Each row is stored as a list of arrays - one each for the code point, foreground colour,
+    attributes, background colour and width of the cells.  This uses a fixed amount of memory per
+    cell, so it is much smaller than the pure python buffer (which shares identical cells) when
+    the screen is full of varied content.  Changed spans are copied in bulk, but the changed
+    cells are still compared and unpacked one at a time, so it is slower to refresh.
+    """
+
+    # Type codes for each of the arrays in a row.
+    _TYPE_CODES = ("l", "h", "h", "h", "b")
+
+    def _new_row(self, cell):
+        # Invalidated cells have no glyph, so use a code point that can never be printed.
+        values = (-1 if cell[0] is None else ord(cell[0]), cell[1] or 0, cell[2] or 0, cell[3] or 0, cell[4])
+        return [array(t, (v,)) * self._width for t, v in zip(self._TYPE_CODES, values)]
+
+    def _fill(self, x, y, width, cell):
+        values = (ord(cell[0]), cell[1], cell[2], cell[3], cell[4])
+        for field, t, v in zip(self._double_buffer[y], self._TYPE_CODES, values):
+            field[x:x + width] = array(t, (v,)) * width
+
+    def _sync_span(self, y, start, stop):
+        for old, new in zip(self._screen_buffer[y], self._double_buffer[y]):
+            old[start:stop] = new[start:stop]
+
+    def get(self, x, y):
+        row = self._double_buffer[y]
+        return chr(row[0][x]), row[1][x], row[2][x], row[3][x], row[4][x]
+
+    def set(self, x, y, value):
+        row = self._double_buffer[y]
+        if isinstance(x, slice):
+            # Slices must be the same size as the new value, or the row will be resized.
+            if len(value) == 0:
+                return
+            chars, fgs, attrs, bgs, widths = zip(*value)
+            row[0][x] = array("l", map(ord, chars))
+            for field, t, values in zip(row[1:], self._TYPE_CODES[1:], (fgs, attrs, bgs, widths)):
+                field[x] = array(t, values)
+            start, stop = x.start, x.stop
+        else:
+            row[0][x] = ord(value[0])
+            row[1][x] = value[1]
+            row[2][x] = value[2]
+            row[3][x] = value[3]
+            row[4][x] = value[4]
+            start, stop = x, x + 1
+        if start < self._dirty_min[y]:
+            self._dirty_min[y] = start
+        if stop > self._dirty_max[y]:
+            self._dirty_max[y] = stop
+        if self.priority > self._priorities[y]:
+            self._priorities[y] = self.priority
+
+    def deltas(self, start, height):
+        for y in range(start, min(start + height, self._height)):
+            lo = self._dirty_min[y]
+            hi = self._dirty_max[y]
+            if lo >= hi:
+                continue
+
+            # Only compare the individual cells for the arrays that have changed.
+            changed = set()
+            for old, new in zip(self._screen_buffer[y], self._double_buffer[y]):
+                old = old[lo:hi]
+                new = new[lo:hi]
+                if old != new:
+                    changed.update(lo + x for x, (a, b) in enumerate(zip(old, new)) if a != b)
+            for x in sorted(changed):
+                yield y, x
+
+    def _row_key(self, row):
+        # All fields have fixed size items, so the raw bytes are unambiguous.
+        return b"".join(field.tobytes() for field in row)
+
+    def block_transfer(self, buffer, x, y):
+        # Fall back to the generic cell copy for any other type of buffer.
+        if not isinstance(buffer, _ArrayDoubleBuffer):
+            super().block_transfer(buffer, x, y)
+            return
+
+        block_min_x = max(0, x)
+        block_max_x = min(x + buffer.width, self._width)
+        if block_min_x > block_max_x:
+            return
+
+        # Copy the arrays directly for the overlapping section.
+        for by in range(max(0, y), min(y + buffer.height, self._height)):
+            src = buffer.row(by - y)
+            for old, new in zip(self._double_buffer[by], src):
+                old[block_min_x:block_max_x] = new[block_min_x - x:block_max_x - x]
+            self._mark(by, block_min_x, block_max_x)
+
+    def slice(self, x, y, width):
+        row = self._double_buffer[y]
+        return list(zip(map(chr, row[0][x:x + width]), row[1][x:x + width], row[2][x:x + width],
+                        row[3][x:x + width], row[4][x:x + width]))
+
+    @property
+    def plain_image(self):
+        return ["".join(map(chr, row[0])) for row in self._double_buffer]
+
+    def memory_usage(self):
+        size = sum(getsizeof(x) for x in (
+            self._dirty_min, self._dirty_max, self._priorities, self._stale))
+        for buffer in (self._double_buffer, self._screen_buffer):
+            size += getsizeof(buffer)
+            for row in buffer:
+                size += getsizeof(row) + sum(getsizeof(field) for field in row)
+        return size
+
 
 class _AbstractCanvas(metaclass=ABCMeta):
     """
@@ -482,18 +876,20 @@ class _AbstractCanvas(metaclass=ABCMeta):
         0xee, 0xee, 0xee,
     ]
 
-    def __init__(self, height, width, buffer_height, colours, unicode_aware):
+    def __init__(self, height, width, buffer_height, colours, unicode_aware, compact_buffer=False):
         """
         :param height: The buffer height for this object.
         :param width: The buffer width for this object.
         :param buffer_height: The buffer height for this object.
         :param colours: Number of colours for this object.
         :param unicode_aware: Force use of unicode options for this object.
+        :param compact_buffer: Whether to use the compact (array-based) double-buffer.
         """
         super().__init__()
 
         # Can we handle unicode environments?
         self._unicode_aware = unicode_aware
+        self._compact_buffer = compact_buffer
 
         # Create screen buffers.
         self.height = height
@@ -507,6 +903,8 @@ class _AbstractCanvas(metaclass=ABCMeta):
 
         # dictionary cache for colour blending
         self._blends = {}
+        self._blend_hits = 0
+        self._blend_misses = 0
 
         # Reset the screen ready to go...
         self.reset()
@@ -536,7 +934,8 @@ class _AbstractCanvas(metaclass=ABCMeta):
         # Reset our screen buffer
         self._start_line = 0
         self._x = self._y = None
-        self._buffer = _DoubleBuffer(self._buffer_height, self.width)
+        buffer_class = _ArrayDoubleBuffer if self._compact_buffer else _DoubleBuffer
+        self._buffer = buffer_class(self._buffer_height, self.width)
         self._reset()
 
     def scroll(self, lines=1):
@@ -684,6 +1083,38 @@ class _AbstractCanvas(metaclass=ABCMeta):
         """
         return self._unicode_aware
 
+    @property
+    def compact_buffer(self):
+        """
+        :return: Whether the compact (array-based) double-buffer is being used.
+        """
+        return self._compact_buffer
+
+    def memory_usage(self):
+        """
+        Estimate the memory used by this object - i.e. its buffers and caches.
+
+        This is cheap enough to call periodically, e.g. to spot leaks or enforce limits.
+
+        :returns: The approximate number of bytes.
+        """
+        return self._buffer.memory_usage() + getsizeof(self._blends)
+
+    def cache_stats(self):
+        """
+        Get statistics for the caches used by this object.
+
+        :returns: A dictionary of statistics for each cache, keyed by name.  The statistics are
+            a dictionary of the current size and (if tracked) the number of hits and misses.
+        """
+        return {
+            "blends": {
+                "size": len(self._blends),
+                "hits": self._blend_hits,
+                "misses": self._blend_misses,
+            },
+        }
+
     @property
     def dimensions(self):
         """
@@ -781,7 +1212,9 @@ class _AbstractCanvas(metaclass=ABCMeta):
         # Check colour blend cache for a quick answer.
         key = (min(new, old), max(new, old))
         if key in self._blends:
+            self._blend_hits += 1
             return self._blends[key]
+        self._blend_misses += 1
 
         # No quick answer - do it the long way...  First lookup the RGB values
         # for both colours and blend.
@@ -1017,7 +1450,6 @@ class _AbstractCanvas(metaclass=ABCMeta):
             edges.append(new_edge)
 
         # Create a table of all the edges in the polygon, sorted on smallest x.
-        logger.debug("Processing polygon: %s", polygons)
         min_y = self.height
         max_y = -1
         edges = []
@@ -1057,8 +1489,9 @@ class _AbstractCanvas(metaclass=ABCMeta):
                 edge.min_y = 0
         min_y = max(0, min_y)
         max_y = min(max_y - min_y, self.height)
-
-        logger.debug("Resulting edges: %s", edges)
+        if tracing.ENABLED:
+            tracing.trace("polygon", polygons=len(polygons), edges=len(edges), min_y=min_y,
+                          lines=max_y)
 
         # Render each line in the bounding rectangle.
         for y in [min_y + (i / 2) for i in range(0, int(max_y) * 2)]:
@@ -1138,20 +1571,24 @@ class Canvas(_AbstractCanvas):
     called.
     """
 
-    def __init__(self, screen, height, width, x=None, y=None):
+    def __init__(self, screen, height, width, x=None, y=None, compact_buffer=None):
         """
         :param screen: The underlying Screen that will be drawn to on refresh.
         :param height: The height of the screen buffer to be used.
         :param width: The width of the screen buffer to be used.
         :param x: The x position for the top left corner of the Canvas.
         :param y: The y position for the top left corner of the Canvas.
+        :param compact_buffer: Whether to use the compact (array-based) double-buffer.  Defaults
+            to the same as the Screen.
 
         If either of the x or y positions is not set, the Canvas will default
         to centring within the current Screen for that location.
         """
         # Save off the screen details.
+        if compact_buffer is None:
+            compact_buffer = screen.compact_buffer
         super().__init__(
-            height, width, None, screen.colours, screen.unicode_aware)
+            height, width, None, screen.colours, screen.unicode_aware, compact_buffer)
         self._screen = screen
         self._dx = (screen.width - width) // 2 if x is None else x
         self._dy = (screen.height - height) // 2 if y is None else y
@@ -1175,6 +1612,13 @@ class Canvas(_AbstractCanvas):
         """
         return self._dx, self._dy
 
+    @property
+    def catch_up(self):
+        """
+        Whether Effects should catch up on skipped frames - as per the underlying Screen.
+        """
+        return self._screen.catch_up
+
 
 class Screen(_AbstractCanvas, metaclass=ABCMeta):
     """
@@ -1271,12 +1715,21 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
     KEY_CONTROL = -601
     KEY_MENU = -602
 
-    def __init__(self, height, width, buffer_height, unicode_aware):
+    # Maximum number of blocks of lines to scroll into place on each refresh.
+    _MAX_SHIFTS = 4
+
+    # Number of fast frames needed before restoring any shed Effects.
+    _SHED_RECOVERY_FRAMES = 10
+
+    # Functions to get the statistics for caches in other modules - see register_cache.
+    _cache_reporters = {}
+
+    def __init__(self, height, width, buffer_height, unicode_aware, compact_buffer=False):
         """
         Don't call this constructor directly.
         """
         super().__init__(
-            height, width, buffer_height, 0, unicode_aware)
+            height, width, buffer_height, 0, unicode_aware, compact_buffer)
 
         # Initialize base class variables - e.g. those used for drawing.
         self.height = height
@@ -1293,16 +1746,45 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
         self._cur_x = 0
         self._cur_y = 0
 
+        # Whether the Screen can scroll part of the display - set by children that support it.
+        self._hardware_scroll = False
+
+        # Optional limit on the output for each refresh.
+        self._byte_budget = None
+
+        # Callbacks posted from other threads to run on the next frame.
+        self._posted = SimpleQueue()
+
+        # Optional thread for writing output - see threaded_output.
+        self._writer = None
+        self._refresh_pending = False
+
+        # Optional profiler for each frame.
+        self._profiler = None
+
+        # Optional session recorder, and the clock to use for timing the Scenes.
+        self._recorder = None
+        self._clock = time.monotonic
+
+        # Whether Effects should catch up on skipped frames - see catch_up.
+        self._catch_up = False
+
+        # Load shedding state - only used if the frame budget is set.
+        self._frame_budget = None
+        self._shed_level = 0
+        self._shed_recovery = 0
+
         # Control variables for playing out a set of Scenes.
         self._scenes = []
         self._scene_index = 0
         self._frame = 0
+        self._scene_start = self._clock()
         self._idle_frame_count = 0
         self._forced_update = False
         self._unhandled_input = self._unhandled_event_default
 
     @classmethod
-    def open(cls, height=None, catch_interrupt=False, unicode_aware=None):
+    def open(cls, height=None, catch_interrupt=False, unicode_aware=None, compact_buffer=False):
         """
         Construct a new Screen for any platform.  This will just create the
         correct Screen object for your environment.  See :py:meth:`.wrapper` for
@@ -1313,6 +1795,10 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
             interrupts.  Defaults to False to maintain backwards compatibility.
         :param unicode_aware: Whether the application can use unicode or not.
             If None, try to detect from the environment if UTF-8 is enabled.
+        :param compact_buffer: Whether to use the compact (array-based) double-buffer.  This uses
+            a fixed amount of memory per cell, which is much less than the default buffer for
+            screens full of varied content (though more for mostly blank ones), at the cost of
+            slower refreshes and access to individual cells.
         """
         if sys.platform == "win32":
             # Clone the standard output buffer so that we can do whatever we
@@ -1369,7 +1855,8 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
             win_in.SetConsoleMode(new_mode)
 
             screen = _WindowsScreen(win_out, win_in, height, old_out, in_mode,
-                                    unicode_aware=unicode_aware)
+                                    unicode_aware=unicode_aware,
+                                    compact_buffer=compact_buffer)
         else:
             # Reproduce curses.wrapper()
             stdscr = curses.initscr()
@@ -1390,7 +1877,8 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
                 logger.debug(e)
             screen = _CursesScreen(stdscr, height,
                                    catch_interrupt=catch_interrupt,
-                                   unicode_aware=unicode_aware)
+                                   unicode_aware=unicode_aware,
+                                   compact_buffer=compact_buffer)
 
         return screen
 
@@ -1404,7 +1892,7 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
 
     @classmethod
     def wrapper(cls, func, height=None, catch_interrupt=False, arguments=None,
-                unicode_aware=None):
+                unicode_aware=None, compact_buffer=False):
         """
         Construct a new Screen for any platform.  This will initialize the
         Screen, call the specified function and then tidy up the system as
@@ -1418,10 +1906,12 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
             Screen object).
         :param unicode_aware: Whether the application can use unicode or not.
             If None, try to detect from the environment if UTF-8 is enabled.
+        :param compact_buffer: Whether to use the compact (array-based) double-buffer.
         """
         screen = Screen.open(height,
                              catch_interrupt=catch_interrupt,
-                             unicode_aware=unicode_aware)
+                             unicode_aware=unicode_aware,
+                             compact_buffer=compact_buffer)
         restore = True
         try:
             try:
@@ -1450,21 +1940,227 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
         """
         Refresh the screen.
         """
+        # Explicit refreshes must not be lost, so wait for any threaded output to catch up first.
+        if self._writer is not None:
+            self._writer.wait()
+        self._refresh_pending = False
+        if self._profiler is not None:
+            start = self._profiler.clock()
+
         # Scroll the screen now - we've already sorted the double-buffer to reflect this change.
         if self._last_start_line != self._start_line:
             self._scroll(self._start_line - self._last_start_line)
             self._last_start_line = self._start_line
 
-        # Now draw any deltas to the scrolled screen.  Note that CJK character sets sometimes
-        # use double-width characters, so don't try to draw the next 2nd char (of 0 width).
-        for y, x in self._buffer.deltas(0, self.height):
+        # Look for blocks of lines that have simply moved up or down and get the terminal to
+        # scroll them into place, so that only the newly exposed lines need to be drawn.
+        if self._hardware_scroll:
+            for _ in range(self._MAX_SHIFTS):
+                shift = self._buffer.find_shift(self.height)
+                if shift is None:
+                    break
+                if not self._scroll_region(*shift):
+                    break
+                self._buffer.shift_rows(*shift)
+
+        # Only draw as many lines as will fit in the byte budget (if there is one).
+        deltas = self._buffer.deltas(0, self.height)
+        deferred = None
+        if self._byte_budget is not None:
+            deltas, deferred = self._budget_deltas(deltas)
+            if deferred:
+                self._forced_update = True
+
+        # Now draw any deltas to the scrolled screen.  Consecutive changed cells with the same
+        # colours are batched up into a single run, so that each run only needs one cursor move
+        # and write.  Note that CJK character sets sometimes use double-width characters, so
+        # don't try to draw the next 2nd char (of 0 width).
+        run = []
+        run_x = run_y = next_x = colours = None
+        drawn = 0
+        for y, x in deltas:
             new_cell = self._buffer.get(x, y)
             if new_cell[4] > 0:
-                self._change_colours(new_cell[1], new_cell[2], new_cell[3])
-                self._print_at(new_cell[0], x, y, new_cell[4])
+                # It can be cheaper to re-print a short gap of unchanged cells than to move the
+                # cursor to the next change.
+                cells = [(x, new_cell)]
+                if run and y == run_y and x > next_x:
+                    cells = self._reprint_gap(next_x, x, y, colours, new_cell[1:4]) + cells
+                for cx, cell in cells:
+                    if run and (y != run_y or cx != next_x or cell[1:4] != colours):
+                        self._print_run(run, run_x, run_y, next_x - run_x, colours)
+                        drawn += next_x - run_x
+                        run = []
+                    if not run:
+                        run_x = next_x = cx
+                        run_y = y
+                        colours = cell[1:4]
+                    run.append(cell[0])
+                    next_x += cell[4]
+        if run:
+            self._print_run(run, run_x, run_y, next_x - run_x, colours)
+            drawn += next_x - run_x
 
         # Resynch for next refresh.
-        self._buffer.sync()
+        self._buffer.sync(deferred)
+        if tracing.ENABLED:
+            tracing.trace("refresh", cells=drawn, deferred=len(deferred) if deferred else 0)
+        if self._profiler is not None:
+            self._profiler.add_phase("refresh", self._profiler.clock() - start)
+            self._profiler.add_cells(drawn)
+
+    def _refresh_when_ready(self):
+        """
+        Refresh the screen, unless the threaded output is still busy writing the last frame.
+
+        Rather than queue up stale frames behind a slow terminal, this leaves the changes in the
+        double-buffer, so that the refresh after the writer catches up sends them all in one go.
+        """
+        if self._writer is not None and not self._writer.ready():
+            self._refresh_pending = True
+        else:
+            self.refresh()
+
+    def _shed_state(self, effect, tiers):
+        """
+        Work out whether to shed load from an Effect.
+
+        Each level of load shedding first degrades and then skips the Effects in the next lowest
+        priority tier.  The highest priority tier is never shed.
+
+        :param effect: The Effect to check.
+        :param tiers: The sorted list of distinct priorities in the Scene.
+        :returns: 0 to update as normal, 1 to update in degraded mode or 2 to skip the update.
+        """
+        if self._frame_budget is None:
+            return 0
+        # Effects can be added, or change priority (e.g. when a Frame gets the focus), after the
+        # tiers were worked out, so compare against the priorities rather than look them up.
+        shed = 0
+        if effect.priority < tiers[-1]:
+            tier = bisect_left(tiers, effect.priority)
+            shed = min(2, max(0, self._shed_level - 2 * tier))
+        effect.degraded = shed > 0
+        return shed
+
+    def _check_load(self, elapsed, tiers):
+        """
+        Adjust the level of load shedding based on how long the last frame took to draw.
+
+        :param elapsed: The time (in seconds) taken to update and refresh the frame.
+        :param tiers: The sorted list of distinct priorities in the Scene.
+        """
+        if self._frame_budget is None:
+            return
+        if elapsed > self._frame_budget:
+            self._shed_level = min(self._shed_level + 1, 2 * (len(tiers) - 1))
+            self._shed_recovery = 0
+        elif self._shed_level > 0 and elapsed < self._frame_budget / 2:
+            # Wait for a run of fast frames before restoring anything, to avoid flip-flopping.
+            self._shed_recovery += 1
+            if self._shed_recovery >= self._SHED_RECOVERY_FRAMES:
+                self._shed_level -= 1
+                self._shed_recovery = 0
+
+    def _budget_deltas(self, deltas):
+        """
+        Pick which of the changed lines to draw within the byte budget for this refresh.
+
+        Lines are picked in order of priority (see :py:obj:`.Effect.priority`).  Any lines that
+        don't fit are deferred to the next refresh, with a boosted priority so that they can't be
+        starved.  At least one line is always drawn.
+
+        :param deltas: The iterable of (y, x) tuples for all changed cells.
+        :returns: A tuple of the deltas to draw and the set of deferred lines.
+        """
+        rows = {}
+        for y, x in deltas:
+            rows.setdefault(y, []).append(x)
+
+        # Estimate the cost of each line from the glyphs, colour changes and cursor moves needed.
+        spent = 0
+        deferred = set()
+        for y in sorted(rows, key=lambda i: -self._buffer.row_priority(i)):
+            cost = self._cursor_move_cost(None, None, rows[y][0], y)
+            colours = (self._colour, self._attr, self._bg)
+            for x in rows[y]:
+                cell = self._buffer.get(x, y)
+                if cell[4] > 0:
+                    cost += len(cell[0].encode("utf-8")) + self._colour_cost(colours, cell[1:4])
+                    colours = cell[1:4]
+            if spent > 0 and spent + cost > self._byte_budget:
+                deferred.add(y)
+            else:
+                spent += cost
+        return [(y, x) for y in sorted(rows) if y not in deferred for x in rows[y]], deferred
+
+    def _reprint_gap(self, start, end, y, colours, next_colours):
+        """
+        Decide whether to re-print a gap of unchanged cells instead of moving the cursor over it.
+
+        :param start: The x coordinate of the start of the gap.
+        :param end: The x coordinate of the end of the gap (exclusive).
+        :param y: The y coordinate of the gap.
+        :param colours: The (foreground, attributes, background) tuple in use before the gap.
+        :param next_colours: The colours needed for the changed cell after the gap.
+        :returns: A list of (x, cell) tuples to re-print, or an empty list to move instead.
+        """
+        # Every glyph costs at least one byte, so don't bother checking long gaps.
+        move_cost = self._cursor_move_cost(start, y, end, y) + self._colour_cost(colours, next_colours)
+        if end - start >= move_cost:
+            return []
+
+        cells = []
+        cost = 0
+        current = colours
+        for x in range(start, end):
+            cell = self._buffer.get(x, y)
+            if cell[4] > 0:
+                cost += len(cell[0].encode("utf-8")) + self._colour_cost(current, cell[1:4])
+                current = cell[1:4]
+                cells.append((x, cell))
+        cost += self._colour_cost(current, next_colours)
+        return cells if cost < move_cost else []
+
+    def _cursor_move_cost(self, from_x, from_y, to_x, to_y):
+        """
+        Estimate the cost (in bytes) of moving the cursor between two locations.
+
+        By default, this assumes an absolute ANSI cursor move.  Sub-classes can override it with a
+        more accurate value for their output.
+
+        :param from_x: The x coordinate of the current location.
+        :param from_y: The y coordinate of the current location.
+        :param to_x: The x coordinate of the new location.
+        :param to_y: The y coordinate of the new location.
+        """
+        del from_x, from_y
+        return len(f"\x1b[{to_y + 1};{to_x + 1}H")
+
+    def _colour_cost(self, old, new):
+        """
+        Estimate the cost (in bytes) of changing colours.
+
+        By default, this assumes an ANSI 256 colour sequence.  Sub-classes can override it with a
+        more accurate value for their output.
+
+        :param old: The current (foreground, attributes, background) tuple.
+        :param new: The new (foreground, attributes, background) tuple.
+        """
+        return 0 if old == new else len("\x1b[0;38;5;255;48;5;255m")
+
+    def _print_run(self, run, x, y, width, colours):
+        """
+        Print a run of glyphs that share the same colours.
+
+        :param run: The list of glyphs to print.
+        :param x: The x coordinate of the start of the run.
+        :param y: The y coordinate of the run.
+        :param width: The total width of the run.
+        :param colours: The (foreground, attributes, background) tuple for the run.
+        """
+        self._change_colours(*colours)
+        self._print_at("".join(run), x, y, width)
 
     def clear(self):
         """
@@ -1565,7 +2261,7 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
                 raise NextScene()
 
     def play(self, scenes, stop_on_resize=False, unhandled_input=None,
-             start_scene=None, repeat=True, allow_int=False):
+             start_scene=None, repeat=True, allow_int=False, scheduler=None):
         """
         Play a set of scenes.
 
@@ -1584,6 +2280,8 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
         :param repeat: Whether to repeat the Scenes once it has reached the end.
             Defaults to True.
         :param allow_int: Allow input to interrupt frame rate delay.
+        :param scheduler: Optional :py:obj:`.FrameScheduler` to pace the frames.  Defaults to
+            20 frames per second.
 
         :raises ResizeScreenError: if the screen is resized (and allowed by
             stop_on_resize).
@@ -1596,26 +2294,198 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
             scenes, unhandled_input=unhandled_input, start_scene=start_scene)
 
         # Mainline loop for animations
+        scheduler = FrameScheduler() if scheduler is None else scheduler
+        scheduler.start()
+        self._frame_budget = scheduler.interval if scheduler.shed_load else None
+        self._catch_up = scheduler.skip_frames
         try:
             while True:
-                a = time.time()
                 self.draw_next_frame(repeat=repeat)
                 if self.has_resized():
+                    if self._recorder is not None:
+                        self._recorder.record_resize()
                     if stop_on_resize:
                         self._scenes[self._scene_index].exit()
                         raise ResizeScreenError("Screen resized",
                                                 self._scenes[self._scene_index])
-                b = time.time()
-                if b - a < 0.05:
-                    # Just in case time has jumped (e.g. time change), ensure we only delay for 0.05s
-                    pause = min(0.05, a + 0.05 - b)
+                pause, skipped = scheduler.end_frame()
+                self._skip_frames(skipped)
+                if pause > 0:
                     if allow_int:
                         self.wait_for_input(pause)
                     else:
                         time.sleep(pause)
+
+                # Don't bother polling if nothing needs to be redrawn for a while.
+                self._wait_while_idle(scheduler)
+        except StopApplication:
+            # Time to stop  - just exit the function.
+            return
+
+    async def play_async(self, scenes, stop_on_resize=False, unhandled_input=None,
+                         start_scene=None, repeat=True, scheduler=None):
+        """
+        Play a set of scenes from an asyncio event loop.
+
+        This is the asynchronous equivalent of :py:meth:`.play`.  Rather than blocking, it waits
+        for input (or for the next frame to be due) using the running event loop, so that other
+        tasks can run in the meantime.  Tasks that change what needs to be displayed should call
+        :py:meth:`.force_update` to get it redrawn straight away.
+
+        :param scenes: a list of :py:obj:`.Scene` objects to play.
+        :param stop_on_resize: Whether to stop when the screen is resized.
+        :param unhandled_input: Function to call for any input not handled by the Scenes/Effects
+            being played.  Defaults to a function that closes the application on "Q" or "X" being
+            pressed.
+        :param start_scene: The old Scene to start from.  This must have name that matches the
+            name of one of the Scenes passed in.
+        :param repeat: Whether to repeat the Scenes once it has reached the end.
+        :param scheduler: Optional :py:obj:`.FrameScheduler` to pace the frames.  Defaults to
+            20 frames per second.
+
+        :raises ResizeScreenError: if the screen is resized (and allowed by stop_on_resize).
+        """
+        # Initialise the Screen for animation.
+        self.set_scenes(
+            scenes, unhandled_input=unhandled_input, start_scene=start_scene)
+        scheduler = FrameScheduler() if scheduler is None else scheduler
+        scheduler.start()
+        self._frame_budget = scheduler.interval if scheduler.shed_load else None
+        self._catch_up = scheduler.skip_frames
+
+        # Watch for input using the event loop where possible, or fall back to polling.
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Event()
+        fds = self._input_fds()
+
+        def _on_input():
+            self._drain_wake()
+            ready.set()
+
+        for fd in fds:
+            loop.add_reader(fd, _on_input)
+
+        # Mainline loop for animations
+        try:
+            while True:
+                self.draw_next_frame(repeat=repeat)
+                if self.has_resized():
+                    if self._recorder is not None:
+                        self._recorder.record_resize()
+                    if stop_on_resize:
+                        self._scenes[self._scene_index].exit()
+                        raise ResizeScreenError("Screen resized",
+                                                self._scenes[self._scene_index])
+                _, skipped = scheduler.end_frame()
+                self._skip_frames(skipped)
+
+                # Wait for the next frame that needs to be drawn, or until there is some input.
+                frames = self._idle_frames()
+                timeout = None if frames is None else max(0, scheduler.time_until(frames))
+                if not fds:
+                    timeout = 0.05 if timeout is None else min(timeout, 0.05)
+                ready.clear()
+                try:
+                    await asyncio.wait_for(ready.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                if frames is not None:
+                    self._skip_frames(scheduler.catch_up(frames))
         except StopApplication:
             # Time to stop  - just exit the function.
             return
+        finally:
+            for fd in fds:
+                loop.remove_reader(fd)
+
+    def call_soon_threadsafe(self, callback, *args):
+        """
+        Schedule a function to be called on the thread that is drawing the Screen.
+
+        This can be called from any thread - e.g. a worker that collects data to display.  The
+        callback will be run at the start of the next frame (followed by a refresh), waking up
+        the Screen if it is waiting for input.
+
+        :param callback: The function to call.
+        :param args: Any arguments to pass to the callback.
+        """
+        self._posted.put((callback, args))
+        self._wake()
+
+    def _run_posted(self):
+        """
+        Run any callbacks posted from other threads.
+
+        :returns: True if any callbacks were run.
+        """
+        ran = False
+        while True:
+            try:
+                callback, args = self._posted.get_nowait()
+            except Empty:
+                return ran
+            callback(*args)
+            ran = True
+
+    def _input_fds(self):
+        """
+        Get the file descriptors that become readable when there is new input for the Screen (or
+        it needs to wake up for some other reason).
+
+        :returns: A list of file descriptors, which is empty if the Screen can't be watched this
+            way.
+        """
+        return []
+
+    def _wake(self):
+        """
+        Wake up any current wait for input.
+        """
+
+    def _drain_wake(self):
+        """
+        Clear any pending wake ups.
+        """
+
+    def _idle_frames(self):
+        """
+        Work out how many frames can be skipped before the next one that needs to be drawn.
+
+        :returns: The number of frames, or None if nothing needs to be drawn until there is some
+            input.
+        """
+        if self._forced_update or self._refresh_pending:
+            return 0
+        frames = None if self._idle_frame_count >= 1000000 else self._idle_frame_count - 1
+        duration = self._scenes[self._scene_index].duration
+        if duration > 0:
+            remaining = duration - self._frame - 1
+            frames = remaining if frames is None else min(frames, remaining)
+        return frames
+
+    def _wait_while_idle(self, scheduler):
+        """
+        Block until the next frame that needs to be drawn, or until there is some input.
+
+        Any frames that were skipped while waiting are counted as if they had been played, so
+        that timings in the Scene are unaffected.
+
+        :param scheduler: The FrameScheduler pacing the frames.
+        """
+        frames = self._idle_frames()
+        if frames is not None and frames <= 0:
+            return
+        self.wait_for_input(None if frames is None else max(0, scheduler.time_until(frames)))
+        self._skip_frames(scheduler.catch_up(frames))
+
+    def _skip_frames(self, frames):
+        """
+        Count frames as played without drawing them.
+
+        :param frames: The number of frames to skip.
+        """
+        self._frame += frames
+        self._idle_frame_count -= frames
 
     def set_scenes(self, scenes, unhandled_input=None, start_scene=None):
         """
@@ -1665,7 +2535,10 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
 
         # Reset other internal state for the animation
         self._frame = 0
+        self._scene_start = self._clock()
         self._idle_frame_count = 0
+        self._frame_budget = None
+        self._shed_level = 0
         self._forced_update = False
         self.clear()
 
@@ -1680,10 +2553,22 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
         :raises StopApplication: if the application should be terminated.
         """
         scene = self._scenes[self._scene_index]
+        profiler = self._profiler
+        if profiler is not None:
+            profiler.start_frame(self._frame + 1)
+            start = profiler.clock()
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.start_frame(self._frame, self._clock(), self._shed_level)
         try:
+            # Run anything posted from other threads first, as it probably needs a refresh too.
+            got_event = self._run_posted()
+
             # Check for an event now and remember for refresh reasons.
             event = self.get_event()
-            got_event = event is not None
+            if recorder is not None:
+                recorder.record_event(event)
+            got_event = got_event or event is not None
 
             # Now process all the input events
             while event is not None:
@@ -1691,6 +2576,8 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
                 if event is not None and self._unhandled_input is not None:
                     self._unhandled_input(event)
                 event = self.get_event()
+                if recorder is not None:
+                    recorder.record_event(event)
 
             # Only bother with a refresh if there was an event to process or
             # we have to refresh due to the refresh limit required for an
@@ -1698,11 +2585,25 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
             self._frame += 1
             self._idle_frame_count -= 1
             if got_event or self._idle_frame_count <= 0 or self._forced_update:
+                if profiler is not None:
+                    profiler.add_phase("events", profiler.clock() - start)
+                    start = profiler.clock()
                 self._forced_update = False
                 self._idle_frame_count = 1000000
+                frame_start = self._clock()
+                tiers = None
+                if self._frame_budget is not None:
+                    tiers = sorted({effect.priority for effect in scene.effects})
                 for effect in scene.effects:
-                    # Update the effect and delete if needed.
-                    effect.update(self._frame)
+                    # Update the effect (unless shedding load) and delete if needed.  Anything it
+                    # draws is tagged with its priority in case the refresh can't draw it all.
+                    shed = self._shed_state(effect, tiers)
+                    if shed < 2:
+                        self._buffer.priority = effect.priority
+                        if profiler is None:
+                            effect.update(self._frame)
+                        else:
+                            profiler.update_effect(effect, self._frame)
                     if effect.delete_count is not None:
                         effect.delete_count -= 1
                         if effect.delete_count <= 0:
@@ -1712,7 +2613,16 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
                     if effect.frame_update_count > 0:
                         self._idle_frame_count = min(self._idle_frame_count,
                                                      effect.frame_update_count)
-                self.refresh()
+                self._buffer.priority = 0
+                if profiler is not None:
+                    profiler.add_phase("update", profiler.clock() - start)
+                self._refresh_when_ready()
+                self._check_load(self._clock() - frame_start, tiers)
+                if profiler is not None:
+                    profiler.end_frame()
+            elif self._refresh_pending:
+                # Nothing new to draw, but the last frame is still waiting for the writer.
+                self._refresh_when_ready()
 
             if 0 < scene.duration <= self._frame:
                 raise NextScene()
@@ -1742,9 +2652,13 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
             scene = self._scenes[self._scene_index]
             scene.reset()
             self._frame = 0
+            self._scene_start = self._clock()
             self._idle_frame_count = 0
             if scene.clear:
                 self.clear()
+        finally:
+            if recorder is not None:
+                recorder.end_frame()
 
     @property
     def current_scene(self):
@@ -1754,24 +2668,170 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
         """
         return self._scenes[self._scene_index]
 
-    def force_update(self, full_refresh=False):
+    @property
+    def catch_up(self):
         """
-        Force the Screen to redraw the current Scene on the next call to
-        draw_next_frame, overriding the frame_update_count value for all the
-        Effects.
+        Whether Effects that step once per frame (e.g. Cycle and Sprite) should also take the
+        steps for any frames that were skipped, so that they stay in time.
 
-        :param full_refresh: if True force the whole screen to redraw.
+        :py:meth:`.play` sets this from the `skip_frames` option of its :py:obj:`.FrameScheduler`.
+        Otherwise they simply carry on from where they were, as they always have.
         """
-        self._forced_update = True
-        if full_refresh:
-            self._buffer.invalidate()
+        return self._catch_up
 
-    @abstractmethod
-    def _change_colours(self, colour, attr, bg):
+    @catch_up.setter
+    def catch_up(self, value):
+        self._catch_up = value
+
+    @property
+    def scene_time(self):
         """
-        Change current colour if required.
+        The time (in seconds) since the current Scene started.
 
-        :param colour: New colour to use.
+        Effects are normally driven by the frame number alone.  Use this if you need to know how
+        much real time has elapsed - e.g. to keep animations in time when frames are dropped.
+        """
+        return self._clock() - self._scene_start
+
+    @property
+    def clock(self):
+        """
+        The function used to get the current time (in seconds) for :py:obj:`.scene_time`.
+        """
+        return self._clock
+
+    @property
+    def byte_budget(self):
+        """
+        The (approximate) maximum number of bytes to send to the terminal on each refresh, or None
+        for no limit.
+
+        This is intended for slow connections, where a large change could otherwise stall the
+        application.  When the changes won't fit, the lines drawn by the highest priority Effects
+        are sent first and the rest are carried over to the next refresh.
+        """
+        return self._byte_budget
+
+    @byte_budget.setter
+    def byte_budget(self, value):
+        self._byte_budget = value
+
+    @property
+    def threaded_output(self):
+        """
+        Whether to write the output for each refresh from a separate thread.
+
+        This stops a slow terminal from stalling input handling and Effect updates.  If the
+        terminal falls behind, the refreshes for frames drawn by :py:meth:`.draw_next_frame` are
+        skipped until it catches up and then all the changes are sent at once, so there is never a
+        backlog of stale frames to write.  Explicit calls to :py:meth:`.refresh` wait for the
+        terminal to catch up instead.  Not supported on Windows or by :py:obj:`.HeadlessScreen`,
+        where enabling it raises a RuntimeError.
+        """
+        return self._writer is not None
+
+    @threaded_output.setter
+    def threaded_output(self, value):
+        if value and self._writer is None:
+            self._writer = self._create_writer()
+        elif not value and self._writer is not None:
+            writer, self._writer = self._writer, None
+            writer.close()
+
+    def _create_writer(self):
+        """
+        Create the writer for threaded output.
+
+        :returns: The writer.
+        :raises RuntimeError: if this Screen doesn't support threaded output.
+        """
+        raise RuntimeError(f"{type(self).__name__} does not support threaded output")
+
+    @property
+    def profiler(self):
+        """
+        The :py:obj:`.FrameProfiler` used to record where the time goes when drawing each frame,
+        or None to disable profiling.
+        """
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, value):
+        self._profiler = value
+
+    @property
+    def recorder(self):
+        """
+        The :py:obj:`.SessionRecorder` used to record the input and timing of each frame so that
+        the session can be replayed later, or None to disable recording.  Set this before creating
+        your Scenes, so that any random numbers they use can be replayed too.
+        """
+        return self._recorder
+
+    @recorder.setter
+    def recorder(self, value):
+        if value is not None:
+            value.start(self)
+        self._recorder = value
+
+    @staticmethod
+    def register_cache(name, stats):
+        """
+        Register a cache from another module (e.g. the widgets) to be included in
+        :py:meth:`.cache_stats`.
+
+        :param name: The name of the cache.
+        :param stats: Function to get the statistics for the cache - as a dictionary of the
+            current size and (if tracked) the number of hits and misses.
+        """
+        Screen._cache_reporters[name] = stats
+
+    def cache_stats(self):
+        stats = super().cache_stats()
+        for name, reporter in self._cache_reporters.items():
+            stats[name] = reporter()
+        return stats
+
+    def memory_report(self):
+        """
+        Estimate the memory used by this Screen and the Scenes it is playing.
+
+        :returns: A dictionary with the bytes used by the Screen, a list of the bytes used by each
+            Scene (and its Effects), and the statistics for all the caches.
+        """
+        return {
+            "screen": self.memory_usage(),
+            "scenes": [
+                {
+                    "name": scene.name,
+                    "bytes": scene.memory_usage(),
+                    "effects": [(type(effect).__name__, effect.memory_usage())
+                                for effect in scene.effects],
+                }
+                for scene in self._scenes
+            ],
+            "caches": self.cache_stats(),
+        }
+
+    def force_update(self, full_refresh=False):
+        """
+        Force the Screen to redraw the current Scene on the next call to
+        draw_next_frame, overriding the frame_update_count value for all the
+        Effects.
+
+        :param full_refresh: if True force the whole screen to redraw.
+        """
+        self._forced_update = True
+        if full_refresh:
+            self._buffer.invalidate()
+        self._wake()
+
+    @abstractmethod
+    def _change_colours(self, colour, attr, bg):
+        """
+        Change current colour if required.
+
+        :param colour: New colour to use.
         :param attr: New attributes to use.
         :param bg: New background colour to use.
         """
@@ -1781,7 +2841,8 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
         """
         Wait until there is some input or the timeout is hit.
 
-        :param timeout: Time to wait for input in seconds (floating point).
+        :param timeout: Time to wait for input in seconds (floating point), or None to wait until
+            there is some input.
         """
 
     @abstractmethod
@@ -1792,7 +2853,8 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
         :param text: The text string to print.
         :param x: The x coordinate
         :param y: The Y coordinate
-        :param width: The width of the character (for dual-width glyphs in CJK languages).
+        :param width: The total width of the text (allowing for dual-width glyphs in CJK
+            languages).
         """
 
     @abstractmethod
@@ -1809,6 +2871,21 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
         :param lines: Number of lines to scroll.  Negative numbers scroll down.
         """
 
+    def _scroll_region(self, top, bottom, lines):
+        """
+        Scroll part of the window up or down.
+
+        This is only used if the Screen sets `_hardware_scroll` to show that it can do this.  By
+        default, it does nothing and the lines are simply redrawn.
+
+        :param top: The first line of the region to scroll.
+        :param bottom: The last line of the region to scroll (inclusive).
+        :param lines: Number of lines to scroll.  Negative numbers scroll down.
+        :returns: Whether the region was scrolled.
+        """
+        del top, bottom, lines
+        return False
+
     @abstractmethod
     def set_title(self, title):
         """
@@ -1819,6 +2896,351 @@ class Screen(_AbstractCanvas, metaclass=ABCMeta):
         """
 
 
+class HeadlessScreen(Screen):
+    """
+    A Screen that renders to memory instead of a terminal.
+
+    This allows you to play Scenes without a terminal - e.g. to measure the cost of rendering in
+    automated tests, or to render your UI for some other sort of display.  Output is generated as
+    ANSI escape sequences, which are stored in :py:obj:`.output` and counted by
+    :py:obj:`.bytes_written`, :py:obj:`.escapes_written` and :py:obj:`.cells_written`.  The
+    resulting display is available from :py:obj:`.cells`.
+
+    There is no keyboard or mouse, so use :py:meth:`.inject_event` to provide any input.  There is
+    no need to wait for real time to pass either, so you can drive the frames yourself with
+    :py:meth:`.draw_next_frame` and :py:meth:`.skip_frames` and a virtual clock.
+    """
+
+    def __init__(self, height=24, width=80, colours=256, unicode_aware=True,
+                 compact_buffer=False, clock=time.monotonic, hardware_scroll=True):
+        """
+        :param height: The height of the Screen.
+        :param width: The width of the Screen.
+        :param colours: The number of colours to support.
+        :param unicode_aware: Whether this Screen can use unicode or not.
+        :param compact_buffer: Whether to use the compact (array-based) double-buffer.
+        :param clock: The function to use to get the current time in seconds.
+        :param hardware_scroll: Whether to scroll blocks of lines that have moved, rather than
+            redrawing them.
+        """
+        self._cells = []
+        self._output = []
+        self._bytes_written = 0
+        self._escapes_written = 0
+        self._cells_written = 0
+        self._events = SimpleQueue()
+        self._wake_event = threading.Event()
+        super().__init__(height, width, None, unicode_aware, compact_buffer)
+        self.colours = colours
+        self._clock = clock
+        self._scene_start = clock()
+        self._hardware_scroll = hardware_scroll
+        self._fixed_shed_level = False
+        self._blank_cells()
+
+    def _blank_cells(self, top=0, bottom=None):
+        """
+        Blank out lines of the display.
+
+        :param top: The first line to blank.
+        :param bottom: The line after the last one to blank.  Defaults to the end of the Screen.
+        """
+        bottom = self.height if bottom is None else bottom
+        blank = (" ", Screen.COLOUR_WHITE, 0, Screen.COLOUR_BLACK)
+        self._cells[top:bottom] = [[blank] * self.width for _ in range(top, bottom)]
+
+    def _write(self, text, escapes=0):
+        """
+        Record output that would have been sent to a terminal.
+
+        :param text: The text to write.
+        :param escapes: The number of escape sequences in the text.
+        """
+        count = len(text.encode("utf-8"))
+        self._output.append(text)
+        self._bytes_written += count
+        self._escapes_written += escapes
+        if self._profiler is not None:
+            self._profiler.add_bytes(count)
+
+    @property
+    def output(self):
+        """
+        The ANSI output generated since the statistics were last reset.
+        """
+        return "".join(self._output)
+
+    @property
+    def bytes_written(self):
+        """
+        The number of bytes of (UTF-8 encoded) output since the statistics were last reset.
+        """
+        return self._bytes_written
+
+    @property
+    def escapes_written(self):
+        """
+        The number of escape sequences output since the statistics were last reset.
+        """
+        return self._escapes_written
+
+    @property
+    def cells_written(self):
+        """
+        The number of cells drawn since the statistics were last reset.
+        """
+        return self._cells_written
+
+    @property
+    def cells(self):
+        """
+        The current display as a list of lines, where each line is a list of (glyph, foreground,
+        attributes, background) tuples.  The second cell of a double-width glyph is empty.
+        """
+        return [list(line) for line in self._cells]
+
+    def memory_usage(self):
+        size = super().memory_usage() + getsizeof(self._cells) + getsizeof(self._output)
+        size += sum(getsizeof(line) for line in self._cells)
+        size += sum(getsizeof(text) for text in self._output)
+        return size
+
+    def reset_stats(self):
+        """
+        Reset the output and counters for the bytes, escape sequences and cells written.
+        """
+        self._output = []
+        self._bytes_written = 0
+        self._escapes_written = 0
+        self._cells_written = 0
+
+    @property
+    def frame(self):
+        """
+        The number of frames played so far in the current Scene.
+        """
+        return self._frame
+
+    def skip_frames(self, frames):
+        """
+        Count frames as played without drawing them - e.g. to skip over frames where nothing
+        needs to be drawn.
+
+        :param frames: The number of frames to skip.
+        """
+        self._skip_frames(frames)
+
+    def idle_frames(self):
+        """
+        Work out how many frames can be skipped before the next one that needs to be drawn.
+
+        :returns: The number of frames, or None if nothing needs to be drawn until there is some
+            input or the Scenes never end.
+        """
+        return self._idle_frames()
+
+    @property
+    def shed_level(self):
+        """
+        The current level of load shedding.
+
+        Each level degrades or skips the Effects in the next lowest priority tier - see
+        :py:obj:`.FrameScheduler`.  This is normally set by :py:meth:`.play` when frames take too
+        long to draw, but you can also fix it here - e.g. to replay a session that was recorded
+        while shedding load.  The level stays fixed until the Scenes are next set.
+        """
+        return self._shed_level
+
+    @shed_level.setter
+    def shed_level(self, value):
+        self._fixed_shed_level = True
+        self._frame_budget = float("inf")
+        self._shed_level = value
+
+    def _check_load(self, elapsed, tiers):
+        if not self._fixed_shed_level:
+            super()._check_load(elapsed, tiers)
+
+    def set_scenes(self, scenes, unhandled_input=None, start_scene=None):
+        self._fixed_shed_level = False
+        super().set_scenes(scenes, unhandled_input=unhandled_input, start_scene=start_scene)
+
+    def inject_event(self, event):
+        """
+        Queue an event to be returned by :py:meth:`.get_event`.  This is safe to call from any
+        thread.
+
+        :param event: The KeyboardEvent or MouseEvent to inject.
+        """
+        self._events.put(event)
+        self._wake()
+
+    def close(self, restore=True):
+        """
+        Close down this Screen.  There is nothing to restore, so this does nothing.
+
+        :param restore: Ignored.
+        """
+
+    def get_event(self):
+        """
+        Check for any injected event without waiting.
+        """
+        try:
+            return self._events.get_nowait()
+        except Empty:
+            return None
+
+    def has_resized(self):
+        """
+        Check whether the Screen has been re-sized - which never happens to a HeadlessScreen.
+        """
+        return False
+
+    def wait_for_input(self, timeout):
+        """
+        Wait until there is some input or the timeout is hit.
+
+        :param timeout: Time to wait for input in seconds (floating point), or None to wait until
+            there is some input.
+        """
+        if self._events.empty():
+            self._wake_event.wait(timeout)
+        self._wake_event.clear()
+
+    def _wake(self):
+        self._wake_event.set()
+
+    def _sgr(self, colour, attr, bg):
+        """
+        Build the ANSI escape sequence to select a set of colours and attributes.
+
+        :param colour: The foreground colour.
+        :param attr: The attributes.
+        :param bg: The background colour.
+        """
+        params = ["0"]
+        if attr in self._SGR_ATTRIBUTES:
+            params.append(self._SGR_ATTRIBUTES[attr])
+        for value, base, extended in ((colour, 30, 38), (bg, 40, 48)):
+            if value == Screen.COLOUR_DEFAULT:
+                params.append(str(base + 9))
+            elif value < 8:
+                params.append(str(base + value))
+            elif value < 16 and self.colours <= 16:
+                params.append(str(base + 60 + value - 8))
+            else:
+                params.append(f"{extended};5;{value}")
+        return f"\x1b[{';'.join(params)}m"
+
+    # SGR parameters for each of the Screen attributes.
+    _SGR_ATTRIBUTES = {
+        Screen.A_BOLD: "1",
+        Screen.A_REVERSE: "7",
+        Screen.A_UNDERLINE: "4",
+    }
+
+    def _change_colours(self, colour, attr, bg):
+        """
+        Change current colour if required.
+
+        :param colour: New colour to use.
+        :param attr: New attributes to use.
+        :param bg: New background colour to use.
+        """
+        if colour != self._colour or attr != self._attr or bg != self._bg:
+            self._write(self._sgr(colour, attr, bg), 1)
+            self._colour = colour
+            self._attr = attr
+            self._bg = bg
+
+    def _move_cursor(self, x, y):
+        """
+        Move the cursor if required.
+
+        :param x: The new x coordinate.
+        :param y: The new y coordinate.
+        """
+        if x != self._cur_x or y != self._cur_y:
+            self._write(f"\x1b[{y + 1};{x + 1}H", 1)
+            self._cur_x = x
+            self._cur_y = y
+
+    def _print_at(self, text, x, y, width):
+        """
+        Print string at the required location.
+
+        :param text: The text string to print.
+        :param x: The x coordinate
+        :param y: The Y coordinate
+        :param width: The total width of the text (allowing for dual-width glyphs in CJK
+            languages).
+        """
+        self._move_cursor(x, y)
+        self._write(text)
+        self._cells_written += width
+        line = self._cells[y]
+        colours = (self._colour, self._attr, self._bg)
+        for c in text:
+            glyph_width = wcwidth(c) if self._unicode_aware and ord(c) >= 256 else 1
+            if x + glyph_width > self.width:
+                break
+            line[x] = (c,) + colours
+            if glyph_width == 2:
+                line[x + 1] = ("",) + colours
+            x += glyph_width
+        self._cur_x += width
+
+    def _clear(self):
+        """
+        Clear the Screen of all content.
+        """
+        self._write("\x1b[H\x1b[2J", 2)
+        self._cur_x = self._cur_y = 0
+        self._blank_cells()
+
+    def _scroll(self, lines):
+        """
+        Scroll the window up or down.
+
+        :param lines: Number of lines to scroll.  Negative numbers scroll down.
+        """
+        self._scroll_region(0, self.height - 1, lines)
+
+    def _scroll_region(self, top, bottom, lines):
+        """
+        Scroll part of the window up or down.
+
+        :param top: The first line of the region to scroll.
+        :param bottom: The last line of the region to scroll (inclusive).
+        :param lines: Number of lines to scroll.  Negative numbers scroll down.
+        :returns: Whether the region was scrolled.
+        """
+        self._change_colours(Screen.COLOUR_WHITE, 0, Screen.COLOUR_BLACK)
+        scroll = f"\x1b[{lines}S" if lines > 0 else f"\x1b[{-lines}T"
+        self._write(f"\x1b[{top + 1};{bottom + 1}r{scroll}\x1b[r", 3)
+        self._cur_x = self._cur_y = None
+
+        # Move the lines in the region and blank out the exposed ones.
+        count = min(abs(lines), bottom - top + 1)
+        region = self._cells[top:bottom + 1]
+        if lines > 0:
+            self._cells[top:bottom + 1 - count] = region[count:]
+            self._blank_cells(bottom + 1 - count, bottom + 1)
+        else:
+            self._cells[top + count:bottom + 1] = region[:len(region) - count]
+            self._blank_cells(top, top + count)
+        return True
+
+    def set_title(self, title):
+        """
+        Set the title for this Screen.
+
+        :param title: The title to be set.
+        """
+        self._write(f"\x1b]2;{title}\x07", 1)
+
+
 class ManagedScreen():
     """
     Decorator and class to create a managed Screen. It can be used in
@@ -1997,7 +3419,7 @@ if sys.platform == "win32":
         }
 
         def __init__(self, stdout, stdin, buffer_height, old_out, old_in,
-                     unicode_aware=False):
+                     unicode_aware=False, compact_buffer=False):
             """
             :param stdout: The win32console PyConsoleScreenBufferType object for stdout.
             :param stdin: The win32console PyConsoleScreenBufferType object for stdin.
@@ -2006,6 +3428,7 @@ if sys.platform == "win32":
                 that should be restored on exit.
             :param old_in: The original stdin state that should be restored on exit.
             :param unicode_aware: Whether this Screen can use unicode or not.
+            :param compact_buffer: Whether to use the compact (array-based) double-buffer.
             """
             # Save off the screen details and set up the scrolling pad.
             info = stdout.GetConsoleScreenBufferInfo()['Window']
@@ -2017,7 +3440,7 @@ if sys.platform == "win32":
                 # According to MSDN, 65001 is the Windows UTF-8 code page.
                 unicode_aware = win32console.GetConsoleCP() == 65001
             super().__init__(
-                height, width, buffer_height, unicode_aware)
+                height, width, buffer_height, unicode_aware, compact_buffer)
 
             # Save off the console details.
             self._stdout = stdout
@@ -2036,6 +3459,9 @@ if sys.platform == "win32":
             # Set of keys currently pressed.
             self._keys = set()
 
+            # Event to wake up any wait for input.
+            self._wake_event = win32event.CreateEvent(None, 0, 0, None)
+
         def close(self, restore=True):
             """
             Close down this Screen and tidy up the environment as required.
@@ -2082,7 +3508,9 @@ if sys.platform == "win32":
                     # _any_ event that appears to have popped up from nowhere
                     # as long as the Alt key is present.
                     key_code = ord(event.Char)
-                    logger.debug("Processing key: %x", key_code)
+                    if tracing.ENABLED:
+                        tracing.trace("key", code=key_code, virtual=event.VirtualKeyCode,
+                                      down=event.KeyDown)
                     if (event.KeyDown or
                             (key_code > 0 and key_code not in self._keys and
                              event.VirtualKeyCode == win32con.VK_MENU)):
@@ -2121,8 +3549,9 @@ if sys.platform == "win32":
 
                 elif event.EventType == win32console.MOUSE_EVENT:
                     # Translate into a MouseEvent object.
-                    logger.debug("Processing mouse: %d, %d",
-                                 event.MousePosition.X, event.MousePosition.Y)
+                    if tracing.ENABLED:
+                        tracing.trace("mouse", x=event.MousePosition.X, y=event.MousePosition.Y,
+                                      state=event.ButtonState)
                     button = 0
                     if event.EventFlags == 0:
                         # Button pressed - translate it.
@@ -2182,7 +3611,8 @@ if sys.platform == "win32":
             :param text: The text string to print.
             :param x: The x coordinate
             :param y: The Y coordinate
-            :param width: The width of the character (for dual-width glyphs in CJK languages).
+            :param width: The total width of the text (allowing for dual-width glyphs in CJK
+                languages).
             """
             # We can throw temporary errors on resizing, so catch and ignore
             # them on the assumption that we'll resize shortly.
@@ -2204,12 +3634,17 @@ if sys.platform == "win32":
             """
             Wait until there is some input or the timeout is hit.
 
-            :param timeout: Time to wait for input in seconds (floating point).
+            :param timeout: Time to wait for input in seconds (floating point), or None to wait
+                until there is some input.
             """
-            rc = win32event.WaitForSingleObject(self._stdin, int(timeout * 1000))
-            if rc not in [0, 258]:
+            timeout = win32event.INFINITE if timeout is None else int(timeout * 1000)
+            rc = win32event.WaitForMultipleObjects([self._stdin, self._wake_event], 0, timeout)
+            if rc not in [0, 1, 258]:
                 raise RuntimeError(rc)
 
+        def _wake(self):
+            win32event.SetEvent(self._wake_event)
+
         def _scroll(self, lines):
             """
             Scroll the window up or down.
@@ -2309,12 +3744,13 @@ else:
         }
 
         def __init__(self, win, height=None, catch_interrupt=False,
-                     unicode_aware=False):
+                     unicode_aware=False, compact_buffer=False):
             """
             :param win: The window object as returned by the curses wrapper method.
             :param height: The height of the screen buffer to be used (for teesting only).
             :param catch_interrupt: Whether to catch SIGINT or not.
             :param unicode_aware: Whether this Screen can use unicode or not.
+            :param compact_buffer: Whether to use the compact (array-based) double-buffer.
             """
             # Determine unicode support if needed.
             if unicode_aware is None:
@@ -2327,7 +3763,7 @@ else:
 
             # Save off the screen details.
             super().__init__(
-                win.getmaxyx()[0], win.getmaxyx()[1], height, unicode_aware)
+                win.getmaxyx()[0], win.getmaxyx()[1], height, unicode_aware, compact_buffer)
             self._screen = win
             self._screen.keypad(1)
 
@@ -2340,6 +3776,11 @@ else:
             # Non-blocking key checks.
             self._screen.nodelay(1)
 
+            # Signal handlers write to this pipe to wake up any wait for input.
+            self._wake_up = os.pipe()
+            for fd in self._wake_up:
+                os.set_blocking(fd, False)
+
             # Store previous handlers for restoration at close
             self._signal_state = _SignalState()
 
@@ -2399,10 +3840,61 @@ else:
                 Screen.A_UNDERLINE: self._a_underline
             }
 
+            # Precompile the escape sequences needed to refresh the screen so that we don't need
+            # to call tparm for every change of colour or cursor position.
+            self._cursor_table = _EscapeTable(self._move_y_x)
+            self._fg_table = _EscapeTable(self._fg_color)
+            self._bg_table = _EscapeTable(self._bg_color)
+            if self._fg_color and self._bg_color:
+                for i in range(min(self.colours, 256)):
+                    _ = self._fg_table[i], self._bg_table[i]
+            self._sgr_table = _EscapeTable(self._build_sgr)
+
+            # Optional capabilities for relative cursor movement.  Note that we don't use cud1 as
+            # this is typically a line feed, which the tty may also translate into a carriage
+            # return.
+            self._cursor_motion = {}
+            for name in ("cuf", "cub", "cud", "cuu", "hpa", "vpa"):
+                capability = curses.tigetstr(name)
+                if capability:
+                    self._cursor_motion[name] = _EscapeTable(capability)
+            for name in ("cuf1", "cub1", "cuu1", "cr"):
+                capability = curses.tigetstr(name)
+                if capability:
+                    self._cursor_motion[name] = capability.decode("utf-8")
+
+            # Scroll regions allow us to move blocks of lines rather than redrawing them.
+            self._change_region = curses.tigetstr("csr")
+            if self._change_region:
+                self._change_region = _EscapeTable(self._change_region)
+                self._hardware_scroll = True
+            self._scroll_lines = {}
+            for name in ("indn", "rin"):
+                capability = curses.tigetstr(name)
+                if capability:
+                    self._scroll_lines[name] = _EscapeTable(capability)
+
+            # Optional capabilities to compress runs of the same glyph.  Erasing only gives the
+            # same result as printing spaces if the terminal uses the current background colour.
+            self._repeat_char = self._erase_chars = None
+            if curses.tigetstr("rep"):
+                self._repeat_char = _EscapeTable(curses.tigetstr("rep"))
+            if curses.tigetstr("ech") and curses.tigetflag("bce") == 1:
+                self._erase_chars = _EscapeTable(curses.tigetstr("ech"))
+
             # Byte stream processing for unicode input.
             self._bytes_to_read = 0
             self._bytes_to_return = b""
 
+            # Output for the current frame is assembled here and then written to the terminal in
+            # one go.  Fall back to the text layer if stdout has no real file descriptor.
+            self._output = []
+            self._encoding = sys.stdout.encoding or "utf-8"
+            try:
+                self._fd = sys.stdout.fileno()
+            except (AttributeError, OSError):
+                self._fd = None
+
             # We'll actually break out into low-level output, so flush any
             # high level buffers now.
             self._screen.refresh()
@@ -2413,7 +3905,12 @@ else:
 
             :param restore: whether to restore the environment or not.
             """
+            self._flush()
+            self.threaded_output = False
             self._signal_state.restore()
+            for fd in self._wake_up:
+                os.close(fd)
+            self._wake_up = None
             if restore:
                 self._screen.keypad(0)
                 curses.echo()
@@ -2427,20 +3924,77 @@ else:
                 except curses.error:
                     pass
 
-        @staticmethod
-        def _safe_write(msg):
+        def _safe_write(self, msg):
             """
-            Safe write to screen - catches IOErrors on screen resize.
+            Add output for the screen.  This is buffered until the next call to :py:meth:`._flush`.
 
             :param msg: The message to write to the screen.
             """
+            self._output.append(msg)
+
+        def _flush(self):
+            """
+            Safe write of all buffered output to screen - catches IOErrors on screen resize.
+
+            The output is encoded once and passed to the terminal with as few system calls as
+            possible, handling partial writes along the way.
+            """
+            if not self._output:
+                return
+            text = "".join(self._output)
+            self._output.clear()
+            if self._writer is None:
+                self._write(text)
+            else:
+                self._writer.send(text)
+
+        def _write(self, text):
+            """
+            Write text to the terminal.
+
+            With threaded output, the bytes are counted in whichever frame is being profiled when
+            the text is actually written.
+
+            :param text: The text to write.
+            """
             try:
-                sys.stdout.write(msg)
+                # Anything written through the text layer must go first to preserve ordering.
+                sys.stdout.flush()
+                if self._fd is None:
+                    if self._profiler is not None:
+                        self._profiler.add_bytes(len(text.encode(self._encoding, "replace")))
+                    sys.stdout.write(text)
+                    sys.stdout.flush()
+                    return
+                data = text.encode(self._encoding, "replace")
+                if self._profiler is not None:
+                    self._profiler.add_bytes(len(data))
+                offset = 0
+                with memoryview(data) as view:
+                    while offset < len(data):
+                        try:
+                            offset += os.write(self._fd, view[offset:])
+                        except BlockingIOError:
+                            # Someone has made stdout non-blocking - wait until we can write more.
+                            select.select([], [self._fd], [])
             except OSError:
                 # Screen resize can throw IOErrors.  These can be safely
                 # ignored as the screen will be shortly reset anyway.
                 pass
 
+        def _create_writer(self):
+            return _OutputWriter(self._write)
+
+        def cache_stats(self):
+            stats = super().cache_stats()
+            tables = [self._cursor_table, self._fg_table, self._bg_table, self._sgr_table,
+                      self._repeat_char, self._erase_chars, self._change_region]
+            tables += list(self._cursor_motion.values()) + list(self._scroll_lines.values())
+            stats["escapes"] = {
+                "size": sum(len(t) for t in tables if isinstance(t, _EscapeTable)),
+            }
+            return stats
+
         def _resize_handler(self, *_):
             """
             Window resize signal handler.  We don't care about any of the
@@ -2449,6 +4003,7 @@ else:
             curses.endwin()
             curses.initscr()
             self._re_sized = True
+            self._wake()
 
         def _continue_handler(self, *_):
             """
@@ -2457,6 +4012,26 @@ else:
             """
             self.force_update(full_refresh=True)
 
+        def _input_fds(self):
+            return [sys.stdin.fileno(), self._wake_up[0]]
+
+        def _wake(self):
+            if self._wake_up is None:
+                return
+            try:
+                os.write(self._wake_up[1], b"\0")
+            except OSError:
+                # Pipe is full (so a wake up is already pending) or closed.
+                pass
+
+        def _drain_wake(self):
+            try:
+                while os.read(self._wake_up[0], 1024):
+                    pass
+            except OSError:
+                # Nothing left to read.
+                pass
+
         def _scroll(self, lines):
             """
             Scroll the window up or down.
@@ -2465,29 +4040,59 @@ else:
                 down.
             """
             if lines < 0:
-                start = curses.tparm(self._move_y_x, 0, 0).decode("utf-8")
+                start = self._cursor_table[0, 0]
                 scroll = (self._up_line + self._clear_line) * -lines
             else:
-                start = curses.tparm(self._move_y_x, self.height, 0).decode("utf-8")
+                start = self._cursor_table[self.height, 0]
                 scroll = (self._down_line + self._clear_line) * lines
             self._safe_write(f"{start}{scroll}")
+            self._cur_x = self._cur_y = None
+
+        def _scroll_region(self, top, bottom, lines):
+            """
+            Scroll part of the window up or down.
+
+            :param top: The first line of the region to scroll.
+            :param bottom: The last line of the region to scroll (inclusive).
+            :param lines: Number of lines to scroll.  Negative numbers scroll down.
+            :returns: Whether the region was scrolled.
+            """
+            # Exposed lines are filled with the current background, so make sure that is black.
+            # Setting the region can also move the cursor, so use absolute moves in the region.
+            self._change_colours(Screen.COLOUR_WHITE, 0, Screen.COLOUR_BLACK)
+            if lines > 0:
+                start = self._cursor_table[bottom, 0]
+                single, multiple = self._down_line, "indn"
+            else:
+                start = self._cursor_table[top, 0]
+                single, multiple = self._up_line, "rin"
+            count = abs(lines)
+            scroll = single * count
+            if count > 1 and multiple in self._scroll_lines:
+                scroll = min(scroll, self._scroll_lines[multiple][count], key=len)
+            self._safe_write(
+                f"{self._change_region[top, bottom]}{start}{scroll}{self._change_region[0, self.height - 1]}")
+            self._cur_x = self._cur_y = None
+            return True
 
         def _clear(self):
             """
             Clear the Screen of all content.
             """
             self._safe_write(self._clear_screen)
-            sys.stdout.flush()
+            self._flush()
 
         def refresh(self):
             """
             Refresh the screen.
             """
             super().refresh()
-            try:
-                sys.stdout.flush()
-            except OSError:
-                pass
+            if self._profiler is None:
+                self._flush()
+            else:
+                start = self._profiler.clock()
+                self._flush()
+                self._profiler.add_phase("write", self._profiler.clock() - start)
 
         @staticmethod
         def _catch_interrupt(signal_no, frame):
@@ -2534,14 +4139,13 @@ else:
                     return MouseEvent(x, y, buttons)
                 elif key != -1:
                     # Handle any byte streams first
-                    logger.debug("Processing key: %x", key)
+                    if tracing.ENABLED:
+                        tracing.trace("key", code=key)
                     if self._unicode_aware and key > 0:
                         # Start of unicode byte stream
                         if key & 0xC0 == 0xC0:
                             self._bytes_to_return = struct.pack(b"B", key)
                             self._bytes_to_read = bin(key)[2:].index("0") - 1
-                            logger.debug("Byte stream: %d bytes left",
-                                         self._bytes_to_read)
                             continue
 
                         # Process unicode bytestream if still expecting data.
@@ -2555,7 +4159,8 @@ else:
                             key = ord(self._bytes_to_return.decode("utf-8"))
 
                     # Handle a genuine key press.
-                    logger.debug("Returning key: %x", key)
+                    if tracing.ENABLED:
+                        tracing.trace("key_decoded", code=key)
 
                     if self._bytes_to_return:
                         # UTF-8 character - resetting _bytes_to_return
@@ -2576,6 +4181,33 @@ else:
             self._re_sized = False
             return re_sized
 
+        def _build_sgr(self, colour, attr, bg):
+            """
+            Build the combined escape sequence to reset the terminal to a new set of colours and
+            attributes.
+
+            :param colour: New colour to use.
+            :param attr: New attributes to use.
+            :param bg: New background colour to use.
+            :returns: The escape sequence as a string.
+            """
+            sequence = self._a_normal
+            if attr != 0:
+                sequence += self._ATTRIBUTES[attr]
+
+            # Check for default colours - which reset both fg and bg.
+            if Screen.COLOUR_DEFAULT in (colour, bg):
+                if self._default_colours:
+                    sequence += self._default_colours
+                else:
+                    colour = Screen.COLOUR_WHITE if colour == Screen.COLOUR_DEFAULT else colour
+                    bg = Screen.COLOUR_BLACK if bg == Screen.COLOUR_DEFAULT else bg
+            if colour != Screen.COLOUR_DEFAULT:
+                sequence += self._fg_table[colour]
+            if bg != Screen.COLOUR_DEFAULT:
+                sequence += self._bg_table[bg]
+            return sequence
+
         def _change_colours(self, colour, attr, bg):
             """
             Change current colour if required.
@@ -2585,14 +4217,15 @@ else:
             :param bg: New background colour to use.
             """
             # Change attribute first as this will reset colours when swapping
-            # modes.
+            # modes.  In this case, use a single precompiled sequence to set everything.
             if attr != self._attr:
-                self._safe_write(self._a_normal)
-                if attr != 0:
-                    self._safe_write(self._ATTRIBUTES[attr])
+                self._safe_write(self._sgr_table[colour, attr, bg])
                 self._attr = attr
-                self._colour = None
-                self._bg = None
+                self._colour = colour
+                self._bg = bg
+                return
+            if colour == self._colour and bg == self._bg:
+                return
 
             # next check for default colours - which reset both fg and bg.
             if Screen.COLOUR_DEFAULT in (colour, bg):
@@ -2606,14 +4239,97 @@ else:
 
             # Now swap colours if required.
             if colour != self._colour:
-                self._safe_write(curses.tparm(
-                    self._fg_color, colour).decode("utf-8"))
+                self._safe_write(self._fg_table[colour])
                 self._colour = colour
             if bg != self._bg:
-                self._safe_write(curses.tparm(
-                    self._bg_color, bg).decode("utf-8"))
+                self._safe_write(self._bg_table[bg])
                 self._bg = bg
 
+        def _relative_move(self, distance, single, multiple):
+            """
+            Find the cheapest relative cursor move in one direction.
+
+            :param distance: The number of cells to move.
+            :param single: The name of the capability to move a single cell.
+            :param multiple: The name of the parameterised capability to move many cells.
+            :returns: The escape sequence to use, or None if no such move is possible.
+            """
+            options = []
+            if single in self._cursor_motion:
+                options.append(self._cursor_motion[single] * distance)
+            if multiple in self._cursor_motion:
+                options.append(self._cursor_motion[multiple][distance])
+            return min(options, key=len) if options else None
+
+        def _cursor_move(self, from_x, from_y, to_x, to_y):
+            """
+            Find the cheapest escape sequence to move the cursor between two locations.
+
+            This considers absolute moves, relative moves and carriage returns - using whatever
+            the terminal supports.
+
+            :param from_x: The x coordinate of the current location (or None if unknown).
+            :param from_y: The y coordinate of the current location (or None if unknown).
+            :param to_x: The x coordinate of the new location.
+            :param to_y: The y coordinate of the new location.
+            :returns: The escape sequence to move the cursor.
+            """
+            best = self._cursor_table[to_y, to_x]
+
+            # Relative moves are only safe if we know where the cursor is and it isn't waiting to
+            # wrap at the end of a line.
+            if from_x is None or from_y is None or from_x >= self.width:
+                return best
+
+            # Work out the cheapest vertical move.
+            vertical = [""] if to_y == from_y else []
+            if to_y > from_y:
+                vertical.append(self._relative_move(to_y - from_y, None, "cud"))
+            elif to_y < from_y:
+                vertical.append(self._relative_move(from_y - to_y, "cuu1", "cuu"))
+            if to_y != from_y and "vpa" in self._cursor_motion:
+                vertical.append(self._cursor_motion["vpa"][to_y])
+            vertical = [v for v in vertical if v is not None]
+            if not vertical:
+                return best
+
+            # Work out the cheapest horizontal move.
+            horizontal = [""] if to_x == from_x else []
+            if to_x > from_x:
+                horizontal.append(self._relative_move(to_x - from_x, "cuf1", "cuf"))
+            elif to_x < from_x:
+                horizontal.append(self._relative_move(from_x - to_x, "cub1", "cub"))
+            if "cr" in self._cursor_motion and to_x != from_x:
+                if to_x == 0:
+                    horizontal.append(self._cursor_motion["cr"])
+                elif self._relative_move(to_x, "cuf1", "cuf") is not None:
+                    horizontal.append(self._cursor_motion["cr"] + self._relative_move(to_x, "cuf1", "cuf"))
+            if "hpa" in self._cursor_motion and to_x != from_x:
+                horizontal.append(self._cursor_motion["hpa"][to_x])
+            horizontal = [h for h in horizontal if h is not None]
+            if not horizontal:
+                return best
+
+            relative = min(vertical, key=len) + min(horizontal, key=len)
+            return relative if len(relative) < len(best) else best
+
+        def _cursor_move_cost(self, from_x, from_y, to_x, to_y):
+            return len(self._cursor_move(from_x, from_y, to_x, to_y))
+
+        def _colour_cost(self, old, new):
+            if old == new:
+                return 0
+            if old[1] != new[1]:
+                return len(self._sgr_table[new])
+            cost = 0
+            for i, table in ((0, self._fg_table), (2, self._bg_table)):
+                if old[i] != new[i]:
+                    if new[i] == Screen.COLOUR_DEFAULT:
+                        cost += len(self._default_colours or table[Screen.COLOUR_WHITE if i == 0 else 0])
+                    else:
+                        cost += len(table[new[i]])
+            return cost
+
         def _print_at(self, text, x, y, width):
             """
             Print string at the required location.
@@ -2621,34 +4337,76 @@ else:
             :param text: The text string to print.
             :param x: The x coordinate
             :param y: The Y coordinate
-            :param width: The width of the character (for dual-width glyphs in CJK languages).
+            :param width: The total width of the text (allowing for dual-width glyphs in CJK
+                languages).
             """
             # Move the cursor if necessary
             cursor = ""
             if x != self._cur_x or y != self._cur_y:
-                cursor = curses.tparm(self._move_y_x, y, x).decode("utf-8")
+                cursor = self._cursor_move(self._cur_x, self._cur_y, x, y)
 
             # Print the text at the required location and update the current
-            # position.
-            try:
-                self._safe_write(cursor + text)
-            except UnicodeEncodeError:
-                # This is probably a sign that the user has the wrong locale.
-                # Try to soldier on anyway.
-                self._safe_write(cursor + "?" * len(text))
+            # position.  Note that any glyphs that can't be encoded (which is probably a sign
+            # that the user has the wrong locale) are replaced when the output is flushed.
+            self._safe_write(cursor + text)
 
             # Update cursor position for next time...
             self._cur_x = x + width
             self._cur_y = y
 
+        def _print_run(self, run, x, y, width, colours):
+            """
+            Print a run of glyphs that share the same colours.
+
+            :param run: The list of glyphs to print.
+            :param x: The x coordinate of the start of the run.
+            :param y: The y coordinate of the run.
+            :param width: The total width of the run.
+            :param colours: The (foreground, attributes, background) tuple for the run.
+            """
+            self._change_colours(*colours)
+
+            # Erase any trailing spaces if that is shorter - unless the attributes would make
+            # erased cells look different.  Note that this doesn't move the cursor.
+            erased = 0
+            if self._erase_chars is not None and colours[1] in (0, Screen.A_NORMAL, Screen.A_BOLD):
+                while erased < len(run) and run[-1 - erased] == " ":
+                    erased += 1
+                if erased > 0 and len(self._erase_chars[erased]) < erased:
+                    run = run[:-erased]
+                else:
+                    erased = 0
+
+            # Repeat any other long runs of the same (ASCII) glyph if possible.
+            text = "".join(run)
+            if self._repeat_char is not None:
+                text = _REPEATED_GLYPHS.sub(self._repeat_glyph, text)
+            self._print_at(text, x, y, width - erased)
+            if erased > 0:
+                self._safe_write(self._erase_chars[erased])
+
+        def _repeat_glyph(self, match):
+            """
+            Replace a run of the same glyph with a repeat sequence if that is shorter.
+
+            :param match: The regular expression match for the run.
+            :returns: The text to output for the run.
+            """
+            run = match.group(0)
+            sequence = self._repeat_char[ord(run[0]), len(run)]
+            return sequence if len(sequence) < len(run) else run
+
         def wait_for_input(self, timeout):
             """
             Wait until there is some input or the timeout is hit.
 
-            :param timeout: Time to wait for input in seconds (floating point).
+            :param timeout: Time to wait for input in seconds (floating point), or None to wait
+                until there is some input.  This also returns early if the Screen is resized.
             """
             try:
-                select.select([sys.stdin], [], [], timeout)
+                ready, _, _ = select.select([sys.stdin, self._wake_up[0]], [], [], timeout)
+                if self._wake_up[0] in ready:
+                    self._drain_wake()
             except OSError:
                 # Any error will almost certainly result in a a Screen.  Ignore.
                 pass
@@ -2663,6 +4421,111 @@ else:
             if self._start_line is not None:
                 self._safe_write(f"{self._start_title}{title}{self._end_title}")
 
+    # Runs of the same printable ASCII glyph that are long enough to be worth repeating.
+    _REPEATED_GLYPHS = re.compile(r"([ -~])\1{5,}")
+
+    class _EscapeTable(dict):
+        """
+        Lazily populated table of escape sequences.
+
+        Entries are created on first use by expanding a parameterised terminfo capability (or
+        calling a builder function) for the key.  Tuple keys are passed as multiple parameters.
+        """
+
+        def __init__(self, capability):
+            """
+            :param capability: The terminfo capability string (as returned by tigetstr) or a
+                function to build the escape sequence.
+            """
+            super().__init__()
+            self._capability = capability
+
+        def __missing__(self, key):
+            params = key if isinstance(key, tuple) else (key,)
+            if callable(self._capability):
+                value = self._capability(*params)
+            else:
+                value = curses.tparm(self._capability, *params).decode("utf-8")
+            self[key] = value
+            return value
+
+    class _OutputWriter():
+        """
+        Thread to write output to the terminal in the background.
+
+        The queue only holds one batch of output at a time, so a slow terminal applies back
+        pressure to the Screen rather than building up a backlog.
+        """
+
+        def __init__(self, write):
+            """
+            :param write: The function to write the output.
+            """
+            self._write = write
+            self._queue = Queue(maxsize=1)
+            self._lock = threading.Lock()
+            self._pending = 0
+            self._error = None
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+        def _run(self):
+            while True:
+                text = self._queue.get()
+                if text is None:
+                    self._queue.task_done()
+                    return
+                try:
+                    self._write(text)
+                except Exception as e:  # pylint: disable=broad-except
+                    # Keep the thread alive (so nothing blocks on the queue) and report it later.
+                    self._error = e
+                finally:
+                    with self._lock:
+                        self._pending -= 1
+                    self._queue.task_done()
+
+        def _check_error(self):
+            """
+            Re-raise any exception from writing the output.
+            """
+            error, self._error = self._error, None
+            if error is not None:
+                raise error
+
+        def ready(self):
+            """
+            Check whether all output has been written.
+            """
+            with self._lock:
+                return self._pending == 0
+
+        def wait(self):
+            """
+            Wait until all output has been written.
+            """
+            self._queue.join()
+            self._check_error()
+
+        def send(self, text):
+            """
+            Queue text to be written - blocking if the writer is still busy with the last batch.
+
+            :param text: The text to write.
+            """
+            self._check_error()
+            with self._lock:
+                self._pending += 1
+            self._queue.put(text)
+
+        def close(self):
+            """
+            Write any remaining output and stop the thread.
+            """
+            self._queue.put(None)
+            self._thread.join()
+            self._check_error()
+
     class _SignalState():
         """
         Save previous user signal state while setting signals.
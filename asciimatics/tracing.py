@@ -0,0 +1,82 @@
+"""
+This module provides a low overhead trace of what is happening inside asciimatics - e.g. to help
+diagnose problems in a running application.
+
+Unlike logging, the trace points in the library all check :py:data:`ENABLED` before doing any other
+work, so they cost next to nothing when tracing is disabled.  When enabled, each event is recorded
+as a (time, event, data) tuple in a fixed size ring buffer, which you can read or dump at any time.
+
+For example::
+
+    from asciimatics import tracing
+
+    tracing.enable()
+    ...
+    tracing.dump(sys.stderr)
+"""
+import time
+from collections import deque
+
+#: Whether tracing is enabled.  Trace points must check this before calling :py:func:`trace`.
+ENABLED = False
+
+_events = deque(maxlen=1000)
+
+
+def enable(size=1000):
+    """
+    Enable tracing.
+
+    :param size: The maximum number of events to keep.  Any existing events are kept if they fit.
+    """
+    # The flag has to be a plain module attribute, so that checking it in the trace points is a
+    # single lookup.
+    # pylint: disable-next=global-statement
+    global ENABLED, _events
+    if size != _events.maxlen:
+        _events = deque(_events, maxlen=size)
+    ENABLED = True
+
+
+def disable():
+    """
+    Disable tracing.  Any recorded events are kept until you call :py:func:`clear`.
+    """
+    # pylint: disable-next=global-statement
+    global ENABLED
+    ENABLED = False
+
+
+def trace(event, **data):
+    """
+    Record an event in the trace.
+
+    :param event: The name of the event.
+    :param data: Any data to record with the event.
+    """
+    _events.append((time.monotonic(), event, data))
+
+
+def events():
+    """
+    :returns: The list of recorded (time, event, data) tuples - oldest first.
+    """
+    return list(_events)
+
+
+def clear():
+    """
+    Discard all recorded events.
+    """
+    _events.clear()
+
+
+def dump(stream):
+    """
+    Write the recorded events to a stream - one line per event.
+
+    :param stream: The (text) stream to write to.
+    """
+    for timestamp, event, data in list(_events):
+        details = " ".join(f"{key}={value!r}" for key, value in data.items())
+        stream.write(f"{timestamp:.6f} {event} {details}\n")
@@ -214,6 +214,9 @@ class Frame(Effect):
         effect.register_scene(self._scene)
         self._effects.append(effect)
 
+    def memory_usage(self):
+        return self._canvas.memory_usage() + sum(effect.memory_usage() for effect in self._effects)
+
     def fix(self):
         """
         Fix the layouts and calculate the locations of all the widgets.
@@ -384,6 +387,17 @@ class Frame(Effect):
         # default on space and enter is to go to the next Scene.
         return False
 
+    @property
+    def priority(self):
+        """
+        The priority for drawing this Frame.  This is boosted while the Frame has the input focus.
+        """
+        return self._priority + 1 if self._has_focus else self._priority
+
+    @priority.setter
+    def priority(self, value):
+        self._priority = value
+
     @property
     def canvas(self):
         """
@@ -261,6 +261,24 @@ def _split_text(text, width, height, unicode_aware=True):
     return result
 
 
+def _split_text_stats():
+    """
+    Get the statistics for the cache used by :py:func:`_split_text` - see
+    :py:meth:`.Screen.cache_stats`.
+    """
+    # Pylint doesn't understand the wrapper added by lru_cache.
+    info = _split_text.cache_info()  # pylint: disable=no-value-for-parameter
+    return {
+        "size": info.currsize,
+        "max_size": info.maxsize,
+        "hits": info.hits,
+        "misses": info.misses,
+    }
+
+
+Screen.register_cache("split_text", _split_text_stats)
+
+
 def _euclidian_distance(widget1, widget2):
     """
     Find the Euclidian distance between 2 widgets.
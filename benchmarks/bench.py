@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the asciimatics rendering core.
+
+Each benchmark runs a fixed workload against a HeadlessScreen and reports the number of operations
+(i.e. workload updates plus a refresh) per second and the bytes of output per operation.  The
+output is deterministic, so any increase in bytes against the stored baseline is a regression.
+Speeds depend on the machine, so they are only checked against your own baseline - save one with
+`--speeds FILE --update` before making any changes.
+
+Usage (from the root of the repository):
+    python -m benchmarks.bench                      # Run and compare against baseline.json
+    python -m benchmarks.bench --update             # Save the output figures as the new baseline
+    python -m benchmarks.bench --speeds my.json     # Also compare speeds against my.json
+"""
+import os
+import sys
+import time
+from random import Random
+
+from asciimatics.screen import HeadlessScreen, Screen, _ArrayDoubleBuffer, _DoubleBuffer
+from benchmarks.harness import main
+
+_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+_HEIGHT = 40
+_WIDTH = 120
+_SEED = 42
+
+
+def full_text(screen, rand, i):
+    """
+    Rewrite every line of the screen with new text.
+    """
+    del rand
+    line = "".join(chr(ord("A") + (i + x) % 26) for x in range(screen.width))
+    for y in range(screen.height):
+        screen.print_at(line, 0, y, colour=(i + y) % 8)
+    screen.refresh()
+
+
+def sparse(screen, rand, i):
+    """
+    Update a few random cells on an otherwise static screen.
+    """
+    for _ in range(20):
+        screen.print_at(chr(ord("a") + i % 26),
+                        rand.randint(0, screen.width - 1),
+                        rand.randint(0, screen.height - 1),
+                        colour=rand.randint(0, 7))
+    screen.refresh()
+
+
+def cjk(screen, rand, i):
+    """
+    Rewrite every line of the screen with double-width text.
+    """
+    del rand
+    glyphs = "你好世界中文字符测试"
+    line = "".join(glyphs[(i + x) % len(glyphs)] for x in range(screen.width // 2))
+    for y in range(screen.height):
+        screen.print_at(line, y % 2, y)
+    screen.refresh()
+
+
+def polygons(screen, rand, i):
+    """
+    Fill a set of random polygons.
+    """
+    del i
+    screen.clear_buffer(Screen.COLOUR_WHITE, 0, Screen.COLOUR_BLACK)
+    for _ in range(5):
+        points = [(rand.uniform(0, screen.width), rand.uniform(0, screen.height)) for _ in range(6)]
+        screen.fill_polygon([points], colour=rand.randint(1, 7))
+    screen.refresh()
+
+
+def highlights(screen, rand, i):
+    """
+    Blend random areas of a coloured screen.
+    """
+    del i
+    x = rand.randint(0, screen.width // 2)
+    y = rand.randint(0, screen.height // 2)
+    screen.clear_buffer(Screen.COLOUR_YELLOW, 0, Screen.COLOUR_BLUE)
+    screen.highlight(x, y, screen.width // 2, screen.height // 2,
+                     fg=Screen.COLOUR_RED, bg=Screen.COLOUR_GREEN, blend=50)
+    screen.refresh()
+
+
+def paint(screen, rand, i):
+    """
+    Paint text with a colour map on every line.
+    """
+    del rand
+    text = "Painted text " * (screen.width // 13)
+    colour_map = [((i + x) % 8, 0, 0) for x in range(len(text))]
+    for y in range(screen.height):
+        screen.paint(text, 0, y, colour_map=colour_map)
+    screen.refresh()
+
+
+def lines(screen, rand, i):
+    """
+    Draw random lines.
+    """
+    del i
+    screen.clear_buffer(Screen.COLOUR_WHITE, 0, Screen.COLOUR_BLACK)
+    for _ in range(10):
+        screen.move(rand.randint(0, screen.width - 1), rand.randint(0, screen.height - 1))
+        screen.draw(rand.randint(0, screen.width - 1), rand.randint(0, screen.height - 1),
+                    colour=rand.randint(1, 7))
+    screen.refresh()
+
+
+class _BufferWorkload():
+    """
+    Exercise a double-buffer directly, without any output.
+    """
+
+    def __init__(self, buffer_class):
+        """
+        :param buffer_class: The class of double-buffer to use.
+        """
+        self.buffer = buffer_class(_HEIGHT, _WIDTH)
+
+    def __call__(self, screen, rand, i):
+        del screen
+        for _ in range(50):
+            self.buffer.set(rand.randint(0, _WIDTH - 1), rand.randint(0, _HEIGHT - 1),
+                            (chr(ord("a") + i % 26), 7, 0, 0, 1))
+        for _ in self.buffer.deltas(0, _HEIGHT):
+            pass
+        self.buffer.sync()
+
+
+# All the benchmarks - as a tuple of (name, workload factory, whether unicode aware).
+BENCHMARKS = [
+    ("full_text", lambda: full_text, False),
+    ("sparse", lambda: sparse, False),
+    ("cjk", lambda: cjk, True),
+    ("polygons", lambda: polygons, False),
+    ("highlights", lambda: highlights, False),
+    ("paint", lambda: paint, False),
+    ("lines", lambda: lines, False),
+    ("buffer", lambda: _BufferWorkload(_DoubleBuffer), False),
+    ("array_buffer", lambda: _BufferWorkload(_ArrayDoubleBuffer), False),
+]
+
+
+def run(name, factory, unicode_aware, iterations, repeat):
+    """
+    Run a single benchmark.
+
+    :param name: The name of the benchmark.
+    :param factory: Function to create the workload.
+    :param unicode_aware: Whether the screen should be unicode aware.
+    :param iterations: The number of times to run the workload.
+    :param repeat: The number of times to repeat the timing.  The fastest run is used, as that is
+        the least affected by anything else running on the machine.
+    :returns: A dictionary of the results.
+    """
+    best = None
+    for _ in range(repeat):
+        screen = HeadlessScreen(_HEIGHT, _WIDTH, unicode_aware=unicode_aware)
+        workload = factory()
+        rand = Random(f"{_SEED}-{name}")
+
+        # Warm up any caches before timing.
+        for i in range(min(10, iterations)):
+            workload(screen, rand, i)
+        screen.reset_stats()
+
+        start = time.perf_counter()
+        for i in range(iterations):
+            workload(screen, rand, i)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        "ops_per_sec": round(iterations / best, 1),
+        "bytes_per_op": round(screen.bytes_written / iterations, 1),
+    }
+
+
+def _add_arguments(parser):
+    parser.add_argument("-n", "--iterations", type=int, default=50,
+                        help="number of iterations for each benchmark (the baseline uses the default)")
+    parser.add_argument("-r", "--repeat", type=int, default=3,
+                        help="number of times to repeat each benchmark")
+
+
+def _run_all(args):
+    results = {}
+    for name, factory, unicode_aware in BENCHMARKS:
+        if args.names and name not in args.names:
+            continue
+        results[name] = run(name, factory, unicode_aware, args.iterations, args.repeat)
+        print(f"{name:<12} {results[name]['ops_per_sec']:>10.1f} ops/sec "
+              f"{results[name]['bytes_per_op']:>10.1f} bytes/op")
+    return results
+
+
+if __name__ == "__main__":
+    sys.exit(main(__doc__.splitlines()[1], _BASELINE, _add_arguments, _run_all,
+                  ["bytes_per_op"], ("ops_per_sec", True)))
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+End-to-end frame rate benchmarks for asciimatics.
+
+Each benchmark plays a representative Scene - built from the real Effects, renderers and widgets -
+on a HeadlessScreen as fast as possible.  It reports the distribution of time taken to draw each
+frame, along with the cells and bytes of output per frame.  All randomness is seeded, so runs are
+reproducible.
+
+The cells and bytes per frame are compared against the stored baseline to spot regressions.  The
+95th percentile frame time must also fit in the frame budget - by default 50ms, i.e. the time
+between frames at the target of 20 frames per second - or the run fails.  As with the other
+benchmarks, speeds depend on the machine, so you can also check the frame times against your own
+baseline - save one with `--speeds FILE --update` before making any changes.
+
+Usage (from the root of the repository):
+    python -m benchmarks.fps                    # Run and compare against fps_baseline.json
+    python -m benchmarks.fps --budget 100       # Allow up to 100ms per frame instead
+    python -m benchmarks.fps --update           # Save the output figures as the new baseline
+    python -m benchmarks.fps --speeds my.json   # Also compare frame times against my.json
+"""
+import os
+import random
+import sys
+import time
+
+from asciimatics.effects import Julia, Matrix, Print, Stars
+from asciimatics.event import KeyboardEvent
+from asciimatics.particles import PalmFirework, RingFirework, SerpentFirework, StarFirework
+from asciimatics.renderers import Fire, Plasma
+from asciimatics.scene import Scene
+from asciimatics.screen import HeadlessScreen, Screen
+from asciimatics.widgets import (
+    Button, CheckBox, Divider, Frame, Layout, MultiColumnListBox, RadioButtons, Text, TextBox,
+    Widget)
+from benchmarks.harness import main
+
+_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fps_baseline.json")
+_HEIGHT = 40
+_WIDTH = 120
+_TARGET_FPS = 20
+
+
+def julia(screen):
+    return [Julia(screen)]
+
+
+def plasma(screen):
+    return [Print(screen, Plasma(screen.height, screen.width, screen.colours), 0, speed=1,
+                  transparent=False)]
+
+
+def fire(screen):
+    return [Print(screen,
+                  Fire(screen.height, screen.width, "*" * (screen.width - 10), 0.8, 60,
+                       screen.colours, bg=screen.colours >= 256),
+                  0, speed=1, transparent=False)]
+
+
+def matrix(screen):
+    return [Matrix(screen)]
+
+
+def fireworks(screen):
+    effects = [Stars(screen, screen.width)]
+    for _ in range(20):
+        firework, start, stop = random.choice([
+            (PalmFirework, 25, 30),
+            (StarFirework, 25, 35),
+            (RingFirework, 20, 30),
+            (SerpentFirework, 30, 35),
+        ])
+        effects.append(
+            firework(screen,
+                     random.randint(0, screen.width),
+                     random.randint(screen.height // 8, screen.height * 3 // 4),
+                     random.randint(start, stop),
+                     start_frame=random.randint(0, 50)))
+    return effects
+
+
+def form(screen):
+    frame = Frame(screen, screen.height * 2 // 3, screen.width * 2 // 3, title="Form")
+    layout = Layout([1, 18, 1])
+    frame.add_layout(layout)
+    layout.add_widget(Text("Name:", "name"), 1)
+    layout.add_widget(TextBox(5, "Address:", "address", as_string=True), 1)
+    layout.add_widget(RadioButtons([("Yes", 1), ("No", 2)], "Happy:", "happy"), 1)
+    layout.add_widget(CheckBox("Field 1", "Options:", "opt1"), 1)
+    layout.add_widget(CheckBox("Field 2", "", "opt2"), 1)
+    layout.add_widget(Divider(height=3), 1)
+    layout2 = Layout([1, 1, 1])
+    frame.add_layout(layout2)
+    layout2.add_widget(Button("OK", None), 1)
+    frame.fix()
+    return [frame]
+
+
+def list_box(screen):
+    frame = Frame(screen, screen.height, screen.width, has_border=False)
+    layout = Layout([1], fill_frame=True)
+    frame.add_layout(layout)
+    options = [([str(i), f"user{i % 97}", f"{i * 7 % 1000}", f"/usr/bin/process --id {i}"], i)
+               for i in range(10000)]
+    layout.add_widget(MultiColumnListBox(Widget.FILL_FRAME, [">6", 10, ">6", "100%"], options,
+                                         titles=["PID", "USER", "MEM", "COMMAND"]))
+    frame.fix()
+    return [frame]
+
+
+def typing(i):
+    """
+    Type some text, then delete it again.
+    """
+    return KeyboardEvent(ord("a") + i % 26 if i % 40 < 20 else Screen.KEY_BACK)
+
+
+def scrolling(i):
+    """
+    Page down through the list, then back up again.
+    """
+    if i % 200 < 100:
+        return KeyboardEvent(Screen.KEY_DOWN if i % 10 else Screen.KEY_PAGE_DOWN)
+    return KeyboardEvent(Screen.KEY_UP if i % 10 else Screen.KEY_PAGE_UP)
+
+
+# All the benchmarks - as a tuple of (name, function to create the Effects, optional function to
+# create the input for each frame).
+BENCHMARKS = [
+    ("julia", julia, None),
+    ("plasma", plasma, None),
+    ("fire", fire, None),
+    ("matrix", matrix, None),
+    ("fireworks", fireworks, None),
+    ("form", form, typing),
+    ("list_box", list_box, scrolling),
+]
+
+
+def percentile(values, fraction):
+    """
+    Find a percentile (using the nearest rank) of a list of values.
+
+    :param values: The sorted list of values.
+    :param fraction: The percentile as a fraction (e.g. 0.95).
+    """
+    return values[min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))]
+
+
+def run(name, effects, events, frames, seed):
+    """
+    Play a single benchmark.
+
+    :param name: The name of the benchmark.
+    :param effects: Function to create the Effects for the Scene.
+    :param events: Optional function to create the input for each frame.
+    :param frames: The number of frames to play.
+    :param seed: The seed for the random number generator.
+    :returns: A dictionary of the results.
+    """
+    random.seed(f"{seed}-{name}")
+    screen = HeadlessScreen(_HEIGHT, _WIDTH)
+    screen.set_scenes([Scene(effects(screen), -1)])
+    screen.reset_stats()
+
+    times = []
+    for i in range(frames):
+        if events:
+            screen.inject_event(events(i))
+        start = time.perf_counter()
+        screen.draw_next_frame()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    mean = sum(times) / frames
+    return {
+        "p50_ms": round(percentile(times, 0.5) * 1000, 3),
+        "p95_ms": round(percentile(times, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(times, 0.99) * 1000, 3),
+        "cells_per_frame": round(screen.cells_written / frames, 1),
+        "bytes_per_frame": round(screen.bytes_written / frames, 1),
+        "sessions": int(1 / (mean * _TARGET_FPS)),
+    }
+
+
+def _add_arguments(parser):
+    parser.add_argument("-n", "--frames", type=int, default=200,
+                        help="number of frames to play for each benchmark (the baseline uses the default)")
+    parser.add_argument("-s", "--seed", type=int, default=42,
+                        help="seed for the random number generator")
+    parser.add_argument("-B", "--budget", type=float, default=1000 / _TARGET_FPS,
+                        help="maximum 95th percentile frame time in ms (0 for no limit)")
+
+
+def _check_budget(args, results):
+    if args.budget <= 0:
+        return []
+    return [f"{name}: {result['p95_ms']} p95_ms (budget {args.budget})"
+            for name, result in results.items() if result["p95_ms"] > args.budget]
+
+
+def _run_all(args):
+    print(f"{'':<12} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'cells':>8} {'bytes':>8} "
+          f"{'sessions@' + str(_TARGET_FPS) + 'fps':>16}")
+    results = {}
+    for name, effects, events in BENCHMARKS:
+        if args.names and name not in args.names:
+            continue
+        result = results[name] = run(name, effects, events, args.frames, args.seed)
+        print(f"{name:<12} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+              f"{result['p99_ms']:>8.2f} {result['cells_per_frame']:>8.0f} "
+              f"{result['bytes_per_frame']:>8.0f} {result['sessions']:>16}")
+    return results
+
+
+if __name__ == "__main__":
+    sys.exit(main(__doc__.splitlines()[1], _BASELINE, _add_arguments, _run_all,
+                  ["cells_per_frame", "bytes_per_frame"], ("p95_ms", False), _check_budget))
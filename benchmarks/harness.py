@@ -0,0 +1,119 @@
+"""
+Shared command line handling for the asciimatics benchmarks.
+
+The committed baselines only hold the figures that are deterministic for a given workload (e.g. the
+bytes of output), so they can be checked on any machine.  Speeds depend on the machine, so they are
+only compared against a file of your own, saved with `--speeds FILE --update` before making any
+changes.
+"""
+import argparse
+import json
+import os
+
+
+def compare(results, baseline, metrics, tolerance=0.0):
+    """
+    Compare results against a baseline.
+
+    :param results: The new results.
+    :param baseline: The baseline results.
+    :param metrics: Dictionary mapping the name of each metric to check to True if higher values
+        are better, or False if lower values are better.
+    :param tolerance: The fraction by which each metric may get worse, to allow for noise.
+    :returns: A list of regression descriptions.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for metric, higher_is_better in metrics.items():
+            new = result[metric]
+            old = baseline[name].get(metric)
+            if old is None:
+                continue
+            if higher_is_better:
+                worse = new < old * (1 - tolerance)
+            else:
+                worse = new > old * (1 + tolerance)
+            if worse:
+                regressions.append(f"{name}: {new} {metric} (baseline {old})")
+    return regressions
+
+
+def _load(path):
+    """
+    Load results from a JSON file.
+
+    :param path: The file to read.
+    :returns: The results, or None if there is no such file.
+    """
+    if not os.path.exists(path):
+        print(f"No baseline at {path} - run with --update to create one.")
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save(path, results, metrics):
+    """
+    Save some of the metrics from a set of results to a JSON file.
+
+    :param path: The file to write.
+    :param results: The results to save.
+    :param metrics: The names of the metrics to save.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({name: {metric: result[metric] for metric in metrics}
+                   for name, result in results.items()},
+                  f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(description, baseline, add_arguments, run_all, exact, speed, check=None):
+    """
+    Run a set of benchmarks from the command line.
+
+    :param description: The description of the benchmarks for the help text.
+    :param baseline: The default file for the committed baseline.
+    :param add_arguments: Function to add any extra arguments to the parser.
+    :param run_all: Function to run the selected benchmarks and print the results.  It is passed
+        the parsed arguments and returns a dictionary of the results for each benchmark.
+    :param exact: The deterministic metrics, where lower values are better and any increase
+        is a regression.
+    :param speed: A tuple of (metric, True if higher values are better) for the speed of each
+        benchmark.
+    :param check: Optional function to check the results against any fixed limits.  It is passed
+        the parsed arguments and the results and returns a list of failure descriptions.
+    :returns: The exit code for the process.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    add_arguments(parser)
+    parser.add_argument("-b", "--baseline", default=baseline,
+                        help="JSON file with the baseline output figures")
+    parser.add_argument("-S", "--speeds",
+                        help="JSON file with your own baseline speeds for this machine")
+    parser.add_argument("-t", "--tolerance", type=float, default=0.25,
+                        help="allowed fractional drop in speed before failing")
+    parser.add_argument("-u", "--update", action="store_true",
+                        help="save the results as the new baseline")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default all)")
+    args = parser.parse_args()
+
+    results = run_all(args)
+    if args.update:
+        _save(args.baseline, results, exact)
+        if args.speeds:
+            _save(args.speeds, results, [speed[0]])
+        return 0
+
+    regressions = [] if check is None else check(args, results)
+    expected = _load(args.baseline)
+    if expected is not None:
+        regressions += compare(results, expected, {metric: False for metric in exact})
+    if args.speeds:
+        expected = _load(args.speeds)
+        if expected is not None:
+            regressions += compare(results, expected, {speed[0]: speed[1]}, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION - {regression}")
+    return 1 if regressions else 0
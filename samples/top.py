@@ -7,6 +7,7 @@ from asciimatics.screen import Screen
 from asciimatics.exceptions import ResizeScreenError, StopApplication
 from asciimatics.parsers import AsciimaticsParser
 import sys
+import threading
 from collections import defaultdict
 try:
     import psutil
@@ -39,9 +40,9 @@ class DemoFrame(Frame):
                                         has_border=False,
                                         name="My Form")
         # Internal state required for doing periodic updates
-        self._last_frame = 0
         self._sort = 5
         self._reverse = True
+        self._list_data = []
 
         # Create the basic form layout...
         layout = Layout([1], fill_frame=True)
@@ -81,91 +82,108 @@ class DemoFrame(Frame):
             elif event.key_code == ord(">"):
                 self._sort = min(7, self._sort + 1)
 
-            # Force a refresh for improved responsiveness
-            self._last_frame = 0
+            # Re-sort the current data for improved responsiveness
+            self._show_data()
 
         # Now pass on to lower levels for normal handling of the event.
         return super(DemoFrame, self).process_event(event)
 
-    def _update(self, frame_no):
-        # Refresh the list view if needed
-        if frame_no - self._last_frame >= self.frame_update_count or self._last_frame == 0:
-            self._last_frame = frame_no
-
-            # Create the data to go in the multi-column list...
-            last_selection = self._list.value
-            last_start = self._list.start_line
-            list_data = []
-            for process in psutil.process_iter():
-                try:
-                    memory = process.memory_info()
-                    data = [
-                        process.pid,
-                        process.username(),
-                        int(process.nice()),
-                        memory.vms,
-                        memory.rss,
-                        process.cpu_percent(),
-                        process.memory_percent(),
-                        (" ".join(process.cmdline()) if process.cmdline() else
-                         "[{}]".format(process.name()))
-                    ]
-                    list_data.append(data)
-                except psutil.AccessDenied:
-                    # Some platforms don't allow querying of all processes...
-                    pass
-
-            # Apply current sort and reformat for humans
-            list_data = sorted(list_data,
-                               key=lambda f: f[self._sort],
-                               reverse=self._reverse)
-            new_data = [
-                ([
-                    str(x[0]),
-                    x[1],
-                    str(x[2]),
-                    readable_mem(x[3]),
-                    readable_mem(x[4]),
-                    readable_pc(x[5]),
-                    readable_pc(x[6]),
-                    x[7]
-                ], x[0]) for x in list_data
-            ]
-
-            # Add colours...
-            coloured_data = []
-            for cols, val in new_data:
-                cpu = float(cols[5])
-                if cpu < 40:
-                    colour = ""
-                elif cpu < 60:
-                    colour = "${3}"
-                elif cpu < 80:
-                    colour = "${1}"
-                else:
-                    colour = "${1,1}"
-                coloured_data.append(([colour + x for x in cols], val))
-
-            # Update the list and try to reset the last selection.
-            self._list.options = coloured_data
-            self._list.value = last_selection
-            self._list.start_line = last_start
-            self._header.value = (
-                "CPU usage: {}%   Memory available: {}M".format(
-                    str(round(psutil.cpu_percent() * 10, 0) / 10),
-                    str(int(psutil.virtual_memory().available / 1024 / 1024))))
-
-        # Now redraw as normal
-        super(DemoFrame, self)._update(frame_no)
-
-    @property
-    def frame_update_count(self):
-        # Refresh once every 2 seconds by default.
-        return 40
+    def update_data(self, list_data, header):
+        """
+        Update the displayed data.  This must be called on the Screen's thread.
+        """
+        self._list_data = list_data
+        self._header.value = header
+        self._show_data()
+
+    def _show_data(self):
+        # Remember current selection so we can restore it.
+        last_selection = self._list.value
+        last_start = self._list.start_line
+
+        # Apply current sort and reformat for humans
+        list_data = sorted(self._list_data,
+                           key=lambda f: f[self._sort],
+                           reverse=self._reverse)
+        new_data = [
+            ([
+                str(x[0]),
+                x[1],
+                str(x[2]),
+                readable_mem(x[3]),
+                readable_mem(x[4]),
+                readable_pc(x[5]),
+                readable_pc(x[6]),
+                x[7]
+            ], x[0]) for x in list_data
+        ]
+
+        # Add colours...
+        coloured_data = []
+        for cols, val in new_data:
+            cpu = float(cols[5])
+            if cpu < 40:
+                colour = ""
+            elif cpu < 60:
+                colour = "${3}"
+            elif cpu < 80:
+                colour = "${1}"
+            else:
+                colour = "${1,1}"
+            coloured_data.append(([colour + x for x in cols], val))
+
+        # Update the list and try to reset the last selection.
+        self._list.options = coloured_data
+        self._list.value = last_selection
+        self._list.start_line = last_start
+
+
+def collect_data(screen, frame, stop):
+    """
+    Collect process data in the background - as this can be slow - and post it to the Screen.
+    """
+    while not stop.is_set():
+        # Create the data to go in the multi-column list...
+        list_data = []
+        for process in psutil.process_iter():
+            try:
+                memory = process.memory_info()
+                data = [
+                    process.pid,
+                    process.username(),
+                    int(process.nice()),
+                    memory.vms,
+                    memory.rss,
+                    process.cpu_percent(),
+                    process.memory_percent(),
+                    (" ".join(process.cmdline()) if process.cmdline() else
+                     "[{}]".format(process.name()))
+                ]
+                list_data.append(data)
+            except (psutil.AccessDenied, psutil.NoSuchProcess):
+                # Some platforms don't allow querying of all processes...
+                pass
+        header = "CPU usage: {}%   Memory available: {}M".format(
+            str(round(psutil.cpu_percent() * 10, 0) / 10),
+            str(int(psutil.virtual_memory().available / 1024 / 1024)))
+
+        # Widgets must only be updated on the Screen's thread, so post the update to it.
+        screen.call_soon_threadsafe(frame.update_data, list_data, header)
+
+        # Refresh once every 2 seconds.
+        stop.wait(2)
 
 
 def demo(screen):
-    screen.play([Scene([DemoFrame(screen)], -1)], stop_on_resize=True)
+    frame = DemoFrame(screen)
+    stop = threading.Event()
+    worker = threading.Thread(target=collect_data, args=(screen, frame, stop), daemon=True)
+    worker.start()
+    try:
+        screen.play([Scene([frame], -1)], stop_on_resize=True)
+    finally:
+        stop.set()
+        worker.join()
 
 
 while True:
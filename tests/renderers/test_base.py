@@ -67,6 +67,20 @@ class TestRenderers(unittest.TestCase):
         self.assertEqual(output[1][0][1], (Screen.COLOUR_RED, 0, None))
         self.assertEqual(output[1][0][2], (Screen.COLOUR_GREEN, 0, None))
 
+    def test_memory_usage(self):
+        """
+        Check that memory usage grows with the images.
+        """
+        small = StaticRenderer(images=["A"])
+        large = StaticRenderer(images=["${1}A" * 100 + "\nB" * 100] * 10)
+        self.assertGreater(small.memory_usage(), 0)
+        self.assertGreater(large.memory_usage(), small.memory_usage() * 10)
+
+        # Converting the images uses more memory.
+        size = large.memory_usage()
+        _ = large.rendered_text
+        self.assertGreater(large.memory_usage(), size)
+
 
 if __name__ == '__main__':
     unittest.main()
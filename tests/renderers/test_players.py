@@ -84,6 +84,14 @@ class TestRendererPlayers(unittest.TestCase):
             # Check images just returns one frame.
             self.assertEqual(len(renderer.images), 1)
 
+        # Check that a clock can be used to play in real time instead of per frame.
+        times = iter(range(0, 1000, 5))
+        with AsciinemaPlayer(os.path.join(os.path.dirname(__file__), "test.rec"), max_delay=0.1,
+                             clock=lambda: next(times)) as renderer:
+            for _ in range(20):
+                b = str(renderer)
+            self.assertEqual(a, b)
+
         # Check for unsupported format
         with self.assertRaises(RuntimeError):
             with AsciinemaPlayer(os.path.join(os.path.dirname(__file__), "test_bad.rec")) as renderer:
@@ -5,11 +5,12 @@ from random import randint
 import os
 import sys
 from asciimatics.effects import Print, Cycle, BannerText, Mirage, Scroll, \
-    Stars, Matrix, Snow, Wipe, Clock, Cog, RandomNoise, Julia, Sprite
+    Stars, Matrix, Snow, Wipe, Clock, Cog, RandomNoise, Julia, Sprite, FrameStats
 from asciimatics.paths import Path
+from asciimatics.profiler import FrameProfiler
 from asciimatics.renderers import FigletText, StaticRenderer
 from asciimatics.scene import Scene
-from asciimatics.screen import Screen, Canvas
+from asciimatics.screen import Screen, Canvas, HeadlessScreen
 from asciimatics.sprites import Sam
 from tests.mock_objects import MockEffect
 if sys.platform != "win32":
@@ -107,6 +108,16 @@ class TestEffects(unittest.TestCase):
         effect.update(3)
         screen.centre.assert_called_with("hello", 2, 1)
 
+        # Skipped frames are ignored by default...
+        screen.catch_up = False
+        effect.update(5)
+        screen.centre.assert_called_with("hello", 2, 2)
+
+        # ... but still cycle the colours when catching up.
+        screen.catch_up = True
+        effect.update(9)
+        screen.centre.assert_called_with("hello", 2, 4)
+
         # Check there is no stop frame
         self.assertEqual(effect.stop_frame, 0)
 
@@ -168,6 +179,22 @@ class TestEffects(unittest.TestCase):
         # Check there is no stop frame by default.
         self.assertEqual(effect.stop_frame, 0)
 
+        # Check the drawing priority can be set.
+        self.assertEqual(effect.priority, 0)
+        effect = Print(screen, StaticRenderer(images=["hello"]), 2, 1, priority=3)
+        self.assertEqual(effect.priority, 3)
+
+        # Degraded effects only update on alternate frames.
+        effect = Print(screen, StaticRenderer(images=["hello"]), 2, 1, speed=1)
+        effect.reset()
+        self.assertFalse(effect.degraded)
+        effect.degraded = True
+        screen.paint.reset_mock()
+        effect.update(1)
+        screen.paint.assert_not_called()
+        effect.update(2)
+        screen.paint.assert_called()
+
         # This effect should ignore events.
         event = object()
         self.assertEqual(event, effect.process_event(event))
@@ -455,6 +482,28 @@ class TestEffects(unittest.TestCase):
         effect.update(1)
         screen.paint.assert_not_called()
 
+        # Check that skipped frames still move the Sprite along the path.
+        path = Path()
+        path.jump_to(10, 5)
+        path.move_straight_to(20, 5, 10)
+        effect = Sprite(
+            screen,
+            renderer_dict={
+                "default": StaticRenderer(images=["X"])
+            },
+            path=path)
+        effect.reset()
+        screen.catch_up = True
+        effect.update(0)
+        screen.paint.assert_called_with('X', 10, 5, 7, colour_map=[(None, None, None)])
+        effect.update(9)
+        screen.paint.assert_called_with('X', 14, 5, 7, colour_map=[(None, None, None)])
+
+        # Without catching up, it just takes the next step.
+        screen.catch_up = False
+        effect.update(18)
+        screen.paint.assert_called_with('X', 15, 5, 7, colour_map=[(None, None, None)])
+
         # Check there is no stop frame by default.
         self.assertEqual(effect.stop_frame, 0)
 
@@ -572,6 +621,43 @@ class TestEffects(unittest.TestCase):
         event = object()
         self.assertEqual(event, effect.process_event(event))
 
+    def test_frame_stats(self):
+        """
+        Check that FrameStats shows the Screen's frame statistics.
+        """
+        screen = HeadlessScreen(height=10, width=40, unicode_aware=False)
+
+        # The Screen must be profiled.
+        with self.assertRaises(ValueError):
+            FrameStats(screen)
+        screen.profiler = FrameProfiler()
+        effect = FrameStats(screen, y=1)
+        screen.set_scenes([Scene([MockEffect(count=100, stop_frame=0), effect], -1)])
+        self.assertEqual(effect.frame_update_count, 0)
+
+        # Nothing to show until there are some statistics...
+        screen.draw_next_frame()
+        self.assertEqual(screen.get_from(16, 1), (32, 7, 0, 0))
+
+        # ... and then the summary is drawn in the top right.
+        for _ in range(3):
+            screen.draw_next_frame()
+        text = ["".join(chr(screen.get_from(x, y)[0]) for x in range(16, 40)) for y in range(1, 5)]
+        self.assertTrue(text[0].startswith("fps "))
+        self.assertEqual(len(text[1].strip()), 3)
+        self.assertTrue(text[2].startswith("cells "))
+        self.assertEqual(text[3].strip(), "slow MockEffect")
+        self.assertEqual(screen.get_from(16, 1)[3], Screen.COLOUR_BLUE)
+
+        # Stop action is a no-op.
+        self.assertEqual(effect.stop_frame, 0)
+
+        # Nothing more is drawn once the profiler is removed.
+        screen.profiler = None
+        screen.clear_buffer(Screen.COLOUR_WHITE, 0, Screen.COLOUR_BLACK)
+        screen.draw_next_frame()
+        self.assertEqual(screen.get_from(16, 1), (32, 7, 0, 0))
+
 
 if __name__ == '__main__':
     unittest.main()
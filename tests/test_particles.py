@@ -103,6 +103,21 @@ class TestParticles(unittest.TestCase):
                           effect,
                           lambda value: self.assertIn(chr(value[0]), ' `\\v'))
 
+    def test_degraded(self):
+        """
+        Test that degraded particle effects spawn fewer particles.
+        """
+        screen = MagicMock(spec=Screen, colours=8)
+        canvas = Canvas(screen, 10, 40, 0, 0)
+        effect = Rain(canvas, 200)
+        effect.reset()
+        effect.update(1)
+        self.assertEqual(len(effect._active_systems[0].particles), 4)
+        effect.reset()
+        effect.degraded = True
+        effect.update(1)
+        self.assertEqual(len(effect._active_systems[0].particles), 2)
+
     def test_star_firework(self):
         """
         Test that StarFirework works as expected.
@@ -0,0 +1,88 @@
+import json
+import unittest
+from io import StringIO
+from unittest.mock import MagicMock
+from asciimatics.profiler import FrameProfiler
+from asciimatics.scene import Scene
+from asciimatics.screen import HeadlessScreen
+from tests.mock_objects import MockEffect
+
+
+class FakeClock():
+    """
+    Dummy clock that ticks every time it is read.
+    """
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 0.001
+        return self.now
+
+
+class TestFrameProfiler(unittest.TestCase):
+    def test_ring_buffer(self):
+        """
+        Check that profiles are recorded in a ring buffer and passed to the callback.
+        """
+        on_frame = MagicMock()
+        profiler = FrameProfiler(size=3, on_frame=on_frame)
+        for i in range(5):
+            profiler.start_frame(i)
+            profiler.add_phase("refresh", 0.5)
+            profiler.add_phase("refresh", 0.25)
+            profiler.add_cells(10)
+            profiler.add_bytes(i)
+            profiler.end_frame()
+        self.assertEqual([p.frame for p in profiler.profiles], [2, 3, 4])
+        self.assertEqual(on_frame.call_count, 5)
+        self.assertEqual(profiler.profiles[0].phases, {"refresh": 0.75})
+        self.assertEqual(profiler.profiles[0].cells, 10)
+        self.assertEqual(profiler.profiles[0].bytes, 2)
+
+        # Nothing is recorded outside a frame.
+        profiler.add_phase("write", 1)
+        profiler.add_bytes(1)
+        profiler.end_frame()
+        self.assertEqual(len(profiler.profiles), 3)
+
+        # Profiles can be exported as JSON lines.
+        stream = StringIO()
+        profiler.export(stream)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[2])["frame"], 4)
+        profiler.clear()
+        self.assertEqual(profiler.profiles, [])
+
+    def test_screen(self):
+        """
+        Check that the Screen records each phase, Effect and output when profiling.
+        """
+        screen = HeadlessScreen(height=10, width=20)
+        self.assertIsNone(screen.profiler)
+        profiler = FrameProfiler(clock=FakeClock())
+        screen.profiler = profiler
+        effect = MockEffect(count=3, frame_rate=1, stop_frame=0)
+        effect._update = lambda frame_no: screen.print_at("hello", 0, frame_no)
+        screen.set_scenes([Scene([effect], -1)])
+        for _ in range(3):
+            screen.draw_next_frame()
+
+        self.assertEqual(len(profiler.profiles), 3)
+        profile = profiler.profiles[-1]
+        self.assertEqual(profile.frame, 3)
+        self.assertEqual(set(profile.phases), {"events", "update", "refresh"})
+        self.assertEqual(list(profile.effects), ["MockEffect"])
+        self.assertGreater(profile.effects["MockEffect"], 0)
+        self.assertEqual(profile.cells, 5)
+        self.assertGreater(profile.bytes, 5)
+
+        # No more profiles once disabled.
+        screen.profiler = None
+        screen.draw_next_frame()
+        self.assertEqual(len(profiler.profiles), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
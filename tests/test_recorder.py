@@ -0,0 +1,184 @@
+import gzip
+import json
+import os
+import random
+import tempfile
+import unittest
+from io import StringIO
+from asciimatics.effects import Print, Stars
+from asciimatics.event import KeyboardEvent, MouseEvent
+from asciimatics.exceptions import StopApplication
+from asciimatics.particles import StarFirework
+from asciimatics.recorder import SessionRecorder, SessionReplayer, export_asciinema
+from asciimatics.renderers import AsciinemaPlayer, StaticRenderer
+from asciimatics.scene import Scene
+from asciimatics.screen import HeadlessScreen
+from asciimatics.widgets import Frame, Layout, Text
+
+
+def make_scenes(screen):
+    """
+    Create a Scene that uses both input and random numbers.
+    """
+    frame = Frame(screen, 5, 30, x=0, y=0, has_border=False)
+    layout = Layout([1])
+    frame.add_layout(layout)
+    layout.add_widget(Text("Name:", "name"))
+    frame.fix()
+    return [Scene([Stars(screen, 50), frame], -1)], frame
+
+
+def stop_on_escape(event):
+    if isinstance(event, KeyboardEvent) and event.key_code == -1:
+        raise StopApplication("Stop")
+
+
+class TestRecorder(unittest.TestCase):
+    def test_record(self):
+        """
+        Check that a session is recorded as JSON lines.
+        """
+        stream = StringIO()
+        screen = HeadlessScreen(height=10, width=40)
+        self.assertIsNone(screen.recorder)
+        screen.recorder = SessionRecorder(stream, seed=1234)
+        scenes, _ = make_scenes(screen)
+        screen.set_scenes(scenes)
+        screen.inject_event(KeyboardEvent(ord("a")))
+        screen.inject_event(MouseEvent(1, 2, MouseEvent.LEFT_CLICK))
+        screen.draw_next_frame()
+        screen.draw_next_frame()
+        screen.recorder.record_resize()
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(records[0]["seed"], 1234)
+        self.assertEqual((records[0]["height"], records[0]["width"]), (10, 40))
+        self.assertEqual(records[1]["frame"], 0)
+        self.assertEqual(records[1]["events"], [["key", ord("a")], ["mouse", 1, 2, 1]])
+        self.assertEqual(records[2]["frame"], 1)
+        self.assertNotIn("events", records[2])
+        self.assertEqual(records[3], {"resize": True})
+
+        # Rubbish is rejected.
+        with self.assertRaises(ValueError):
+            SessionReplayer(StringIO("{}\n"))
+
+    def test_replay(self):
+        """
+        Check that a replayed session produces exactly the same output.
+        """
+        stream = StringIO()
+        screen = HeadlessScreen(height=10, width=40)
+        screen.recorder = SessionRecorder(stream)
+        scenes, frame = make_scenes(screen)
+        screen.set_scenes(scenes, unhandled_input=stop_on_escape)
+        for i in range(30):
+            if i % 3 == 0:
+                screen.inject_event(KeyboardEvent(ord("a") + i // 3))
+            screen.draw_next_frame()
+            if i == 10:
+                screen.skip_frames(5)
+        screen.inject_event(KeyboardEvent(-1))
+        with self.assertRaises(StopApplication):
+            screen.draw_next_frame()
+        expected = screen.cells
+        self.assertEqual(frame.find_widget("name").value, "abcdefghij")
+
+        # Mess up the random numbers before replaying to prove that it doesn't matter.
+        random.seed(0)
+        replayer = SessionReplayer(StringIO(stream.getvalue()))
+        self.assertEqual(replayer.seed, screen.recorder.seed)
+        replay = replayer.create_screen()
+        scenes, frame = make_scenes(replay)
+        frames = replayer.play(replay, scenes, unhandled_input=stop_on_escape)
+        self.assertEqual(frames, 30)
+        self.assertEqual(frame.find_widget("name").value, "abcdefghij")
+        self.assertEqual(replay.cells, expected)
+
+    def test_replay_shed_load(self):
+        """
+        Check that frames drawn while shedding load are replayed exactly.
+        """
+        def make_firework_scenes(screen):
+            return [Scene([Stars(screen, 50, priority=1),
+                           StarFirework(screen, 20, 5, 30, priority=0)], -1)]
+
+        stream = StringIO()
+        screen = HeadlessScreen(height=10, width=40)
+        screen.recorder = SessionRecorder(stream)
+        screen.set_scenes(make_firework_scenes(screen))
+        for i in range(30):
+            screen.shed_level = 1 if i < 15 else 0
+            screen.draw_next_frame()
+        expected = screen.cells
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([r.get("shed", 0) for r in records[1:]], [1] * 15 + [0] * 15)
+
+        replayer = SessionReplayer(StringIO(stream.getvalue()))
+        replay = replayer.create_screen()
+        self.assertEqual(replayer.play(replay, make_firework_scenes(replay)), 30)
+        self.assertEqual(replay.cells, expected)
+
+    def test_resize(self):
+        """
+        Check that replay stops when the original Screen was resized.
+        """
+        stream = StringIO()
+        screen = HeadlessScreen(height=10, width=40)
+        screen.recorder = SessionRecorder(stream)
+        scenes, _ = make_scenes(screen)
+        screen.set_scenes(scenes)
+        for _ in range(5):
+            screen.draw_next_frame()
+        screen.recorder.record_resize()
+        screen.draw_next_frame()
+
+        replayer = SessionReplayer(StringIO(stream.getvalue()))
+        replay = replayer.create_screen()
+        scenes, _ = make_scenes(replay)
+        self.assertEqual(replayer.play(replay, scenes), 5)
+
+    def test_export_asciinema(self):
+        """
+        Check that Scenes can be exported to an asciinema recording and played back.
+        """
+        def make_text_scenes(screen):
+            return [
+                Scene([Print(screen, StaticRenderer(["Hello"]), 1, 2)], 100),
+                Scene([Print(screen, StaticRenderer(["World"]), 1, 2)], 100),
+            ]
+
+        with tempfile.TemporaryDirectory() as folder:
+            for name in ("test.cast", "test.cast.gz"):
+                filename = os.path.join(folder, name)
+                frames = export_asciinema(filename, make_text_scenes, height=5, width=20,
+                                          title="Test")
+                self.assertEqual(frames, 200)
+
+                # Idle frames are skipped, so there are very few lines of output.
+                opener = gzip.open if name.endswith(".gz") else open
+                with opener(filename, "rt", encoding="utf-8") as f:
+                    lines = [json.loads(line) for line in f]
+                self.assertEqual(lines[0]["version"], 2)
+                self.assertEqual(lines[0]["title"], "Test")
+                self.assertEqual((lines[0]["height"], lines[0]["width"]), (5, 20))
+                self.assertLess(len(lines), 10)
+                self.assertAlmostEqual(lines[-1][0], 5, delta=0.5)
+                self.assertTrue(all(line[1] == "o" for line in lines[1:]))
+
+                with AsciinemaPlayer(filename) as renderer:
+                    for _ in range(120):
+                        text = str(renderer)
+                    self.assertEqual(text.splitlines()[1], "  World             ")
+
+        # Repeating Scenes must have a limit.
+        with self.assertRaises(ValueError):
+            export_asciinema("unused.cast", make_text_scenes, repeat=True)
+
+        # So must Scenes that never end.
+        with self.assertRaises(ValueError):
+            export_asciinema("unused.cast", lambda screen: [Scene([Stars(screen, 10)], -1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,10 @@
 import unittest
+from asciimatics.effects import Print
 from asciimatics.event import MouseEvent
+from asciimatics.renderers import Fire, StaticRenderer
 from asciimatics.scene import Scene
+from asciimatics.screen import HeadlessScreen
+from asciimatics.widgets import Frame
 from tests.mock_objects import MockEffect
 
 
@@ -15,6 +19,25 @@ class TestScene(unittest.TestCase):
         self.assertEqual(scene.duration, 10)
         self.assertFalse(scene.clear)
 
+    def test_memory_usage(self):
+        """
+        Check that memory usage includes the Renderers in each Effect.
+        """
+        screen = HeadlessScreen(height=10, width=40)
+        static = StaticRenderer(images=["Hello"])
+        dynamic = Fire(10, 40, "*" * 30, 0.8, 60, screen.colours)
+        effects = [MockEffect(), Print(screen, static, 0), Print(screen, dynamic, 0)]
+        scene = Scene(effects, duration=10)
+        self.assertEqual(effects[0].memory_usage(), 0)
+        self.assertEqual(effects[1].memory_usage(), static.memory_usage())
+        self.assertEqual(effects[2].memory_usage(), dynamic.memory_usage())
+        self.assertEqual(scene.memory_usage(), static.memory_usage() + dynamic.memory_usage())
+
+        # Frames count their Canvas, but not the Screen or Scene.
+        frame = Frame(screen, 5, 20)
+        Scene([frame], duration=10)
+        self.assertEqual(frame.memory_usage(), frame.canvas.memory_usage())
+
     def test_dynamic_effects(self):
         """
         Check adding and removing effects works.
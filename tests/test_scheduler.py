@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import MagicMock
+from asciimatics.scheduler import FrameScheduler
+
+
+class FakeClock():
+    """
+    Dummy clock for testing schedules.
+    """
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFrameScheduler(unittest.TestCase):
+    def test_pacing(self):
+        """
+        Check that frames are scheduled at fixed intervals without drift.
+        """
+        clock = FakeClock()
+        scheduler = FrameScheduler(fps=10, clock=clock)
+        self.assertEqual(scheduler.fps, 10)
+        self.assertAlmostEqual(scheduler.interval, 0.1)
+        scheduler.start()
+
+        # Each frame waits for the remainder of its interval from the start of the schedule.
+        clock.now += 0.03
+        pause, skipped = scheduler.end_frame()
+        self.assertAlmostEqual(pause, 0.07)
+        self.assertEqual(skipped, 0)
+        clock.now += pause + 0.01
+        pause, skipped = scheduler.end_frame()
+        self.assertAlmostEqual(pause, 0.09)
+        self.assertAlmostEqual(scheduler.time_until(2), 0.29)
+
+        # Changing the rate restarts the schedule.
+        scheduler.fps = 20
+        self.assertAlmostEqual(scheduler.time_until(1), 0.05)
+        with self.assertRaises(ValueError):
+            scheduler.fps = 0
+        with self.assertRaises(ValueError):
+            FrameScheduler(fps=-1)
+
+    def test_missed_frames(self):
+        """
+        Check the frame skip policies when deadlines are missed.
+        """
+        # Default is to report and shift the schedule.
+        clock = FakeClock()
+        on_missed = MagicMock()
+        scheduler = FrameScheduler(fps=10, on_missed=on_missed, clock=clock)
+        scheduler.start()
+        clock.now += 0.35
+        self.assertEqual(scheduler.end_frame(), (0, 0))
+        on_missed.assert_called_once()
+        self.assertAlmostEqual(on_missed.call_args[0][0], 0.25)
+        self.assertEqual(on_missed.call_args[0][1], 0)
+        self.assertAlmostEqual(scheduler.end_frame()[0], 0.1)
+
+        # Or skip frames to catch up.
+        on_missed.reset_mock()
+        scheduler = FrameScheduler(fps=10, skip_frames=True, on_missed=on_missed, clock=clock)
+        self.assertTrue(scheduler.skip_frames)
+        scheduler.start()
+        clock.now += 0.35
+        self.assertEqual(scheduler.end_frame(), (0, 2))
+        self.assertEqual(on_missed.call_args[0][1], 2)
+        self.assertAlmostEqual(scheduler.end_frame()[0], 0.05)
+
+    def test_catch_up(self):
+        """
+        Check that frames passed while waiting are skipped.
+        """
+        clock = FakeClock()
+        scheduler = FrameScheduler(fps=10, clock=clock)
+        scheduler.start()
+        self.assertEqual(scheduler.catch_up(), 0)
+        clock.now += 0.55
+        self.assertEqual(scheduler.catch_up(3), 3)
+        self.assertEqual(scheduler.catch_up(), 2)
+        self.assertAlmostEqual(scheduler.time_until(1), 0.05)
+
+
+if __name__ == '__main__':
+    unittest.main()
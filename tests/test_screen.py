@@ -1,8 +1,10 @@
+import asyncio
 import os
 from random import randint
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 import sys
+import threading
 import time
 from asciimatics.event import KeyboardEvent, MouseEvent
 from asciimatics.exceptions import StopApplication, NextScene
@@ -11,7 +13,11 @@ try:
 except ImportError:
     pass
 from asciimatics.scene import Scene
-from asciimatics.screen import Screen, Canvas, ManagedScreen, _DoubleBuffer
+from asciimatics.profiler import FrameProfiler
+from asciimatics.scheduler import FrameScheduler
+from asciimatics.screen import (
+    Screen, Canvas, HeadlessScreen, ManagedScreen, _DoubleBuffer, _ArrayDoubleBuffer)
+from asciimatics.widgets.utilities import _split_text
 from tests.mock_objects import MockEffect
 if sys.platform == "win32":
     import win32console
@@ -462,6 +468,400 @@ class TestScreen(unittest.TestCase):
         Screen.wrapper(
             check_screen_and_canvas, height=15, arguments=[internal_checks])
 
+    def test_refresh_runs(self):
+        """
+        Check that refresh batches up runs of changed cells with the same colours (re-printing
+        short gaps where that is cheaper than moving the cursor).
+        """
+        def internal_checks(screen):
+            screen.refresh()
+            screen._print_at = MagicMock()
+            screen.print_at("Hello", 0, 0, colour=Screen.COLOUR_CYAN)
+            screen.print_at("world!", 5, 0, colour=Screen.COLOUR_RED)
+            screen.print_at("你確a", 3, 1)
+            screen.print_at("b", 10, 1)
+            screen.refresh()
+            self.assertEqual(screen._print_at.call_args_list, [
+                (("Hello", 0, 0, 5),),
+                (("world!", 5, 0, 6),),
+                (("你確a  b", 3, 1, 8),)])
+
+        Screen.wrapper(internal_checks, height=15, unicode_aware=True)
+
+    def test_flush_output(self):
+        """
+        Check that curses output is written in one go, coping with partial writes.
+        """
+        if sys.platform == "win32":
+            self.skipTest("Only valid for curses.")
+
+        def internal_checks(screen):
+            written = []
+
+            def fake_write(_, data):
+                written.append(bytes(data))
+                return min(len(data), 6)
+
+            screen.refresh()
+            screen.print_at("Hello world!", 0, 0)
+            screen.print_at("你確", 0, 1)
+            with patch("asciimatics.screen.os.write", side_effect=fake_write):
+                screen.refresh()
+            self.assertGreater(len(written), 3)
+            for previous, current in zip(written, written[1:]):
+                self.assertEqual(previous[6:], current)
+            self.assertIn(b"world!", written[0])
+            self.assertIn("你確".encode(screen._encoding, "replace"), written[0])
+            self.assertEqual(screen._output, [])
+
+        Screen.wrapper(internal_checks, height=15, unicode_aware=True)
+
+    def test_cursor_motion(self):
+        """
+        Check that the curses cursor planner picks the cheapest way to move.
+        """
+        if sys.platform == "win32":
+            self.skipTest("Only valid for curses.")
+
+        def internal_checks(screen):
+            def cap(name, *args):
+                value = curses.tigetstr(name)
+                return curses.tparm(value, *args).decode("utf-8") if args else value.decode("utf-8")
+
+            # Unknown or pending-wrap locations always use absolute moves.
+            self.assertEqual(screen._cursor_move(None, None, 5, 4), cap("cup", 4, 5))
+            self.assertEqual(screen._cursor_move(screen.width, 4, 5, 4), cap("cup", 4, 5))
+
+            # Otherwise pick the shortest option.
+            for from_x, from_y, to_x, to_y in ((10, 5, 12, 5), (10, 5, 9, 5), (10, 5, 0, 6), (10, 5, 70, 1)):
+                move = screen._cursor_move(from_x, from_y, to_x, to_y)
+                self.assertLessEqual(len(move), len(cap("cup", to_y, to_x)))
+            self.assertEqual(screen._cursor_move(10, 5, 9, 5), cap("cub1"))
+            self.assertEqual(screen._cursor_move(10, 5, 12, 5),
+                             min(cap("cuf", 2), cap("cuf1") * 2, cap("hpa", 12), key=len))
+
+            # Check that short gaps are re-printed rather than moved over (but long ones aren't).
+            screen.print_at("Hello world!", 0, 0)
+            screen.refresh()
+            screen._print_at = MagicMock()
+            screen.print_at("j", 0, 0)
+            screen.print_at("y", 4, 0)
+            screen.print_at("?", 11, 0)
+            screen.refresh()
+            self.assertEqual(screen._print_at.call_args_list, [
+                (("jelly", 0, 0, 5),), (("?", 11, 0, 1),)])
+
+        Screen.wrapper(internal_checks, height=15)
+
+    def test_scroll_region(self):
+        """
+        Check that refresh scrolls blocks of lines that have moved.
+        """
+        if sys.platform == "win32":
+            self.skipTest("Only valid for curses.")
+
+        def internal_checks(screen):
+            if not screen._hardware_scroll:
+                self.skipTest("Terminal does not support scroll regions.")
+
+            for y in range(10):
+                screen.print_at(f"line {y}", 0, y)
+            screen.refresh()
+
+            screen._scroll_region = MagicMock(wraps=screen._scroll_region)
+            screen._print_at = MagicMock()
+            for y in range(10):
+                screen.print_at(f"line {y + 1}", 0, y)
+            screen.refresh()
+            screen._scroll_region.assert_called_once_with(0, 9, 1)
+            self.assertEqual(screen._print_at.call_args_list, [(("line 10", 0, 9, 7),)])
+
+        Screen.wrapper(internal_checks, height=15)
+
+    def test_repeat_runs(self):
+        """
+        Check that curses output compresses runs of the same glyph.
+        """
+        if sys.platform == "win32":
+            self.skipTest("Only valid for curses.")
+
+        def internal_checks(screen):
+            if screen._repeat_char is None or screen._erase_chars is None:
+                self.skipTest("Terminal does not support REP and ECH.")
+
+            screen.print_at("x" * 40, 0, 0, bg=Screen.COLOUR_BLUE)
+            screen.refresh()
+            screen._safe_write = MagicMock()
+            screen.print_at("|" + "=" * 20 + "|" + " " * 20, 0, 0, bg=Screen.COLOUR_BLUE)
+            screen.refresh()
+            output = "".join(args[0][0] for args in screen._safe_write.call_args_list)
+            self.assertIn("|" + curses.tparm(curses.tigetstr("rep"), ord("="), 20).decode("utf-8") + "|",
+                          output)
+            self.assertTrue(output.endswith(curses.tparm(curses.tigetstr("ech"), 20).decode("utf-8")))
+            self.assertEqual(screen._cur_x, 22)
+
+            # Short runs are printed as normal and reversed spaces can't be erased.
+            screen._safe_write.reset_mock()
+            screen.print_at("===  " + " " * 20, 0, 0, attr=Screen.A_REVERSE)
+            screen.refresh()
+            output = "".join(args[0][0] for args in screen._safe_write.call_args_list)
+            self.assertTrue(output.endswith(
+                "===" + curses.tparm(curses.tigetstr("rep"), ord(" "), 22).decode("utf-8")))
+
+        Screen.wrapper(internal_checks, height=15)
+
+    def test_byte_budget(self):
+        """
+        Check that refresh defers low priority lines that don't fit in the byte budget.
+        """
+        def internal_checks(screen):
+            self.assertIsNone(screen.byte_budget)
+            screen.byte_budget = 20
+            screen._print_at = MagicMock()
+            screen._buffer.priority = 0
+            screen.print_at("background", 0, 0)
+            screen._buffer.priority = 1
+            screen.print_at("focus", 0, 5)
+            screen._buffer.priority = 0
+            screen.refresh()
+            self.assertEqual(screen._print_at.call_args_list, [(("focus", 0, 5, 5),)])
+
+            # Deferred lines get drawn next time - ahead of new lines of the same priority.
+            screen._print_at.reset_mock()
+            screen.print_at("more", 0, 2)
+            screen.refresh()
+            self.assertEqual(screen._print_at.call_args_list, [(("background", 0, 0, 10),)])
+            screen._print_at.reset_mock()
+            screen.refresh()
+            self.assertEqual(screen._print_at.call_args_list, [(("more", 0, 2, 4),)])
+
+            # No budget means everything is drawn.
+            screen._print_at.reset_mock()
+            screen.byte_budget = None
+            screen.print_at("one", 0, 0)
+            screen.print_at("two", 0, 1)
+            screen.refresh()
+            self.assertEqual(len(screen._print_at.call_args_list), 2)
+
+        Screen.wrapper(internal_checks, height=15)
+
+    def test_threaded_output(self):
+        """
+        Check that a slow terminal doesn't block refresh when using threaded output.
+        """
+        # Screens that can't write from another thread refuse to do so.
+        screen = HeadlessScreen(height=5, width=10)
+        with self.assertRaises(RuntimeError):
+            screen.threaded_output = True
+        self.assertFalse(screen.threaded_output)
+
+        if sys.platform == "win32":
+            self.skipTest("Only valid for curses.")
+
+        def internal_checks(screen):
+            self.assertFalse(screen.threaded_output)
+            written = []
+            release = threading.Event()
+
+            def slow_write(text):
+                release.wait(5)
+                written.append(text)
+
+            screen._write = slow_write
+            screen.threaded_output = True
+            self.assertTrue(screen.threaded_output)
+
+            # The first refresh is handed to the writer straight away...
+            screen.print_at("one", 0, 0)
+            screen.refresh()
+
+            # ... and later frames are skipped until it has been written, without forcing the
+            # Effects to update again.
+            screen.print_at("two", 0, 1)
+            screen._refresh_when_ready()
+            screen.print_at("three", 0, 2)
+            screen._refresh_when_ready()
+            self.assertTrue(screen._refresh_pending)
+            self.assertFalse(screen._forced_update)
+            self.assertEqual(screen._idle_frames(), 0)
+            release.set()
+            while not screen._writer.ready():
+                time.sleep(0.01)
+            self.assertEqual(len(written), 1)
+            self.assertIn("one", written[0])
+
+            # Now the coalesced changes are all sent together.
+            screen._refresh_when_ready()
+            self.assertFalse(screen._refresh_pending)
+            while not screen._writer.ready():
+                time.sleep(0.01)
+
+            # Explicit refreshes wait for the writer rather than being dropped.
+            release.clear()
+            screen.print_at("four", 0, 3)
+            screen.refresh()
+            timer = threading.Timer(0.1, release.set)
+            timer.start()
+            screen.print_at("five", 0, 4)
+            screen.refresh()
+            screen.threaded_output = False
+            self.assertFalse(screen.threaded_output)
+            self.assertEqual(len(written), 4)
+            self.assertIn("two", written[1])
+            self.assertIn("three", written[1])
+            self.assertIn("four", written[2])
+            self.assertIn("five", written[3])
+
+            # Errors in the writer thread are reported back to the Screen.
+            def bad_write(text):
+                raise ValueError(text)
+
+            screen._write = bad_write
+            screen.threaded_output = True
+            screen.print_at("six", 0, 5)
+            screen.refresh()
+            with self.assertRaises(ValueError):
+                screen.threaded_output = False
+            self.assertFalse(screen.threaded_output)
+            del screen._write
+
+        Screen.wrapper(internal_checks, height=15)
+
+    def test_profile_output(self):
+        """
+        Check that curses output is included in the profile.
+        """
+        if sys.platform == "win32":
+            self.skipTest("Only valid for curses.")
+
+        def internal_checks(screen):
+            screen.profiler = FrameProfiler()
+            screen.profiler.start_frame(1)
+            screen.print_at("hello", 0, 0)
+            screen.refresh()
+            screen.profiler.end_frame()
+            profile = screen.profiler.profiles[0]
+            self.assertEqual(set(profile.phases), {"refresh", "write"})
+            self.assertEqual(profile.cells, 5)
+            self.assertGreater(profile.bytes, 5)
+
+        Screen.wrapper(internal_checks, height=15)
+
+    def test_headless_screen(self):
+        """
+        Check that HeadlessScreen renders to memory and counts its output.
+        """
+        screen = HeadlessScreen(height=5, width=10, colours=16)
+        self.assertEqual((screen.height, screen.width, screen.colours), (5, 10, 16))
+        screen.print_at("hello", 1, 1, colour=Screen.COLOUR_GREEN, bg=Screen.COLOUR_BLUE)
+        screen.print_at("x", 0, 2, colour=9)
+        screen.refresh()
+        self.assertEqual(screen.output, "\x1b[0;32;44m\x1b[2;2Hhello\x1b[0;91;40m\x1b[3;1Hx")
+        self.assertEqual(screen.bytes_written, len(screen.output))
+        self.assertEqual(screen.escapes_written, 4)
+        self.assertEqual(screen.cells_written, 6)
+        self.assertEqual(screen.cells[1][1], ("h", Screen.COLOUR_GREEN, 0, Screen.COLOUR_BLUE))
+        self.assertEqual("".join(c[0] for c in screen.cells[1]), " hello    ")
+
+        # Nothing is written if nothing changes.
+        screen.reset_stats()
+        screen.refresh()
+        self.assertEqual(
+            (screen.output, screen.bytes_written, screen.escapes_written, screen.cells_written),
+            ("", 0, 0, 0))
+
+        # Scrolling moves the cells.
+        screen.scroll()
+        screen.refresh()
+        self.assertEqual("".join(c[0] for c in screen.cells[0]), " hello    ")
+        self.assertEqual("".join(c[0] for c in screen.cells[4]), " " * 10)
+
+        # Double-width glyphs fill 2 cells.
+        screen.print_at("你好", 0, 5)
+        screen.refresh()
+        self.assertEqual([c[0] for c in screen.cells[4][:5]], ["你", "", "好", "", " "])
+
+        # Clearing blanks everything.
+        screen.clear()
+        self.assertEqual("".join(c[0] for c in screen.cells[0]), " " * 10)
+
+        # Injected events are returned as input.
+        event = KeyboardEvent(ord("a"))
+        screen.inject_event(event)
+        screen.wait_for_input(0)
+        self.assertEqual(screen.get_event(), event)
+        self.assertIsNone(screen.get_event())
+        self.assertFalse(screen.has_resized())
+
+    def test_memory_report(self):
+        """
+        Check the memory accounting for Screens and Canvases.
+        """
+        for compact in (False, True):
+            small = HeadlessScreen(height=5, width=10, compact_buffer=compact)
+            large = HeadlessScreen(height=50, width=100, compact_buffer=compact)
+            self.assertGreater(small.memory_usage(), 0)
+            self.assertGreater(large.memory_usage(), small.memory_usage() * 10)
+            canvas = Canvas(large, 10, 20, 0, 0)
+            self.assertLess(canvas.memory_usage(), large.memory_usage())
+
+        # Check the cache statistics.
+        screen = HeadlessScreen(height=5, width=10)
+        screen.highlight(0, 0, 2, 1, fg=Screen.COLOUR_RED, blend=50)
+        _split_text("Hello world", 5, 2)
+        stats = screen.cache_stats()
+        self.assertEqual(stats["blends"], {"size": 1, "hits": 1, "misses": 1})
+        self.assertGreater(stats["split_text"]["size"], 0)
+
+        # Check the full report.
+        effect = MockEffect()
+        screen.set_scenes([Scene([effect], 10, name="test")])
+        report = screen.memory_report()
+        self.assertEqual(report["screen"], screen.memory_usage())
+        self.assertEqual(report["scenes"], [{"name": "test", "bytes": 0, "effects": [("MockEffect", 0)]}])
+        self.assertEqual(report["caches"], screen.cache_stats())
+
+    def test_headless_play(self):
+        """
+        Check that HeadlessScreen can play Scenes without a terminal.
+        """
+        screen = HeadlessScreen()
+        screen.inject_event(KeyboardEvent(ord("q")))
+        effect = MockEffect(count=100, frame_rate=0, stop_frame=0)
+        screen.play([Scene([effect], 0)])
+        self.assertTrue(effect.event_called)
+
+    def test_escape_tables(self):
+        """
+        Check that curses escape sequences are precompiled and match terminfo.
+        """
+        if sys.platform == "win32":
+            self.skipTest("Only valid for curses.")
+
+        def internal_checks(screen):
+            setaf = curses.tigetstr("setaf")
+            self.assertEqual(screen._fg_table[3], curses.tparm(setaf, 3).decode("utf-8"))
+            self.assertEqual(screen._cursor_table[4, 5],
+                             curses.tparm(curses.tigetstr("cup"), 4, 5).decode("utf-8"))
+            self.assertEqual(screen._sgr_table[Screen.COLOUR_RED, Screen.A_BOLD, Screen.COLOUR_BLUE],
+                             screen._a_normal + screen._a_bold + screen._fg_table[1] + screen._bg_table[4])
+
+            # Once the tables are populated, refresh shouldn't need terminfo at all.
+            for _ in range(2):
+                for i in range(8):
+                    screen.print_at(str(i), i * 2, 0, colour=i, attr=i % 3, bg=7 - i)
+                screen.refresh()
+                screen.reset()
+            with patch("asciimatics.screen.curses.tparm", side_effect=AssertionError):
+                for i in range(8):
+                    screen.print_at(str(i), i * 2, 0, colour=i, attr=i % 3, bg=7 - i)
+                screen.refresh()
+
+            # The tables are reported in the cache statistics.
+            self.assertGreater(screen.cache_stats()["escapes"]["size"], 8)
+
+        Screen.wrapper(internal_checks, height=15)
+
     def test_origin(self):
         """
         Check that Canvas origin is correct.
@@ -502,6 +902,182 @@ class TestScreen(unittest.TestCase):
 
         Screen.wrapper(internal_checks, height=15)
 
+    def test_idle_play(self):
+        """
+        Check that play blocks until the next frame that needs to be drawn.
+        """
+        def internal_checks(screen):
+            # Use a fake clock that only moves on when the Screen waits, so the timings are exact.
+            now = [0]
+
+            def wait(seconds):
+                now[0] += seconds
+
+            def clock():
+                return now[0]
+
+            screen.wait_for_input = MagicMock(side_effect=wait)
+
+            # Frames between updates are skipped, but still counted.
+            with patch("time.sleep", side_effect=wait):
+                test_effect = MockEffect(count=3, frame_rate=10, stop_frame=0)
+                screen.play([Scene([test_effect], 0)], scheduler=FrameScheduler(clock=clock))
+                self.assertEqual(screen._frame, 21)
+                self.assertAlmostEqual(screen.wait_for_input.call_args_list[0][0][0], 0.45)
+                self.assertFalse(screen.catch_up)
+
+                # Frame rate comes from the scheduler.
+                screen.wait_for_input.reset_mock()
+                test_effect = MockEffect(count=3, frame_rate=10, stop_frame=0)
+                screen.play([Scene([test_effect], 0)],
+                            scheduler=FrameScheduler(fps=100, clock=clock))
+                self.assertAlmostEqual(screen.wait_for_input.call_args_list[0][0][0], 0.09)
+
+                # Scene duration limits the wait.  Skipping frames also makes Effects catch up.
+                screen.wait_for_input.reset_mock()
+                test_effect = MockEffect(count=100, frame_rate=1000000, stop_frame=0)
+                screen.play([Scene([test_effect], 15)], repeat=False,
+                            scheduler=FrameScheduler(clock=clock, skip_frames=True))
+                self.assertAlmostEqual(screen.wait_for_input.call_args_list[0][0][0], 0.65)
+                self.assertTrue(screen.catch_up)
+
+            # Nothing to do means waiting for input.
+            screen.set_scenes([Scene([MockEffect(count=100, frame_rate=0, stop_frame=0)], 0)])
+            screen.draw_next_frame()
+            self.assertIsNone(screen._idle_frames())
+            self.assertLess(screen.scene_time, 1)
+            screen.force_update()
+            self.assertEqual(screen._idle_frames(), 0)
+
+            # Resizing (or other signals) interrupts the wait.
+            if sys.platform != "win32":
+                del screen.wait_for_input
+                screen._wake()
+                start = time.time()
+                screen.wait_for_input(5)
+                self.assertLess(time.time() - start, 1)
+
+        Screen.wrapper(internal_checks, height=15)
+
+    def test_shed_load(self):
+        """
+        Check that the Screen sheds load from low priority Effects when frames are slow.
+        """
+        def internal_checks(screen):
+            low = MockEffect(count=1000, stop_frame=0)
+            mid = MockEffect(count=1000, stop_frame=0, priority=1)
+            high = MockEffect(count=1000, stop_frame=0, priority=2)
+            screen.set_scenes([Scene([low, mid, high], 0)])
+            screen._frame_budget = 0.05
+            tiers = [0, 1, 2]
+
+            # Slow frames shed load one step at a time - degrading then skipping each tier.
+            expected = [(1, 0, 0), (2, 0, 0), (2, 1, 0), (2, 2, 0), (2, 2, 0)]
+            for states in expected:
+                screen._check_load(0.1, tiers)
+                self.assertEqual(tuple(screen._shed_state(e, tiers) for e in (low, mid, high)), states)
+            self.assertTrue(low.degraded)
+            self.assertFalse(high.degraded)
+
+            # Fast frames restore them - after a while.
+            for _ in range(screen._SHED_RECOVERY_FRAMES):
+                screen._check_load(0.01, tiers)
+            self.assertEqual(tuple(screen._shed_state(e, tiers) for e in (low, mid, high)), (2, 1, 0))
+
+            # Priorities that weren't in the Scene when the tiers were found still work.
+            mid.priority = 2
+            low.priority = 1
+            self.assertEqual(tuple(screen._shed_state(e, tiers) for e in (low, mid, high)), (1, 0, 0))
+            mid.priority = 3
+            self.assertEqual(screen._shed_state(mid, tiers), 0)
+            low.priority = 0
+            mid.priority = 1
+
+            # Skipped effects aren't updated (and degraded ones only on even frames).
+            low.update_called = mid.update_called = False
+            screen._frame = 1
+            screen.draw_next_frame()
+            self.assertFalse(low.update_called)
+            self.assertTrue(mid.update_called)
+
+            # Only happens if requested.
+            screen.play([Scene([MockEffect(count=3)], 0)])
+            self.assertIsNone(screen._frame_budget)
+            screen.play([Scene([MockEffect(count=3)], 0)], scheduler=FrameScheduler(shed_load=True))
+            self.assertEqual(screen._frame_budget, 0.05)
+
+        Screen.wrapper(internal_checks, height=15)
+
+    def test_shed_load_clock(self):
+        """
+        Check that the Screen's clock is used to decide whether frames are slow.
+        """
+        now = [0]
+
+        def slow_update(_):
+            now[0] += 0.1
+
+        screen = HeadlessScreen(height=5, width=10, clock=lambda: now[0])
+        low = MockEffect(count=1000, stop_frame=0)
+        high = MockEffect(count=1000, stop_frame=0, priority=1)
+        screen.set_scenes([Scene([low, high], 0)])
+        screen._frame_budget = 0.05
+        screen.draw_next_frame()
+        self.assertEqual(screen.shed_level, 0)
+        with patch.object(high, "update", side_effect=slow_update):
+            screen.draw_next_frame()
+        self.assertEqual(screen.shed_level, 1)
+
+    def test_play_async(self):
+        """
+        Check that we can play Scenes from an asyncio event loop.
+        """
+        def internal_checks(screen):
+            # Frames are counted in the same way as the blocking version.
+            test_effect = MockEffect(count=3, frame_rate=10, stop_frame=0)
+            asyncio.run(screen.play_async([Scene([test_effect], 0)]))
+            self.assertEqual(screen._frame, 21)
+
+            # Other tasks can run while idle and force an update when needed.
+            async def update_later():
+                await asyncio.sleep(0.1)
+                screen.force_update()
+
+            async def main():
+                task = asyncio.create_task(update_later())
+                await asyncio.wait_for(
+                    screen.play_async([Scene([MockEffect(count=2, frame_rate=0, stop_frame=0)], 0)]), 5)
+                await task
+
+            start = time.time()
+            asyncio.run(main())
+            self.assertLess(time.time() - start, 1)
+
+        Screen.wrapper(internal_checks, height=15)
+
+    def test_call_soon_threadsafe(self):
+        """
+        Check that other threads can post updates to the Screen.
+        """
+        def internal_checks(screen):
+            results = []
+
+            def worker():
+                time.sleep(0.1)
+                screen.call_soon_threadsafe(lambda: results.append(threading.current_thread()))
+
+            # Posting should wake up an idle Screen and run the callback on the drawing thread.
+            thread = threading.Thread(target=worker)
+            start = time.time()
+            thread.start()
+            screen.play([Scene([MockEffect(count=2, frame_rate=0, stop_frame=0)], 0)])
+            thread.join()
+            self.assertLess(time.time() - start, 1)
+            self.assertEqual(len(results), 1)
+            self.assertEqual(results[0], threading.current_thread())
+
+        Screen.wrapper(internal_checks, height=15)
+
     def test_next_scene(self):
         """
         Check that we can play multiple Scenes.
@@ -1025,6 +1601,174 @@ class TestScreen(unittest.TestCase):
         self.assertEqual(buffer._double_buffer[0][0], (' ', 1, 0, 2, 1))
         self.assertEqual(buffer._double_buffer[19][9], (' ', 3, 1, 4, 1))
 
+    def test_array_double_buffer(self):
+        """
+        Check _ArrayDoubleBuffer works the same as the pure python version.
+        """
+        for buffer in (_DoubleBuffer(20, 10), _ArrayDoubleBuffer(20, 10)):
+            # Check clear works
+            self.assertEqual(buffer.get(0, 0), (' ', 7, 0, 0, 1))
+            buffer.clear(1, 0, 2)
+            self.assertEqual(buffer.get(9, 19), (' ', 1, 0, 2, 1))
+            buffer.clear(3, 1, 4, x=1, y=1, w=100, h=100)
+            self.assertEqual(buffer.get(0, 0), (' ', 1, 0, 2, 1))
+            self.assertEqual(buffer.get(9, 19), (' ', 3, 1, 4, 1))
+
+            # Check set and get for cells and slices.
+            buffer.sync()
+            self.assertEqual(list(buffer.deltas(0, 20)), [])
+            buffer.set(2, 3, ("a", 1, 2, 3, 1))
+            buffer.set(slice(4, 7), 3, [("你", 4, 0, 5, 2), ("你", 4, 0, 5, 0), ("b", -1, 0, -1, 1)])
+            self.assertEqual(buffer.get(2, 3), ("a", 1, 2, 3, 1))
+            self.assertEqual(buffer.slice(4, 3, 3),
+                             [("你", 4, 0, 5, 2), ("你", 4, 0, 5, 0), ("b", -1, 0, -1, 1)])
+            self.assertEqual(buffer.plain_image[3], " " * 2 + "a " + "你你b" + " " * 3)
+
+            # Check deltas and sync.
+            self.assertEqual(list(buffer.deltas(0, 20)), [(3, 2), (3, 4), (3, 5), (3, 6)])
+            buffer.sync()
+            self.assertEqual(list(buffer.deltas(0, 20)), [])
+            buffer.invalidate()
+            self.assertEqual(len(list(buffer.deltas(0, 20))), 200)
+            buffer.sync()
+
+            # Check scrolling moves both buffers.
+            buffer.scroll(2)
+            self.assertEqual(buffer.get(2, 1), ("a", 1, 2, 3, 1))
+            self.assertEqual(buffer.get(0, 19), (" ", 7, 0, 0, 1))
+            self.assertEqual(list(buffer.deltas(0, 20)), [])
+
+            # Check block transfers work between both types of buffer.
+            for source in (_DoubleBuffer(2, 3), _ArrayDoubleBuffer(2, 3)):
+                source.set(slice(0, 3), 1, [("x", 2, 0, 3, 1)] * 3)
+                buffer.block_transfer(source, 8, -1)
+                self.assertEqual(buffer.slice(7, 0, 3),
+                                 [(" ", 3, 1, 4, 1), ("x", 2, 0, 3, 1), ("x", 2, 0, 3, 1)])
+
+    def test_dirty_tracking(self):
+        """
+        Check that double-buffers only compare and sync the parts that have changed.
+        """
+        for buffer in (_DoubleBuffer(10, 20), _ArrayDoubleBuffer(10, 20)):
+            # New buffers are entirely dirty until synced.
+            self.assertEqual(buffer._dirty_min, [0] * 10)
+            self.assertEqual(buffer._dirty_max, [20] * 10)
+            buffer.sync()
+            self.assertEqual(buffer._dirty_min, [20] * 10)
+            self.assertEqual(buffer._dirty_max, [0] * 10)
+
+            # Writes extend the dirty span of the row.
+            buffer.set(5, 2, ("a", 1, 0, 0, 1))
+            buffer.set(slice(10, 13), 2, [("b", 1, 0, 0, 1)] * 3)
+            buffer.clear(7, 0, 0, x=1, y=4, w=2, h=1)
+            self.assertEqual((buffer._dirty_min[2], buffer._dirty_max[2]), (5, 13))
+            self.assertEqual((buffer._dirty_min[4], buffer._dirty_max[4]), (1, 3))
+            self.assertEqual(list(buffer.deltas(0, 10)), [(2, 5), (2, 10), (2, 11), (2, 12)])
+
+            # Scrolling moves the dirty rows with the content.
+            buffer.scroll(1)
+            self.assertEqual((buffer._dirty_min[1], buffer._dirty_max[1]), (5, 13))
+            self.assertEqual((buffer._dirty_min[9], buffer._dirty_max[9]), (20, 0))
+            buffer.scroll(-2)
+            self.assertEqual((buffer._dirty_min[3], buffer._dirty_max[3]), (5, 13))
+            self.assertEqual((buffer._dirty_min[0], buffer._dirty_max[0]), (20, 0))
+
+            # Untouched rows are not compared, even if they differ.
+            buffer.sync()
+            buffer.set(0, 0, ("z", 1, 0, 0, 1))
+            buffer._double_buffer[5] = buffer._new_row(("q", 1, 0, 0, 1))
+            self.assertEqual(list(buffer.deltas(0, 10)), [(0, 0)])
+            buffer.sync()
+            buffer._mark(5, 0, 20)
+            self.assertEqual(len(list(buffer.deltas(0, 10))), 20)
+            buffer.invalidate()
+            self.assertEqual(len(list(buffer.deltas(0, 10))), 200)
+
+    def test_find_shift(self):
+        """
+        Check that double-buffers can spot blocks of lines that have moved.
+        """
+        def write(buffer, y, text):
+            buffer.set(slice(0, 20), y, [(c, 7, 0, 0, 1) for c in text.ljust(20)])
+
+        for buffer in (_DoubleBuffer(10, 20), _ArrayDoubleBuffer(10, 20)):
+            # Nothing to find in a blank buffer.
+            buffer.sync()
+            buffer.clear(7, 0, 0)
+            self.assertIsNone(buffer.find_shift(10))
+
+            # Log tail moves lines up.
+            for y in range(10):
+                write(buffer, y, f"line {y}")
+            buffer.sync()
+            for y in range(10):
+                write(buffer, y, f"line {y + 1}")
+            self.assertEqual(buffer.find_shift(10), (0, 9, 1))
+            buffer.shift_rows(0, 9, 1)
+            self.assertEqual({y for y, _ in buffer.deltas(0, 10)}, {9})
+            buffer.sync()
+
+            # Inserting lines moves them down - within a sub-region of the buffer.
+            for y in range(4, 8):
+                write(buffer, y, f"line {y - 1}")
+            write(buffer, 2, "new line")
+            write(buffer, 3, "another line")
+            self.assertEqual(buffer.find_shift(10), (2, 7, -2))
+            buffer.shift_rows(2, 7, -2)
+            self.assertEqual({y for y, _ in buffer.deltas(0, 10)}, {2, 3})
+            buffer.sync()
+
+            # Not worth scrolling a single line.
+            write(buffer, 0, "line 2")
+            write(buffer, 1, "line 1")
+            self.assertIsNone(buffer.find_shift(10))
+            buffer.sync()
+
+            # Sparse changes only hash the changed rows and stop if they can't have moved.
+            with patch.object(buffer, "_row_key", wraps=buffer._row_key) as row_key:
+                write(buffer, 0, "changed 0")
+                write(buffer, 5, "changed 5")
+                write(buffer, 6, "line 5")
+                self.assertIsNone(buffer.find_shift(10))
+                self.assertEqual(row_key.call_count, 2)
+
+    def test_deferred_sync(self):
+        """
+        Check that double-buffers track priority and staleness of deferred rows.
+        """
+        for buffer in (_DoubleBuffer(10, 20), _ArrayDoubleBuffer(10, 20)):
+            buffer.sync()
+            buffer.set(0, 1, ("a", 1, 0, 0, 1))
+            buffer.priority = 2
+            buffer.set(0, 2, ("b", 1, 0, 0, 1))
+            buffer.priority = 0
+            self.assertEqual([buffer.row_priority(y) for y in range(3)], [0, 0, 2])
+
+            # Deferred rows stay changed and gain priority on each sync.
+            buffer.sync({1})
+            self.assertEqual(list(buffer.deltas(0, 10)), [(1, 0)])
+            self.assertEqual([buffer.row_priority(y) for y in range(3)], [0, 1, 0])
+            buffer.sync({1})
+            self.assertEqual(buffer.row_priority(1), 2)
+            buffer.sync()
+            self.assertEqual(list(buffer.deltas(0, 10)), [])
+            self.assertEqual(buffer.row_priority(1), 0)
+
+    def test_compact_buffer(self):
+        """
+        Check that Screens and Canvases can use the compact double-buffer.
+        """
+        def internal_checks(screen):
+            self.assertTrue(screen.compact_buffer)
+            screen.print_at("Hello world!", 0, 0, colour=Screen.COLOUR_CYAN, bg=Screen.COLOUR_BLUE)
+            self.assertEqual(screen.get_from(4, 0), (ord("o"), Screen.COLOUR_CYAN, 0, Screen.COLOUR_BLUE))
+            screen.refresh()
+            if isinstance(screen, Screen):
+                self.assertEqual(list(screen._buffer.deltas(0, screen.height)), [])
+
+        Screen.wrapper(
+            check_screen_and_canvas, height=15, compact_buffer=True, arguments=[internal_checks])
+
     def test_context_manager(self):
         """
         Check ManagedScreen context manager works.
@@ -0,0 +1,69 @@
+import unittest
+from io import StringIO
+from asciimatics import tracing
+from asciimatics.parsers import AnsiTerminalParser
+from asciimatics.screen import HeadlessScreen
+
+
+class TestTracing(unittest.TestCase):
+    def tearDown(self):
+        tracing.enable()
+        tracing.disable()
+        tracing.clear()
+
+    def test_ring_buffer(self):
+        """
+        Check that events are only recorded while enabled, and in a ring buffer.
+        """
+        self.assertFalse(tracing.ENABLED)
+        tracing.enable(size=3)
+        self.assertTrue(tracing.ENABLED)
+        for i in range(5):
+            tracing.trace("test", index=i)
+        self.assertEqual([e[2]["index"] for e in tracing.events()], [2, 3, 4])
+        self.assertEqual(tracing.events()[0][1], "test")
+
+        # Events can be dumped as text.
+        stream = StringIO()
+        tracing.dump(stream)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].endswith(" test index=2"))
+
+        # Events are kept when disabled, until cleared.
+        tracing.disable()
+        self.assertFalse(tracing.ENABLED)
+        self.assertEqual(len(tracing.events()), 3)
+        tracing.clear()
+        self.assertEqual(tracing.events(), [])
+
+    def test_trace_points(self):
+        """
+        Check the trace points in the library.
+        """
+        # Nothing is recorded when disabled.
+        screen = HeadlessScreen(height=10, width=20)
+        screen.fill_polygon([[(1, 1), (10, 1), (10, 5)]])
+        screen.refresh()
+        self.assertEqual(tracing.events(), [])
+
+        # Polygon fills and refreshes...
+        tracing.enable()
+        screen.fill_polygon([[(1, 1), (10, 1), (10, 5)]])
+        screen.print_at("x", 0, 0)
+        screen.refresh()
+        events = tracing.events()
+        self.assertEqual([e[1] for e in events], ["polygon", "refresh"])
+        self.assertEqual(events[0][2]["polygons"], 1)
+        self.assertEqual(events[1][2], {"cells": 1, "deferred": 0})
+
+        # ... and ignored escape sequences.
+        tracing.clear()
+        parser = AnsiTerminalParser()
+        parser.reset("\x1b[99ma\x01", None)
+        list(parser.parse())
+        self.assertEqual([e[1] for e in tracing.events()], ["sgr_ignored", "character_ignored"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -823,9 +823,11 @@ class TestWidgets(unittest.TestCase):
         # If the Frame loses the focus it must not return a focussed widget.
         form._has_focus = False
         self.assertIsNone(form.focussed_widget)
+        self.assertEqual(form.priority, 0)
 
         # If the Frame focus is undefined, it must not return a focussed widget.
         form._has_focus = True
+        self.assertEqual(form.priority, 1)
         form._focus = 9999
         self.assertIsNone(form.focussed_widget)
 